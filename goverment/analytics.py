@@ -0,0 +1,116 @@
+from datetime import datetime, time, timedelta
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from jobcard_business.models import JobApplication
+from .models import ApplicationDailyRollup, RollupDirtyDay, RollupWatermark
+
+WATERMARK_NAME = "application_daily"
+DAYS_PER_BATCH = 31
+
+
+def _day_range(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _days_filter(field, days):
+    day_filter = Q()
+    for day in days:
+        start, end = _day_range(day)
+        day_filter |= Q(**{f"{field}__gte": start, f"{field}__lt": end})
+    return day_filter
+
+
+def _aggregate_days(days):
+    """
+    Build rollup rows for the given days straight from JobApplication:
+    applications on the day they were made, placements on the day they were
+    selected. Jobs store `job_type` as a list, rows are keyed by its first entry.
+    """
+    dimensions = ("job__industry", "job__location", "job__job_type", "institute_id")
+    applied = (
+        JobApplication.objects.filter(_days_filter("applied_at", days))
+        .annotate(day=TruncDate("applied_at"))
+        .values("day", *dimensions)
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    selected = (
+        JobApplication.objects.filter(_days_filter("selected_at", days), status="selected")
+        .annotate(day=TruncDate("selected_at"))
+        .values("day", *dimensions)
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+
+    buckets = {}
+    for position, grouped in enumerate((applied, selected)):
+        for row in grouped:
+            job_types = row["job__job_type"] or []
+            key = (
+                row["day"],
+                row["job__industry"] or "",
+                row["job__location"] or "",
+                job_types[0] if job_types else "",
+                row["institute_id"],
+            )
+            buckets.setdefault(key, [0, 0])[position] += row["count"]
+
+    return [
+        ApplicationDailyRollup(
+            day=day, industry=industry, location=location, job_type=job_type,
+            institute_id=institute_id, applications=applications, placements=placements,
+        )
+        for (day, industry, location, job_type, institute_id), (applications, placements) in buckets.items()
+    ]
+
+
+def _days_of(applications):
+    days = set()
+    for field in ("applied_at", "selected_at"):
+        days.update(
+            applications.filter(**{f"{field}__isnull": False})
+            .annotate(day=TruncDate(field)).values_list("day", flat=True).distinct()
+        )
+    return days
+
+
+def refresh_application_rollups(full=False, lag_seconds=60):
+    """
+    Recompute the rollup rows of every day that has applications changed since
+    the last watermark (by the day they were made and the day they were
+    selected), plus the days RollupDirtyDay lists for deleted applications.
+    Rows updated within the last `lag_seconds` are left for the next run so
+    in-flight transactions are not skipped.
+    Returns the number of days rebuilt.
+    """
+    cutoff = timezone.now() - timedelta(seconds=lag_seconds)
+
+    with transaction.atomic():
+        watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=WATERMARK_NAME)
+
+        changed = JobApplication.objects.all()
+        if full or watermark.value is None:
+            # Rows written before `updated_at` existed have it NULL
+            changed = changed.filter(Q(updated_at__isnull=True) | Q(updated_at__lte=cutoff))
+        else:
+            changed = changed.filter(updated_at__gt=watermark.value, updated_at__lte=cutoff)
+
+        dirty = list(RollupDirtyDay.objects.values_list("id", "day"))
+        days = sorted(_days_of(changed) | {day for _, day in dirty})
+
+        if full:
+            ApplicationDailyRollup.objects.all().delete()
+
+        for i in range(0, len(days), DAYS_PER_BATCH):
+            batch = days[i:i + DAYS_PER_BATCH]
+            ApplicationDailyRollup.objects.filter(day__in=batch).delete()
+            ApplicationDailyRollup.objects.bulk_create(_aggregate_days(batch))
+
+        RollupDirtyDay.objects.filter(id__in=[dirty_id for dirty_id, _ in dirty]).delete()
+        watermark.value = cutoff
+        watermark.save(update_fields=["value", "updated_at"])
+
+    return len(days)
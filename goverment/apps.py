@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GovermentConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'goverment'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -1,6 +1,6 @@
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
-from django.conf import settings
+from helpers.utils import verify_sso_token
 import requests
 
 class SSOGovernmentTokenAuthentication(BaseAuthentication):
@@ -16,16 +16,10 @@ class SSOGovernmentTokenAuthentication(BaseAuthentication):
         token = auth_header.split("Token ")[1]
 
         try:
-            response = requests.post(
-                settings.AUTH_SERVER_URL + "/api/goverment/verify-token/",
-                json={"token": token},
-                timeout=5
-            )
-
-            if response.status_code != 200:
+            data = verify_sso_token("/api/goverment/verify-token/", token)
+            if data is None:
                 raise AuthenticationFailed("Invalid or expired token.")
 
-            data = response.json()
             user = AuthenticatedGovernmentUser(
                 id=data["user_id"],
                 full_name=data["full_name"],
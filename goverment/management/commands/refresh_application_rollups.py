@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from goverment.analytics import refresh_application_rollups
+
+
+class Command(BaseCommand):
+    help = "Incrementally refresh the daily application/placement rollup tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Drop and rebuild every rollup row.")
+        parser.add_argument(
+            "--lag-seconds", type=int, default=60,
+            help="Skip applications updated within the last N seconds (picked up by the next run).",
+        )
+
+    def handle(self, *args, **options):
+        days = refresh_application_rollups(full=options["full"], lag_seconds=options["lag_seconds"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups for {days} day(s)."))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ApplicationDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Application Date')),
+                ('industry', models.CharField(blank=True, default='', max_length=100)),
+                ('location', models.CharField(blank=True, default='', max_length=100)),
+                ('job_type', models.CharField(blank=True, default='', help_text='Primary (first) job type of the job', max_length=50)),
+                ('institute_id', models.IntegerField(blank=True, null=True, verbose_name='Institute ID')),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('placements', models.PositiveIntegerField(default=0, help_text="Applications from this day with status 'selected'")),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='goverment_a_day_d980ea_idx'), models.Index(fields=['industry', 'day'], name='goverment_a_industr_12f0fd_idx'), models.Index(fields=['location', 'day'], name='goverment_a_locatio_30e6c4_idx'), models.Index(fields=['institute_id', 'day'], name='goverment_a_institu_452274_idx')],
+            },
+        ),
+    ]
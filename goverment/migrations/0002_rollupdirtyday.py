@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goverment', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupDirtyDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='applicationdailyrollup',
+            name='placements',
+            field=models.PositiveIntegerField(default=0, help_text="Applications selected on this day and still 'selected'"),
+        ),
+    ]
@@ -1,3 +1,52 @@
 from django.db import models
 
-# Create your models here.
+
+class ApplicationDailyRollup(models.Model):
+    """
+    Pre-aggregated application counts per day and dimension.
+    Filled incrementally by the `refresh_application_rollups` command,
+    so trend queries never have to scan JobApplication.
+    """
+    day = models.DateField(verbose_name="Application Date")
+    industry = models.CharField(max_length=100, blank=True, default="")
+    location = models.CharField(max_length=100, blank=True, default="")
+    job_type = models.CharField(max_length=50, blank=True, default="", help_text="Primary (first) job type of the job")
+    institute_id = models.IntegerField(null=True, blank=True, verbose_name="Institute ID")
+    applications = models.PositiveIntegerField(default=0)
+    placements = models.PositiveIntegerField(default=0, help_text="Applications selected on this day and still 'selected'")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["day"]),
+            models.Index(fields=["industry", "day"]),
+            models.Index(fields=["location", "day"]),
+            models.Index(fields=["institute_id", "day"]),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.industry}/{self.location}: {self.applications}"
+
+
+class RollupWatermark(models.Model):
+    """
+    Last `JobApplication.updated_at` value folded into a rollup table.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.value}"
+
+
+class RollupDirtyDay(models.Model):
+    """
+    A day whose rollup rows must be rebuilt although no remaining
+    application points at it, e.g. after an application was deleted.
+    Consumed by the next refresh.
+    """
+    day = models.DateField(unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.day}"
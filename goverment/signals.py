@@ -0,0 +1,36 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from jobcard_business.models import Job, JobApplication
+from .analytics import _days_of
+from .models import RollupDirtyDay
+
+# Job fields the rollup rows of its applications are grouped by
+ROLLUP_JOB_FIELDS = ("industry", "location", "job_type")
+
+
+def _mark_dirty(days):
+    RollupDirtyDay.objects.bulk_create([RollupDirtyDay(day=day) for day in days], ignore_conflicts=True)
+
+
+@receiver(post_delete, sender=JobApplication)
+def application_deleted(sender, instance, **kwargs):
+    # The incremental refresh only sees rows that still exist
+    _mark_dirty({timezone.localdate(value) for value in (instance.applied_at, instance.selected_at) if value})
+
+
+@receiver(pre_save, sender=Job)
+def job_saving(sender, instance, update_fields=None, **kwargs):
+    instance._rollup_old = None
+    if update_fields is not None and not set(update_fields) & set(ROLLUP_JOB_FIELDS):
+        return
+    if not instance._state.adding and instance.pk is not None:
+        instance._rollup_old = Job.objects.filter(pk=instance.pk).values(*ROLLUP_JOB_FIELDS).first()
+
+
+@receiver(post_save, sender=Job)
+def job_saved(sender, instance, created, **kwargs):
+    # Regrouping a job moves its applications between rollup rows on every day they count
+    old = getattr(instance, "_rollup_old", None)
+    if old and any(old[field] != getattr(instance, field) for field in ROLLUP_JOB_FIELDS):
+        _mark_dirty(_days_of(instance.applications.all()))
@@ -1,3 +1,131 @@
+from datetime import timedelta
 from django.test import TestCase
+from django.utils import timezone
+from goverment.analytics import refresh_application_rollups
+from goverment.models import ApplicationDailyRollup
+from helpers.testing import (
+    BUSINESS_ID, MEMBER_CARD, EndpointBudgetTestCase, distinct_members, seed_applications, seed_jobs, seed_members,
+)
+from jobcard_business.models import JobApplication
 
-# Create your tests here.
+
+class GovernmentEndpointBudgetTests(EndpointBudgetTestCase):
+    """
+    Queries and auth server calls per request stay fixed however many jobs,
+    applications and placements there are; lists look each member up at
+    most once.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.jobs = seed_jobs(2)
+        seed_applications(self.jobs, 3)
+        seed_applications(seed_jobs(1, start=50), 2, status="selected")
+        seed_members(3)
+        self.members = 3
+
+    def grow(self):
+        jobs = seed_jobs(5, start=self.members * 10)
+        seed_applications([self.jobs[0], *jobs], 6, start=self.members)
+        seed_applications(seed_jobs(1, start=self.members * 10 + 5), 4, start=self.members, status="selected")
+        seed_members(6, start=self.members)
+        self.members += 6
+
+    def test_job_list(self):
+        response = self.assertScalesFlat("get", "/goverment/jobs-list/", "government-token", 2, 1, self.grow).response
+        self.assertEqual(len(response.data["data"]), 9)
+
+    def test_applications(self):
+        response = self.assertScalesFlat(
+            "get", f"/goverment/applications/{self.jobs[0].id}/", "government-token", 1, 1, self.grow,
+            lookups=distinct_members,
+        ).response
+        self.assertEqual(len(response.data["data"]), 9)
+
+    def test_dashboard(self):
+        response = self.assertScalesFlat(
+            "get", "/goverment/government/dashboard/", "government-token", 2, 2, self.grow
+        ).response
+        self.assertEqual((response.data["total_company"], response.data["placed_students"]), (3, 6))
+
+    def test_placed_students(self):
+        response = self.assertScalesFlat(
+            "get", "/goverment/placed-students/", "government-token", 1, 1, self.grow,
+            lookups=lambda response: len(response.data["placed_students"]),
+        ).response
+        self.assertEqual(len(response.data["placed_students"]), 6)
+
+    def test_member_and_business_lookups(self):
+        response = self.assertScalesFlat(
+            "get", f"/goverment/member-applications/?member_card={MEMBER_CARD}", "government-token", 1, 1, self.grow
+        ).response
+        self.assertEqual(response.data["total_applications"], 3)
+        self.assertScalesFlat(
+            "get", f"/goverment/job/count-by-business/?business_id={BUSINESS_ID}", "government-token", 1, 1, self.grow
+        )
+
+    def test_analytics_and_feedback_summary(self):
+        self.assertScalesFlat("get", "/goverment/analytics/applications/", "government-token", 1, 1, self.grow)
+        self.assertScalesFlat("get", "/goverment/feedback-summary/", "government-token", 1, 1, self.grow)
+
+
+class ApplicationRollupTests(TestCase):
+
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.last_week = self.today - timedelta(days=7)
+        job = seed_jobs(1, industry="Manufacturing")[0]
+        self.applications = seed_applications([job], 3)
+        JobApplication.objects.update(applied_at=timezone.now() - timedelta(days=7))
+
+    def rollups(self):
+        return {
+            row.day: (row.applications, row.placements)
+            for row in ApplicationDailyRollup.objects.filter(industry="Manufacturing")
+        }
+
+    def test_placements_count_on_the_day_of_selection(self):
+        application = JobApplication.objects.get(pk=self.applications[0].pk)
+        application.status = "selected"
+        application.save()
+
+        refresh_application_rollups(lag_seconds=0)
+        self.assertEqual(self.rollups(), {self.last_week: (3, 0), self.today: (0, 1)})
+
+        # No longer selected: the placement leaves its day
+        application.status = "shortlisted"
+        application.save()
+        refresh_application_rollups(lag_seconds=0)
+        self.assertEqual(self.rollups(), {self.last_week: (3, 0)})
+
+    def test_deleted_applications_leave_the_rollups(self):
+        refresh_application_rollups(lag_seconds=0)
+        self.assertEqual(self.rollups(), {self.last_week: (3, 0)})
+
+        JobApplication.objects.filter(pk=self.applications[0].pk).delete()
+        self.assertEqual(refresh_application_rollups(lag_seconds=0), 1)
+        self.assertEqual(self.rollups(), {self.last_week: (2, 0)})
+
+        JobApplication.objects.all().delete()
+        refresh_application_rollups(lag_seconds=0)
+        self.assertEqual(self.rollups(), {})
+
+    def test_regrouped_jobs_rebuild_their_days(self):
+        refresh_application_rollups(lag_seconds=0)
+        job = self.applications[0].job
+        job.industry = "Construction"
+        job.save()
+
+        self.assertEqual(refresh_application_rollups(lag_seconds=0), 1)
+        self.assertEqual(self.rollups(), {})
+        self.assertEqual(ApplicationDailyRollup.objects.get(industry="Construction").applications, 3)
+
+        # Other edits leave the rollups alone
+        job.title = "Senior Welder"
+        job.save()
+        self.assertEqual(refresh_application_rollups(lag_seconds=0), 0)
+
+    def test_full_rebuild_matches_incremental(self):
+        JobApplication.objects.filter(pk=self.applications[1].pk).update(status="selected", selected_at=timezone.now())
+        refresh_application_rollups(full=True, lag_seconds=0)
+        self.assertEqual(self.rollups(), {self.last_week: (3, 0), self.today: (0, 1)})
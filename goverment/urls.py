@@ -12,5 +12,7 @@ urlpatterns = [
     path('placed-students/', views.PlacedStudentListAPIView.as_view(), name='placed-student-list'),
     path('job/count-by-business/', views.JobCountByBusinessAPIView.as_view()),
     path("member-applications/", views.MemberJobApplicationsAPIView.as_view(), name="member-applications"),
+    path("analytics/applications/", views.ApplicationTrendAPIView.as_view(), name="application-trends"),
+    path("feedback-summary/", views.FeedbackSummaryGovermentAPIView.as_view(), name="feedback-summary"),
     
 ]
\ No newline at end of file
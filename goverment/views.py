@@ -9,9 +9,14 @@ from . import serializers
 from .authentication import SSOGovernmentTokenAuthentication
 from jobcard_member.models import MbrDocuments
 from jobcard_staff.serializers import JobpostSerializer,JobApplicationStaffViewSerializer
-from helpers.utils import get_member_details_by_card  
-import requests
-from django.conf import settings
+from helpers.utils import auth_server_call, get_members_details_by_cards
+from datetime import date
+from django.db.models import DateField, F, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+from .models import ApplicationDailyRollup
+from jobcard_business.feedback_stats import feedback_summary
+from jobcard_business.job_lists import deactivate_expired_jobs
+from helpers.throttling import IPRateThrottle
 
 
 class JobListGovermentAPIView(APIView):
@@ -20,6 +25,7 @@ class JobListGovermentAPIView(APIView):
     """
     authentication_classes = [SSOGovernmentTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
         operation_description="Retrieve a list of all job postings.",
@@ -27,8 +33,7 @@ class JobListGovermentAPIView(APIView):
     )
     def get(self, request):
         try:
-            for job in Job.objects.filter(is_active=True):
-                job.check_and_deactivate()
+            deactivate_expired_jobs()
             jobs = Job.objects.all().order_by('-created_at')
             serializer = JobpostSerializer(jobs, many=True)
             return Response({
@@ -49,6 +54,7 @@ class JobApplicationListOfStudentGoverment(APIView):
     """
     authentication_classes = [SSOGovernmentTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
         operation_description="Get all student applications for a specific job ID.",
@@ -57,7 +63,7 @@ class JobApplicationListOfStudentGoverment(APIView):
     )
     def get(self, request, job_id):
         try:
-            applications = JobApplication.objects.filter(job_id=job_id)
+            applications = JobApplication.objects.filter(job_id=job_id).select_related("job")
             serializer = JobApplicationStaffViewSerializer(applications, many=True)
             return Response({
                 "success": True,
@@ -81,6 +87,7 @@ class DashboardSummaryAPIView(APIView):
     """
     authentication_classes = [SSOGovernmentTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
         operation_description="Dashboard summary showing total registered institutes, companies, jobs, and placed students.",
@@ -104,7 +111,7 @@ class DashboardSummaryAPIView(APIView):
     def get(self, request):
         try:
             # 1️⃣ Request institute and company data from AUTH server
-            auth_response = requests.get(f"{settings.AUTH_SERVER_URL}/api/admin/dashboard/business-summary/")
+            auth_response = auth_server_call("GET", "/api/admin/dashboard/business-summary/")
             if auth_response.status_code != 200:
                 return Response({
                     "success": False,
@@ -145,6 +152,7 @@ class PlacedStudentListAPIView(APIView):
     """
     authentication_classes = [SSOGovernmentTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
         operation_description="Returns list of students placed through jobs (status = 'selected').",
@@ -166,12 +174,12 @@ class PlacedStudentListAPIView(APIView):
     )
     def get(self, request):
         try:
-            selected_apps = JobApplication.objects.filter(status='selected')
+            member_cards = list(JobApplication.objects.filter(status='selected').values_list("member_card", flat=True))
+            members = get_members_details_by_cards(member_cards)
             placed_students = []
 
-            for app in selected_apps:
-                member_card = app.member_card
-                member_data = get_member_details_by_card(member_card)
+            for member_card in member_cards:
+                member_data = members.get(member_card)
                 full_name = member_data.get('full_name') if member_data else None
 
                 if full_name:
@@ -200,6 +208,7 @@ class MemberJobApplicationsAPIView(APIView):
     """
     authentication_classes = [SSOGovernmentTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
         operation_description="Retrieve all job applications by member_card.",
@@ -275,6 +284,11 @@ class JobCountByBusinessAPIView(APIView):
     """
     Returns number of jobs posted by a business.
     """
+    # Public: throttled per IP before any database work
+    authentication_classes = []
+    throttle_classes = [IPRateThrottle]
+    throttle_scope = "job_count"
+    read_from_replica = True
 
     def get(self, request):
         business_id = request.GET.get("business_id")
@@ -286,3 +300,113 @@ class JobCountByBusinessAPIView(APIView):
 
         return Response({"job_count": count}, status=200)
 
+
+
+class ApplicationTrendAPIView(APIView):
+    """
+    Application and placement trends read from the daily rollup tables.
+    """
+    authentication_classes = [SSOGovernmentTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    read_from_replica = True
+
+    GRANULARITIES = {
+        "day": lambda: F("day"),
+        "week": lambda: TruncWeek("day", output_field=DateField()),
+        "month": lambda: TruncMonth("day", output_field=DateField()),
+    }
+    DIMENSIONS = {
+        "industry": "industry",
+        "location": "location",
+        "job_type": "job_type",
+        "institute": "institute_id",
+    }
+
+    @swagger_auto_schema(
+        operation_description="Applications and placements per day/week/month, optionally broken down by a dimension.",
+        manual_parameters=[
+            openapi.Parameter('granularity', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=["day", "week", "month"], default="day"),
+            openapi.Parameter('group_by', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=["industry", "location", "job_type", "institute"]),
+            openapi.Parameter('start_date', openapi.IN_QUERY, type=openapi.TYPE_STRING, format="date"),
+            openapi.Parameter('end_date', openapi.IN_QUERY, type=openapi.TYPE_STRING, format="date"),
+            openapi.Parameter('industry', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('location', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('job_type', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('institute_id', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: "Trend series"},
+        tags=["Govenrment"]
+    )
+    def get(self, request):
+        granularity = request.query_params.get("granularity", "day")
+        group_by = request.query_params.get("group_by")
+
+        if granularity not in self.GRANULARITIES:
+            return Response({"success": False, "message": "granularity must be day, week or month."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if group_by and group_by not in self.DIMENSIONS:
+            return Response({"success": False, "message": "group_by must be industry, location, job_type or institute."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        rollups = ApplicationDailyRollup.objects.all()
+        try:
+            start_date = request.query_params.get("start_date")
+            end_date = request.query_params.get("end_date")
+            if start_date:
+                rollups = rollups.filter(day__gte=date.fromisoformat(start_date))
+            if end_date:
+                rollups = rollups.filter(day__lte=date.fromisoformat(end_date))
+        except ValueError:
+            return Response({"success": False, "message": "Dates must be in YYYY-MM-DD format."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        for param in ["industry", "location", "job_type", "institute_id"]:
+            value = request.query_params.get(param)
+            if value:
+                rollups = rollups.filter(**{param: value})
+
+        fields = ["period"]
+        if group_by:
+            fields.append(self.DIMENSIONS[group_by])
+
+        series = (
+            rollups.annotate(period=self.GRANULARITIES[granularity]())
+            .values(*fields)
+            .annotate(applications=Sum("applications"), placements=Sum("placements"))
+            .order_by(*fields)
+        )
+
+        return Response({
+            "success": True,
+            "granularity": granularity,
+            "group_by": group_by,
+            "data": list(series)
+        }, status=status.HTTP_200_OK)
+
+
+class FeedbackSummaryGovermentAPIView(APIView):
+    """
+    Employee satisfaction stats for one business, or across all businesses.
+    """
+    authentication_classes = [SSOGovernmentTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    read_from_replica = True
+
+    @swagger_auto_schema(
+        operation_description="Feedback summary from the precomputed rollups. Omit business_id for all businesses.",
+        manual_parameters=[
+            openapi.Parameter('business_id', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False),
+        ],
+        responses={200: "Feedback summary"},
+        tags=["Govenrment"]
+    )
+    def get(self, request):
+        business_id = request.query_params.get("business_id")
+        if business_id is not None and not business_id.isdigit():
+            return Response({"success": False, "message": "business_id must be a number."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "success": True,
+            "data": feedback_summary(int(business_id) if business_id else None)
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,250 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.db import DatabaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections
+from helpers.cache_config import BACKENDS, SHARED_BACKENDS
+
+LOCK_TIMEOUT = getattr(settings, "CACHE_LOCK_TIMEOUT", 30)
+LOCK_WAIT_SECONDS = getattr(settings, "CACHE_LOCK_WAIT_SECONDS", 5)
+LOCK_POLL_SECONDS = 0.05
+INFLIGHT_WAIT_SECONDS = 10
+
+METRICS = ("hits", "misses", "sets", "deletes", "evictions", "computes", "waits")
+
+_MISSING = object()
+
+_metrics = defaultdict(Counter)
+_metrics_lock = threading.Lock()
+
+
+def _count(region, metric, amount=1):
+    if amount:
+        with _metrics_lock:
+            _metrics[region][metric] += amount
+
+
+def cache_metrics():
+    """
+    {region: {metric: count, "hit_ratio": float}} for this process since it started.
+    """
+    with _metrics_lock:
+        snapshot = {region: dict(counts) for region, counts in _metrics.items()}
+    result = {}
+    for region in [*getattr(settings, "CACHE_REGIONS", {}), *snapshot]:
+        counts = {metric: snapshot.get(region, {}).get(metric, 0) for metric in METRICS}
+        lookups = counts["hits"] + counts["misses"]
+        counts["hit_ratio"] = round(counts["hits"] / lookups, 4) if lookups else None
+        result[region] = counts
+    return result
+
+
+def reset_cache_metrics():
+    with _metrics_lock:
+        _metrics.clear()
+
+
+# Backends: the Django ones, counting the entries they evict under their region (KEY_PREFIX)
+
+class LocMemRegionCache(LocMemCache):
+    def _cull(self):
+        before = len(self._cache)
+        super()._cull()
+        _count(self.key_prefix, "evictions", before - len(self._cache))
+
+
+class FileRegionCache(FileBasedCache):
+    def _cull(self):
+        before = len(self._list_cache_files())
+        if before < self._max_entries:
+            return
+        super()._cull()
+        _count(self.key_prefix, "evictions", before - len(self._list_cache_files()))
+
+
+class DatabaseRegionCache(DatabaseCache):
+    def _cull(self, db, cursor, now, num):
+        # Only called once the table is over MAX_ENTRIES
+        super()._cull(db, cursor, now, num)
+        cursor.execute("SELECT COUNT(*) FROM %s" % connections[db].ops.quote_name(self._table))
+        _count(self.key_prefix, "evictions", num - cursor.fetchone()[0])
+
+
+class _InflightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def single_flight(key, fetch):
+    """
+    Run `fetch` once per key at a time; concurrent callers for the same key
+    wait for the first call and share its result (or its exception).
+    """
+    with _inflight_lock:
+        call = _inflight.get(key)
+        is_leader = call is None
+        if is_leader:
+            call = _inflight[key] = _InflightCall()
+
+    if not is_leader:
+        call.done.wait(INFLIGHT_WAIT_SECONDS)
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = fetch()
+        return call.result
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        call.done.set()
+
+
+class CacheRegion:
+    """
+    A named cache region from settings.CACHE_REGIONS, with its own backend,
+    TTL and size bound. Every lookup is counted in cache_metrics(). A region
+    missing from CACHES (e.g. test settings) falls back to the default cache
+    under a "<region>:" key prefix.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"CacheRegion({self.name!r})"
+
+    @property
+    def backend(self):
+        return caches[self.name] if self.name in settings.CACHES else caches["default"]
+
+    def _key(self, key):
+        return key if self.name in settings.CACHES else f"{self.name}:{key}"
+
+    def get(self, key, default=None):
+        value = self.backend.get(self._key(key), _MISSING)
+        if value is _MISSING:
+            _count(self.name, "misses")
+            return default
+        _count(self.name, "hits")
+        return value
+
+    def get_many(self, keys):
+        keys = list(keys)
+        found = self.backend.get_many([self._key(key) for key in keys])
+        result = {key: found[self._key(key)] for key in keys if self._key(key) in found}
+        _count(self.name, "hits", len(result))
+        _count(self.name, "misses", len(keys) - len(result))
+        return result
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        self.backend.set(self._key(key), value, timeout)
+        _count(self.name, "sets")
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT):
+        self.backend.set_many({self._key(key): value for key, value in data.items()}, timeout)
+        _count(self.name, "sets", len(data))
+
+    def delete(self, key):
+        self.backend.delete(self._key(key))
+        _count(self.name, "deletes")
+
+    def get_or_compute(self, key, compute, timeout=DEFAULT_TIMEOUT):
+        """
+        The cached value, or compute(), cache and return it. None is returned
+        but never cached.
+
+        Only one caller computes a missing key at a time: threads of this
+        process share one call, and other processes wait up to
+        LOCK_WAIT_SECONDS for it to appear before computing themselves.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        return single_flight(f"{self.name}:{key}", lambda: self._compute(key, compute, timeout))
+
+    def _compute(self, key, compute, timeout):
+        lock_key = self._key(f"{key}:lock")
+        locked = self.backend.add(lock_key, 1, LOCK_TIMEOUT)
+        if not locked:
+            # Another process is computing it
+            _count(self.name, "waits")
+            deadline = time.monotonic() + LOCK_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                time.sleep(LOCK_POLL_SECONDS)
+                value = self.backend.get(self._key(key), _MISSING)
+                if value is not _MISSING:
+                    return value
+
+        try:
+            value = compute()
+            _count(self.name, "computes")
+            if value is not None:
+                self.set(key, value, timeout)
+            return value
+        finally:
+            if locked:
+                self.backend.delete(lock_key)
+
+    def get_version(self, namespace):
+        """
+        Current version of a group of keys; bump_version() invalidates them
+        all at once. Build keys for the group with this version in them.
+        """
+        version_key = self._key(f"{namespace}:version")
+        version = self.backend.get(version_key)
+        if version is None:
+            self.backend.add(version_key, time.time_ns(), None)
+            version = self.backend.get(version_key)
+        return version
+
+    def bump_version(self, namespace):
+        self.backend.set(self._key(f"{namespace}:version"), time.time_ns(), None)
+
+
+def check_shared_regions(app_configs=None, **kwargs):
+    """
+    System check: regions marked SHARED in CACHE_REGIONS are invalidated on
+    writes or count across processes, so on a per-process backend other
+    processes keep serving stale entries. An error when
+    CACHE_REQUIRE_SHARED_BACKEND is set, a warning otherwise.
+    """
+    required = getattr(settings, "CACHE_REQUIRE_SHARED_BACKEND", True)
+    level, check_id = (checks.Error, "helpers.E001") if required else (checks.Warning, "helpers.W001")
+    shared = {BACKENDS[name] for name in SHARED_BACKENDS}
+    messages = []
+    for region, options in getattr(settings, "CACHE_REGIONS", {}).items():
+        backend = settings.CACHES.get(region, settings.CACHES["default"])["BACKEND"]
+        if options.get("SHARED") and backend not in shared:
+            messages.append(level(
+                f"Cache region {region!r} must be shared between processes but uses {backend}.",
+                hint=f"Set CACHE_BACKEND (or the region's BACKEND) to one of: {', '.join(SHARED_BACKENDS)}.",
+                id=check_id,
+            ))
+    return messages
+
+
+auth_tokens = CacheRegion("auth_tokens")
+member_profiles = CacheRegion("member_profiles")
+business_directory = CacheRegion("business_directory")
+job_lists = CacheRegion("job_lists")
+dashboards = CacheRegion("dashboards")
+document_sharing = CacheRegion("document_sharing")
+throttling = CacheRegion("throttling")
+replica_sticky = CacheRegion("replica_sticky")
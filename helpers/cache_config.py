@@ -0,0 +1,61 @@
+"""
+Builds settings.CACHES from CACHE_REGIONS. Imported by settings.py, so it
+must not import Django.
+"""
+import os
+import tempfile
+
+BACKENDS = {
+    # Least recently used entries are evicted first, per process
+    "locmem": "helpers.cache.LocMemRegionCache",
+    # Shared between processes; a random 1/CULL_FREQUENCY of entries is culled when full
+    "file": "helpers.cache.FileRegionCache",
+    # Shared between servers; expired entries, then 1/CULL_FREQUENCY by key order, are culled when full.
+    # Run `manage.py createcachetable` after enabling.
+    "db": "helpers.cache.DatabaseRegionCache",
+    # Shared between servers; Redis evicts by its own maxmemory policy. Needs the redis package.
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+
+# Backends every process on every server sees, so a delete or version bump reaches all of them
+SHARED_BACKENDS = ("db", "redis")
+
+
+def _location(backend, region, location):
+    if backend == "file":
+        return os.path.join(location or os.path.join(tempfile.gettempdir(), "jobcard_cache"), region)
+    if backend == "db":
+        return f"{location or 'jobcard_cache'}_{region}"
+    if backend == "redis":
+        # One server for all regions; KEY_PREFIX keeps them apart
+        return location or "redis://127.0.0.1:6379/1"
+    return region
+
+
+def build_caches(regions, default_backend="locmem", location=None):
+    """
+    One Django cache alias per region, named after it. Each region entry may
+    set BACKEND (see BACKENDS), TIMEOUT, MAX_ENTRIES, CULL_FREQUENCY and
+    LOCATION; `default_backend` and `location` apply to the rest. SHARED
+    marks regions that need one of SHARED_BACKENDS, checked by
+    helpers.cache.check_shared_regions.
+    """
+    caches = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    for region, options in regions.items():
+        backend = options.get("BACKEND", default_backend)
+        if backend not in BACKENDS:
+            raise ValueError(f"Cache region {region!r}: BACKEND must be one of {', '.join(BACKENDS)}.")
+        caches[region] = {
+            "BACKEND": BACKENDS[backend],
+            "LOCATION": _location(backend, region, options.get("LOCATION", location)),
+            "TIMEOUT": options.get("TIMEOUT", 300),
+            "KEY_PREFIX": region,
+        }
+        if backend != "redis":
+            caches[region]["OPTIONS"] = {
+                "MAX_ENTRIES": options.get("MAX_ENTRIES", 1000),
+                "CULL_FREQUENCY": options.get("CULL_FREQUENCY", 3),
+            }
+    return caches
@@ -0,0 +1,88 @@
+"""
+Builds settings.DATABASES entries from .env values. Imported by settings.py,
+so it must not import Django.
+
+Profiles (DB_MODE):
+- "persistent" (default): connections are kept for DB_CONN_MAX_AGE seconds
+  and checked before reuse (DB_CONN_HEALTH_CHECKS).
+- "pool": psycopg 3 connection pool of DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE
+  per process (needs `psycopg[pool]`; Django requires CONN_MAX_AGE = 0).
+- "pgbouncer": behind an external transaction-mode pooler. Connections
+  are kept, server-side cursors and server-side prepared statements are
+  disabled since consecutive transactions may run on different backends.
+"""
+
+MODES = ("persistent", "pool", "pgbouncer")
+TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def _flag(value, default):
+    return default if value in (None, "") else str(value).strip().lower() in TRUE_VALUES
+
+
+def _int(value, default):
+    return default if value in (None, "") else int(value)
+
+
+def database_config(env, prefix="DB"):
+    """
+    A PostgreSQL DATABASES entry from <prefix>_NAME/USER/PASSWORD/HOST/PORT
+    and the connection profile settings above.
+    """
+    def get(name, default=None):
+        return env.get(f"{prefix}_{name}", default)
+
+    mode = (get("MODE") or "persistent").lower()
+    if mode not in MODES:
+        raise ValueError(f"{prefix}_MODE must be one of: {', '.join(MODES)}.")
+
+    config = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": get("NAME"),
+        "USER": get("USER"),
+        "PASSWORD": get("PASSWORD"),
+        "HOST": get("HOST"),
+        "PORT": get("PORT"),
+        "CONN_MAX_AGE": _int(get("CONN_MAX_AGE"), 60),
+        "CONN_HEALTH_CHECKS": _flag(get("CONN_HEALTH_CHECKS"), True),
+        "OPTIONS": {
+            "connect_timeout": _int(get("CONNECT_TIMEOUT"), 5),
+        },
+    }
+
+    if mode == "pool":
+        config["CONN_MAX_AGE"] = 0
+        config["OPTIONS"]["pool"] = {
+            "min_size": _int(get("POOL_MIN_SIZE"), 2),
+            "max_size": _int(get("POOL_MAX_SIZE"), 10),
+            "timeout": _int(get("POOL_TIMEOUT"), 10),
+        }
+
+    if mode == "pgbouncer":
+        config["DISABLE_SERVER_SIDE_CURSORS"] = True
+        if _psycopg3():
+            # psycopg 3 prepares repeated queries on the server; psycopg2 never does
+            config["OPTIONS"]["prepare_threshold"] = None
+
+    return config
+
+
+def replica_config(env):
+    """
+    The "replica" DATABASES entry when DB_REPLICA_HOST is set, else None.
+    Any DB_REPLICA_<NAME> missing falls back to DB_<NAME>.
+    """
+    if not env.get("DB_REPLICA_HOST"):
+        return None
+    overrides = {f"DB_{key[len('DB_REPLICA_'):]}": value for key, value in env.items() if key.startswith("DB_REPLICA_")}
+    config = database_config({**env, **overrides})
+    config["TEST"] = {"MIRROR": "default"}
+    return config
+
+
+def _psycopg3():
+    try:
+        import psycopg  # noqa: F401
+    except ImportError:
+        return False
+    return True
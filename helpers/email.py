@@ -1,48 +1,68 @@
-import threading
 import requests
 from django.template.loader import render_to_string
-from django.conf import settings
+from jobcard_admin.models import EmailOutbox
+
+SES_API_URL = "https://w1yg18jn76.execute-api.ap-south-1.amazonaws.com/default/sesapi"
+SENDER_EMAIL = "contact@jsjcard.com"  # Your verified SES sender email
+
+
+class EmailDeliveryError(Exception):
+    pass
+
+
+def _outbox_row(subject, template_name, context, recipient_list, attachments=None):
+    recipient = recipient_list[0] if recipient_list else None
+    if not recipient:
+        return None
+    return EmailOutbox(
+        recipient=recipient,
+        subject=subject,
+        template_name=template_name,
+        context=context,
+        attachments=attachments,  # Must be a list of dicts as per your Lambda spec
+    )
 
 
 def send_template_email(subject, template_name, context, recipient_list, attachments=None):
     """
-    Send an email by invoking your AWS Lambda SES API.
-    Supports HTML content and optional attachments.
+    Queue an email in the outbox. Rendering and delivery through the AWS
+    Lambda SES API happen in the `send_outbox_emails` worker.
     """
-    # Render the HTML content
-    html_message = render_to_string(template_name, context)
+    message = _outbox_row(subject, template_name, context, recipient_list, attachments)
+    if message is None:
+        print("No recipient provided.")
+        return None
+    message.save()
+    return message
 
-    sender = "contact@jsjcard.com"  # Your verified SES sender email
-    recipient = recipient_list[0] if recipient_list else None
 
-    if not recipient:
-        print("No recipient provided.")
-        return
+def queue_template_emails(messages):
+    """
+    Queue many emails with one insert. `messages` is an iterable of dicts with
+    the keyword arguments of send_template_email.
+    """
+    rows = [row for row in (_outbox_row(**message) for message in messages) if row is not None]
+    return EmailOutbox.objects.bulk_create(rows)
 
-    api_url = "https://w1yg18jn76.execute-api.ap-south-1.amazonaws.com/default/sesapi"
 
-    # Prepare payload
+def deliver_email(message, session):
+    """
+    Render an outbox message and POST it to the SES API. Raises
+    EmailDeliveryError when the API does not accept it.
+    """
     payload = {
-        "sender": sender,
-        "recipient": recipient,
-        "subject": subject,
-        "body": html_message
+        "sender": SENDER_EMAIL,
+        "recipient": message.recipient,
+        "subject": message.subject,
+        "body": render_to_string(message.template_name, message.context)
     }
+    if message.attachments:
+        payload["attachments"] = message.attachments
 
-    # If attachments are provided, encode them as JSON string
-    if attachments:
-        payload["attachments"] = attachments  # Must be a list of dicts as per your Lambda spec
-
-    headers = {"Content-Type": "application/json"}
-
-    def send_email():
-        try:
-            response = requests.post(api_url, json=payload, headers=headers)
-            if response.status_code == 200:
-                print("✅ Email sent successfully via AWS SES API.")
-            else:
-                print(f"❌ Failed to send email. Status: {response.status_code}, Response: {response.text}")
-        except Exception as e:
-            print(f"❌ Exception while sending email: {e}")
+    try:
+        response = session.post(SES_API_URL, json=payload, timeout=15)
+    except requests.RequestException as e:
+        raise EmailDeliveryError(str(e)) from e
 
-    threading.Thread(target=send_email).start()
+    if response.status_code != 200:
+        raise EmailDeliveryError(f"Status: {response.status_code}, Response: {response.text[:500]}")
@@ -0,0 +1,102 @@
+import hashlib
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.response import Response
+from jobcard_admin.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+IDEMPOTENCY_KEY_TTL = getattr(settings, "IDEMPOTENCY_KEY_TTL", timedelta(hours=24))
+# A key still in flight after this long belongs to a request that died; it can be claimed again
+IDEMPOTENCY_IN_FLIGHT_TIMEOUT = getattr(settings, "IDEMPOTENCY_IN_FLIGHT_TIMEOUT", timedelta(minutes=5))
+MAX_KEY_LENGTH = 255
+
+
+def _caller(user):
+    """
+    "<app>:<id>" for an authenticated SSO user, None otherwise. Each app
+    verifies its own kind of token, so ids are only unique within an app.
+    """
+    if not getattr(user, "is_authenticated", False) or getattr(user, "id", None) is None:
+        return None
+    return f"{type(user).__module__.split('.')[0]}:{user.id}"
+
+
+def _request_hash(request):
+    body = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder, default=str)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def _stored_response(stored, request_hash):
+    if stored is None or stored.status_code is None:
+        return Response({
+            "success": False,
+            "message": f"A request with this {IDEMPOTENCY_HEADER} is still in progress; retry shortly."
+        }, status=409)
+    if stored.request_hash != request_hash:
+        return Response({
+            "success": False,
+            "message": f"{IDEMPOTENCY_HEADER} was already used for a different request."
+        }, status=422)
+    return Response(stored.response_body, status=stored.status_code, headers={"Idempotent-Replayed": "true"})
+
+
+def idempotent_response(request, endpoint, handler):
+    """
+    Run `handler()` once per `Idempotency-Key` header, endpoint and caller.
+    The key is claimed with an in-flight row before the handler runs, so a
+    concurrent request with the same key gets a 409 instead of running
+    too. A repeated key within IDEMPOTENCY_KEY_TTL gets the stored response
+    back (marked with an `Idempotent-Replayed` header) without calling the
+    handler; the same key with a different request body gets a 422.
+    Requests without the header or an authenticated caller are never
+    stored, and a server error releases the key for a retry.
+    """
+    key = (request.headers.get(IDEMPOTENCY_HEADER) or "").strip()
+    caller = _caller(request.user)
+    if not key or caller is None:
+        return handler()
+    if len(key) > MAX_KEY_LENGTH:
+        return Response({
+            "success": False,
+            "message": f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters."
+        }, status=400)
+
+    scope = f"{endpoint}:{caller}"[:MAX_KEY_LENGTH]
+    request_hash = _request_hash(request)
+    now = timezone.now()
+    try:
+        with transaction.atomic():
+            IdempotencyKey.objects.filter(scope=scope, key=key).filter(
+                Q(created_at__lt=now - IDEMPOTENCY_KEY_TTL)
+                | Q(status_code__isnull=True, created_at__lt=now - IDEMPOTENCY_IN_FLIGHT_TIMEOUT)
+            ).delete()
+            claim = IdempotencyKey.objects.create(scope=scope, key=key, request_hash=request_hash, created_at=now)
+    except IntegrityError:
+        # Already claimed, by an earlier request or one still running
+        return _stored_response(IdempotencyKey.objects.filter(scope=scope, key=key).first(), request_hash)
+
+    try:
+        response = handler()
+    except BaseException:
+        claim.delete()
+        raise
+    if response.status_code >= 500:
+        claim.delete()
+    else:
+        claim.status_code = response.status_code
+        claim.response_body = response.data
+        claim.save(update_fields=["status_code", "response_body"])
+    return response
+
+
+def purge_idempotency_keys():
+    """
+    Delete keys older than IDEMPOTENCY_KEY_TTL. Returns the number deleted.
+    """
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=timezone.now() - IDEMPOTENCY_KEY_TTL).delete()
+    return deleted
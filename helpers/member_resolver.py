@@ -0,0 +1,81 @@
+import requests
+from django.conf import settings
+from helpers.cache import member_profiles, single_flight
+from helpers.utils import auth_server_call
+
+MEMBER_CACHE_TIMEOUT = getattr(settings, "MEMBER_RESOLVER_CACHE_TIMEOUT", 60 * 15)
+MEMBER_NOT_FOUND_TIMEOUT = getattr(settings, "MEMBER_RESOLVER_NOT_FOUND_TIMEOUT", 60)
+
+_NOT_FOUND = "__not_found__"
+
+
+class InvalidMemberIdentifier(ValueError):
+    pass
+
+
+class MemberLookupFailed(Exception):
+    """
+    The auth server could not be reached or answered with an error, so it is
+    unknown whether the member exists.
+    """
+
+
+def _card_key(card_number):
+    return f"member:card:{card_number}"
+
+
+def _mobile_key(mobile_number):
+    return f"member:mobile:{mobile_number}"
+
+
+def _lookup_mobile(mobile_number):
+    # Only a 404 says there is no such member; errors are raised and not cached
+    try:
+        response = auth_server_call("GET", "/api/member-details/", params={"mobile_number": mobile_number})
+    except requests.RequestException as e:
+        raise MemberLookupFailed(f"Error contacting auth service: {e}") from e
+    if response.status_code not in (200, 404):
+        raise MemberLookupFailed(f"Auth service returned {response.status_code}")
+
+    member_data = response.json() if response.status_code == 200 else None
+    if not member_data or not member_data.get("mbrcardno"):
+        member_profiles.set(_mobile_key(mobile_number), _NOT_FOUND, MEMBER_NOT_FOUND_TIMEOUT)
+        return None
+
+    member = {
+        "card_number": str(member_data.get("mbrcardno")),
+        "mobile_number": member_data.get("mobile_number") or mobile_number,
+        "full_name": member_data.get("full_name"),
+    }
+    member_profiles.set_many({
+        _mobile_key(mobile_number): member,
+        _card_key(member["card_number"]): member,
+    }, MEMBER_CACHE_TIMEOUT)
+    return member
+
+
+def resolve_member(identifier):
+    """
+    Resolve a 16-digit card number or a 10-digit mobile number to
+    {"card_number", "mobile_number", "full_name"}.
+
+    Card numbers are used as they are (with name/mobile filled in when already
+    cached); mobile numbers go to the auth server once and are cached both
+    ways, misses included. Returns None when no member has that mobile number,
+    raises MemberLookupFailed when the auth server can't say, and
+    InvalidMemberIdentifier for anything that is neither.
+    """
+    value = str(identifier).strip()
+
+    if len(value) == 16 and value.isdigit():
+        return member_profiles.get(_card_key(value)) or {"card_number": value, "mobile_number": None, "full_name": None}
+
+    if len(value) == 10 and value.isdigit():
+        cached = member_profiles.get(_mobile_key(value))
+        if cached == _NOT_FOUND:
+            return None
+        if cached is not None:
+            return cached
+        return single_flight(_mobile_key(value), lambda: _lookup_mobile(value))
+
+    raise InvalidMemberIdentifier(value)
@@ -0,0 +1,246 @@
+"""
+Per-process request metrics in the Prometheus text format.
+
+RequestMetricsMiddleware times every request and counts, per view, its
+database queries and query time, its calls to the auth server and its
+response size. helpers.utils.auth_server_call reports every auth server
+call. metrics_view serves everything, plus the helpers.cache region
+counters, at /metrics for Prometheus to scrape from each worker.
+"""
+import hmac
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from asgiref.local import Local
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+METRICS = {
+    "http_requests_total": ("counter", "Requests handled, by view, method and status code."),
+    "http_request_duration_seconds": ("histogram", "Request latency by view and method.", LATENCY_BUCKETS),
+    "http_response_size_bytes": ("histogram", "Response body size by view.", SIZE_BUCKETS),
+    "db_queries_per_request": ("histogram", "Database queries per request by view.", COUNT_BUCKETS),
+    "db_query_duration_seconds_total": ("counter", "Time spent in database queries by view."),
+    "auth_server_calls_per_request": ("histogram", "Auth server calls per request by view.", COUNT_BUCKETS),
+    "auth_server_duration_seconds_total": ("counter", "Time spent waiting on the auth server by view."),
+    "auth_server_request_duration_seconds": (
+        "histogram", "Auth server call latency by endpoint and outcome (status code or error).", LATENCY_BUCKETS,
+    ),
+    "cache_operations_total": ("counter", "helpers.cache operations by region and operation."),
+}
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_lock = threading.Lock()
+_counters = defaultdict(float)
+_histograms = {}
+
+_current = Local()
+
+
+def inc(name, labels, amount=1):
+    with _lock:
+        _counters[name, tuple(sorted(labels.items()))] += amount
+
+
+def observe(name, labels, value):
+    buckets = METRICS[name][2]
+    key = name, tuple(sorted(labels.items()))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {"buckets": [0] * len(buckets), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                histogram["buckets"][i] += 1
+        histogram["sum"] += value
+        histogram["count"] += 1
+
+
+def reset_metrics():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+class RequestStats:
+    """
+    What one request spent on the database and the auth server.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.auth_calls = 0
+        self.auth_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            with self._lock:
+                self.queries += 1
+                self.query_seconds += time.perf_counter() - started
+
+
+def current_request_stats():
+    return getattr(_current, "stats", None)
+
+
+def with_request_stats(func):
+    """
+    Wrap `func` so calls made from worker threads count towards the
+    current request, e.g. for ThreadPoolExecutor.map.
+    """
+    stats = current_request_stats()
+
+    def wrapper(*args, **kwargs):
+        previous = current_request_stats()
+        _current.stats = stats
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current.stats = previous
+
+    return wrapper
+
+
+def record_auth_server_call(endpoint, outcome, seconds):
+    observe("auth_server_request_duration_seconds", {"endpoint": endpoint, "outcome": outcome}, seconds)
+    stats = current_request_stats()
+    if stats is not None:
+        with stats._lock:
+            stats.auth_calls += 1
+            stats.auth_seconds += seconds
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    func = getattr(match.func, "view_class", match.func)
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+class RequestMetricsMiddleware:
+    """
+    Put first in MIDDLEWARE so the latency covers the whole stack.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = _current.stats = RequestStats()
+        started = time.perf_counter()
+        status_code = 500
+        response = None
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(stats))
+                response = self.get_response(request)
+            status_code = response.status_code
+            return response
+        finally:
+            _current.stats = None
+            self._record(request, response, status_code, stats, time.perf_counter() - started)
+
+    def _record(self, request, response, status_code, stats, seconds):
+        view = _view_name(request)
+        inc("http_requests_total", {"view": view, "method": request.method, "status": str(status_code)})
+        observe("http_request_duration_seconds", {"view": view, "method": request.method}, seconds)
+        if response is not None and not response.streaming:
+            observe("http_response_size_bytes", {"view": view}, len(response.content))
+        observe("db_queries_per_request", {"view": view}, stats.queries)
+        inc("db_query_duration_seconds_total", {"view": view}, stats.query_seconds)
+        observe("auth_server_calls_per_request", {"view": view}, stats.auth_calls)
+        inc("auth_server_duration_seconds_total", {"view": view}, stats.auth_seconds)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels, **extra):
+    items = [*labels, *extra.items()]
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in items) + "}"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_metrics():
+    from helpers.cache import METRICS as CACHE_METRICS, cache_metrics
+
+    for region, counts in cache_metrics().items():
+        for operation in CACHE_METRICS:
+            key = "cache_operations_total", (("operation", operation), ("region", region))
+            with _lock:
+                _counters[key] = counts[operation]
+
+    with _lock:
+        counters = dict(_counters)
+        histograms = {key: {**value, "buckets": list(value["buckets"])} for key, value in _histograms.items()}
+
+    lines = []
+    for name, (kind, help_text, *buckets) in METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        if kind == "counter":
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+            continue
+        for (metric, labels), histogram in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, count in zip(buckets[0], histogram["buckets"]):
+                lines.append(f"{name}_bucket{_labels(labels, le=_number(bound))} {count}")
+            lines.append(f'{name}_bucket{_labels(labels, le="+Inf")} {histogram["count"]}')
+            lines.append(f"{name}_sum{_labels(labels)} {_number(histogram['sum'])}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def _client_ip(request):
+    """
+    REMOTE_ADDR, or behind METRICS_NUM_PROXIES trusted proxies the address
+    the first of them added to X-Forwarded-For. None for forwarded requests
+    when no proxies are trusted, since REMOTE_ADDR is then the proxy.
+    """
+    num_proxies = getattr(settings, "METRICS_NUM_PROXIES", 0)
+    forwarded = [addr.strip() for addr in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if addr.strip()]
+    if not num_proxies:
+        return None if forwarded else request.META.get("REMOTE_ADDR")
+    if len(forwarded) < num_proxies:
+        return None
+    return forwarded[-num_proxies]
+
+
+def metrics_view(request):
+    """
+    Internal: only with `Authorization: Bearer <METRICS_TOKEN>`, or from one
+    of METRICS_ALLOWED_IPS when that is set. Nobody by default.
+    """
+    metrics_token = getattr(settings, "METRICS_TOKEN", None)
+    allowed_ips = getattr(settings, "METRICS_ALLOWED_IPS", ())
+    token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+    # Compared as bytes: compare_digest rejects str with non-ASCII characters
+    allowed = (metrics_token and hmac.compare_digest(token.encode(), metrics_token.encode())) or (
+        allowed_ips and _client_ip(request) in allowed_ips
+    )
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
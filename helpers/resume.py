@@ -0,0 +1,39 @@
+import os
+from urllib.parse import urlparse
+
+RESUME_NAME_LENGTH = 15
+RESUME_EXTENSION_LENGTH = 16
+RESUME_METADATA_FIELDS = ("has_resume", "resume_name", "resume_extension")
+
+
+def resume_metadata(resume_url):
+    """
+    (has_resume, display name, extension) for a resume URL. The display name
+    is the last 15 characters of the file name, as shown in the apps.
+    """
+    if not resume_url or not resume_url.strip():
+        return False, None, None
+
+    try:
+        full_filename = os.path.basename(urlparse(resume_url.strip()).path)
+    except ValueError:
+        return True, None, None
+
+    extension = os.path.splitext(full_filename)[1].lstrip(".").lower()[:RESUME_EXTENSION_LENGTH] or None
+    return True, full_filename[-RESUME_NAME_LENGTH:], extension
+
+
+def set_resume_metadata(instance, resume_url):
+    """
+    Copy the metadata of `resume_url` onto the instance's resume columns.
+    """
+    instance.has_resume, instance.resume_name, instance.resume_extension = resume_metadata(resume_url)
+
+
+def with_resume_metadata_fields(update_fields, resume_field):
+    """
+    Extend a save() `update_fields` so the metadata is written whenever the resume is.
+    """
+    if update_fields is None or resume_field not in update_fields:
+        return update_fields
+    return {*update_fields, *RESUME_METADATA_FIELDS}
@@ -0,0 +1,357 @@
+"""
+Test helpers: a local stand-in for the auth server and a TestCase that
+measures what each request costs in database queries and auth server calls.
+
+StubAuthServer answers the auth server endpoints this project calls with
+made-up but consistent data, so views run end to end without the network.
+EndpointBudgetTestCase points AUTH_SERVER_URL at it; its tests seed rows
+with the seed_* functions, call endpoints and assert the per-request counts
+stay under a fixed bound however many rows there are.
+"""
+import json
+import threading
+from collections import namedtuple
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+MEMBER_CARD = 3100000000000001
+BUSINESS_ID = 101
+INSTITUTE_ID = 501
+
+# token -> (verify-token path, user data returned for it)
+TOKENS = {
+    "member-token": ("/api/member/verify-token/", {
+        "user_id": 1, "mbrcardno": MEMBER_CARD, "full_name": "Member One",
+    }),
+    "business-token": ("/api/verify-token/", {
+        "user_id": 2, "business_id": BUSINESS_ID, "business_name": "Acme",
+    }),
+    "institute-token": ("/api/verify-token/", {
+        "user_id": 3, "business_id": INSTITUTE_ID, "business_name": "City College",
+    }),
+    "staff-token": ("/api/user/verify-token/", {
+        "id": 4, "employee_id": 4, "full_name": "Staff One", "email": "staff@example.com", "is_jobmitra": False,
+    }),
+    "jobmitra-token": ("/api/user/verify-token/", {
+        "id": 5, "employee_id": 5, "full_name": "Mitra One", "email": "mitra@example.com", "is_jobmitra": True,
+    }),
+    "government-token": ("/api/goverment/verify-token/", {
+        "user_id": 6, "full_name": "Officer One", "email": "officer@example.com",
+        "mobile_number": "9000000006", "department": "Labour", "designation": "Officer",
+    }),
+}
+
+
+def member_card(n):
+    return MEMBER_CARD + n
+
+
+def member_details(card_number):
+    card_number = int(card_number)
+    mobile = str(card_number)[-10:]
+    return {
+        "mbrcardno": card_number,
+        "full_name": f"Member {card_number}",
+        "first_name": "Member",
+        "last_name": str(card_number),
+        "email": f"{card_number}@example.com",
+        "mobile_number": mobile,
+        "address": {"state": "Odisha", "district": "Khurda"},
+    }
+
+
+class StubAuthServer:
+    """
+    Threaded HTTP server on a free local port. Every call is recorded as
+    (method, path) in `calls`.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+
+    def count(self, path=None):
+        with self._lock:
+            return sum(1 for _, called in self.calls if path is None or called == path)
+
+    def respond(self, method, path, query, body):
+        """
+        (status, payload) for one call.
+        """
+        if method == "POST" and path.endswith("/verify-token/"):
+            verify_path, user = TOKENS.get(body.get("token"), (None, None))
+            if verify_path != path:
+                return 401, {"detail": "Invalid token."}
+            return 200, user
+        if path == "/api/cardno/member-details/":
+            card_number = query.get("card_number", "")
+            return (200, member_details(card_number)) if card_number.isdigit() else (404, {})
+        if path == "/api/member-details/":
+            mobile = query.get("mobile_number", "")
+            # Inverse of member_details(): the mobile number is the card's last ten digits
+            return (200, member_details(MEMBER_CARD - MEMBER_CARD % 10**10 + int(mobile))) if mobile.isdigit() else (404, {})
+        if path == "/api/business/details/":
+            business_id = query.get("business_id", "")
+            return 200, {"business_id": business_id, "business_name": f"Business {business_id}"}
+        if path == "/member/job/profile/":
+            return 200, {"EducationDetails": {"instituteId": INSTITUTE_ID, "universityName": "City University"}}
+        if path == "/api/admin/dashboard/business-summary/":
+            return 200, {"institutes": 2, "companies": 3, "total_students": 40}
+        return 404, {}
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                parts = urlsplit(self.path)
+                query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+                with stub._lock:
+                    stub.calls.append((self.command, parts.path))
+
+                code, payload = stub.respond(self.command, parts.path, query, body)
+                content = json.dumps(payload).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+# Per member / per business auth server endpoints; the auth server has no batch version
+LOOKUP_PATHS = ("/api/cardno/member-details/", "/api/business/details/")
+
+Cost = namedtuple("Cost", ["response", "queries", "auth_calls", "lookups"])
+
+
+class EndpointBudgetTestCase(TestCase):
+    """
+    Runs against a StubAuthServer. `measure` makes one request with cold
+    caches and returns what it cost; `assertScalesFlat` checks that cost
+    stays the same after `grow()` adds rows and stays within the bounds.
+
+    The auth server has no batch member or business endpoint, so those
+    lookups are counted apart from the other auth server calls: lists that
+    show member or business details may look up each distinct one once,
+    never more.
+    """
+    stub = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stub = StubAuthServer().start()
+        cls._stub_settings = override_settings(AUTH_SERVER_URL=cls.stub.url)
+        cls._stub_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._stub_settings.disable()
+        cls.stub.stop()
+
+    def setUp(self):
+        self.client = APIClient()
+
+    @staticmethod
+    def clear_caches():
+        for alias in settings.CACHES:
+            caches[alias].clear()
+
+    def measure(self, method, path, token, data=None, format="json"):
+        self.clear_caches()
+        self.stub.reset()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        with CaptureQueriesContext(connections["default"]) as queries:
+            response = getattr(self.client, method)(path, data, format=format)
+        lookups = sum(self.stub.count(path) for path in LOOKUP_PATHS)
+        return Cost(response, len(queries), self.stub.count() - lookups, lookups)
+
+    def assertWithinBudget(self, method, path, token, max_queries, max_auth_calls, lookups=0, data=None,
+                           status_code=200, format="json"):
+        """
+        `lookups`: how many distinct members and businesses the response
+        shows, or a function of the response returning it.
+        """
+        cost = self.measure(method, path, token, data, format)
+        label = f"{method.upper()} {path}"
+        self.assertEqual(cost.response.status_code, status_code, getattr(cost.response, "data", None))
+        self.assertLessEqual(cost.queries, max_queries, f"{label}: {cost.queries} queries")
+        self.assertLessEqual(cost.auth_calls, max_auth_calls, f"{label}: {cost.auth_calls} auth server calls")
+        lookups = lookups(cost.response) if callable(lookups) else lookups
+        self.assertLessEqual(cost.lookups, lookups, f"{label}: {cost.lookups} member/business lookups")
+        return cost
+
+    def assertScalesFlat(self, method, path, token, max_queries, max_auth_calls, grow, lookups=0,
+                         status_code=200):
+        """
+        Same query and auth server call counts before and after `grow()`.
+        Only for reads: the request is made twice.
+        """
+        before = self.assertWithinBudget(method, path, token, max_queries, max_auth_calls, lookups, status_code=status_code)
+        grow()
+        after = self.assertWithinBudget(method, path, token, max_queries, max_auth_calls, lookups, status_code=status_code)
+        self.assertEqual(
+            (after.queries, after.auth_calls), (before.queries, before.auth_calls),
+            f"{method.upper()} {path} grows with rows",
+        )
+        return after
+
+
+def distinct_members(response, key="member_card"):
+    """
+    For `lookups`: distinct member cards in the response's "data" rows.
+    """
+    return len({row[key] for row in response.data["data"]})
+
+
+def job_payload(**fields):
+    """
+    Request body for creating or updating a job.
+    """
+    payload = {
+        "title": "Welder",
+        "company_name": "Acme",
+        "location": "Bhubaneswar",
+        "workplace": "On-site",
+        "job_type": ["Full-time"],
+        "number_of_posts": 2,
+        "recruitment_timeline": "Immediate",
+        "pay_rate": "Per month",
+        "experience_required": "Fresher",
+        "application_end_date": (date.today() + timedelta(days=30)).isoformat(),
+    }
+    payload.update(fields)
+    return payload
+
+
+def job_upload(count, **fields):
+    """
+    A JSONL upload of `count` jobs for the import endpoints.
+    """
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    lines = [json.dumps(job_payload(title=f"Imported {n}", **fields)) for n in range(count)]
+    return SimpleUploadedFile("jobs.jsonl", "\n".join(lines).encode(), content_type="application/jsonl")
+
+
+def seed_jobs(count, business_id=BUSINESS_ID, start=0, **fields):
+    """
+    `count` active jobs for the business, closing in a month unless
+    `fields` say otherwise.
+    """
+    from jobcard_business.models import Job
+
+    defaults = {
+        "business_id": business_id,
+        "company_name": "Acme",
+        "location": "Bhubaneswar",
+        "workplace": "On-site",
+        "job_type": ["Full-time"],
+        "number_of_posts": 2,
+        "recruitment_timeline": "Immediate",
+        "pay_rate": "Per month",
+        "experience_required": "Fresher",
+        "application_end_date": date.today() + timedelta(days=30),
+    }
+    jobs = [Job(title=f"Job {start + i}", **{**defaults, **fields}) for i in range(count)]
+    return Job.objects.bulk_create(jobs)
+
+
+def seed_applications(jobs, members, start=0, status="applied", institute_id=INSTITUTE_ID):
+    """
+    One application from each of `members` member cards (from `start`) to each job.
+    """
+    from jobcard_business.models import JobApplication
+
+    return JobApplication.objects.bulk_create([
+        JobApplication(
+            job=job,
+            member_card=member_card(start + n),
+            institute_id=institute_id,
+            resume="https://files.example.com/resume.pdf",
+            has_resume=True,
+            resume_name="resume.pdf",
+            resume_extension="pdf",
+            status=status,
+            referral=5,
+        )
+        for job in jobs
+        for n in range(members)
+    ])
+
+
+def seed_members(members, start=0):
+    """
+    MbrDocuments with a resume and a certificate, and HR and member feedback,
+    for `members` member cards from `start`.
+    """
+    from jobcard_business.feedback_stats import record_feedback
+    from jobcard_business.models import Feedback, HRFeedback, HRFeedbackEntry
+    from jobcard_member.models import MbrDocuments
+    from helpers.resume import set_resume_metadata
+
+    cards = [member_card(start + n) for n in range(members)]
+    documents = []
+    for card in cards:
+        document = MbrDocuments(
+            card_number=card,
+            Resume="https://files.example.com/resume.pdf",
+            TenthCertificate="https://files.example.com/tenth.pdf",
+        )
+        set_resume_metadata(document, document.Resume)  # bulk_create skips save()
+        document.refresh_completeness()
+        documents.append(document)
+    MbrDocuments.objects.bulk_create(documents)
+
+    feedbacks = Feedback.objects.bulk_create([
+        Feedback(card_number=card, business_id=BUSINESS_ID, happiness_rating=8, has_issues=False) for card in cards
+    ])
+    for feedback in feedbacks:
+        record_feedback(feedback)  # bulk_create skips the post_save that keeps the rollups
+    candidates = HRFeedback.objects.bulk_create([
+        HRFeedback(candidate_name=f"Member {card}", card_number=card) for card in cards
+    ])
+    HRFeedbackEntry.objects.bulk_create([
+        HRFeedbackEntry(candidate=candidate, card_number=candidate.card_number, business_id=BUSINESS_ID, company_name="Acme")
+        for candidate in candidates
+    ])
+    return cards
@@ -0,0 +1,135 @@
+import hashlib
+import time
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+from helpers.cache import throttling
+
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 60 * 60 * 24}
+
+
+def parse_rate(rate):
+    """
+    "20/min" -> (20, 60): bucket capacity and the seconds it takes to refill it.
+    """
+    if not rate:
+        return None
+    capacity, period = rate.split("/")
+    return int(capacity), PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Token bucket kept in the throttling cache region. Each bucket holds up
+    to `capacity` requests and refills continuously over the period, so
+    short bursts are allowed while the average stays at the rate.
+
+    A view opts in with `throttle_classes` and a `throttle_scope`. The rate
+    comes from the view's `throttle_rates[<bucket scope>]`, then from
+    DEFAULT_THROTTLE_RATES["<throttle_scope>.<bucket scope>"], then from
+    DEFAULT_THROTTLE_RATES["<bucket scope>"]. No rate means no limit.
+
+    The read-modify-write on the cache is not atomic, so a burst of
+    concurrent requests can slip a few past the limit; that is acceptable for
+    abuse protection and avoids any external service.
+    """
+    scope = None
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def get_bucket_id(self, request, view):
+        """
+        What this bucket counts per (IP, token, resource...). None skips it.
+        """
+        raise NotImplementedError
+
+    def get_rate(self, view):
+        view_rates = getattr(view, "throttle_rates", None) or {}
+        if self.scope in view_rates:
+            return view_rates[self.scope]
+        rates = api_settings.DEFAULT_THROTTLE_RATES or {}
+        view_scope = getattr(view, "throttle_scope", None)
+        return rates.get(f"{view_scope}.{self.scope}", rates.get(self.scope))
+
+    def allow_request(self, request, view):
+        rate = parse_rate(self.get_rate(view))
+        bucket_id = self.get_bucket_id(request, view) if rate else None
+        if bucket_id is None:
+            return True
+
+        capacity, period = rate
+        refill_per_second = capacity / period
+        key = f"throttle:{getattr(view, 'throttle_scope', type(view).__name__)}:{self.scope}:{bucket_id}"
+
+        now = time.time()
+        tokens, updated_at = throttling.get(key) or (capacity, now)
+        tokens = min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+        if tokens < 1:
+            self.wait_seconds = (1 - tokens) / refill_per_second
+            throttling.set(key, (tokens, now), period)
+            return False
+
+        throttling.set(key, (tokens - 1, now), period)
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPRateThrottle(TokenBucketThrottle):
+    """
+    One bucket per client IP (honours NUM_PROXIES like DRF's own throttles).
+    """
+    scope = "ip"
+
+    def get_bucket_id(self, request, view):
+        return self.get_ident(request)
+
+
+class TokenRateThrottle(TokenBucketThrottle):
+    """
+    One bucket per Authorization header. The token is hashed, not verified,
+    so it is counted before any call to the auth server.
+    """
+    scope = "token"
+
+    def get_bucket_id(self, request, view):
+        auth_header = request.headers.get("Authorization")
+        if not auth_header:
+            return None
+        return hashlib.sha256(auth_header.encode()).hexdigest()
+
+
+class ResourceRateThrottle(TokenBucketThrottle):
+    """
+    One bucket per targeted resource, named by the view's
+    `throttle_resource_param` (read from the body, then the query string).
+    Caps guesses against a single resource however many IPs they come from.
+    """
+    scope = "resource"
+
+    def get_bucket_id(self, request, view):
+        param = getattr(view, "throttle_resource_param", None)
+        if not param:
+            return None
+        value = request.data.get(param) if hasattr(request.data, "get") else None
+        value = value or request.query_params.get(param)
+        if not value:
+            return None
+        return hashlib.sha256(str(value).encode()).hexdigest()
+
+
+class ThrottleBeforeAuthMixin:
+    """
+    Check throttles before authentication so throttled requests never reach
+    the auth server, the session store or the database. Only use with
+    throttles that do not need `request.user`.
+    """
+    def perform_authentication(self, request):
+        super().check_throttles(request)
+        super().perform_authentication(request)
+
+    def check_throttles(self, request):
+        # Already checked in perform_authentication
+        pass
@@ -1,17 +1,37 @@
+import hashlib
 import random
 import requests
-from django.core.cache import cache
+from concurrent.futures import ThreadPoolExecutor
 import urllib.parse
+import time
 import pytz
 from datetime import datetime
 from django.conf import settings
+from helpers.cache import auth_tokens, business_directory, member_profiles
+from helpers.metrics import record_auth_server_call, with_request_stats
+
+
+def auth_server_call(method, path, **kwargs):
+    """
+    requests.request() against AUTH_SERVER_URL + path, timed and counted in
+    helpers.metrics per endpoint and per request.
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        response = requests.request(method, settings.AUTH_SERVER_URL + path, **kwargs)
+        outcome = str(response.status_code)
+        return response
+    finally:
+        record_auth_server_call(path, outcome, time.perf_counter() - started)
+
 
 def get_member_job_prifile_by_card(card_number):
     """
     Fetches member job profile details by member ID.
     """
     try:
-        response = requests.get(settings.AUTH_SERVER_URL + "/member/job/profile/", params={"card_number": card_number})
+        response = auth_server_call("GET", "/member/job/profile/", params={"card_number": card_number})
         if response.status_code == 200:
             return response.json()
         return None
@@ -23,7 +43,7 @@ def get_member_job_prifile_by_card(card_number):
 
 def get_member_details_by_mobile(mobile_number):
     try:
-        response = requests.get(settings.AUTH_SERVER_URL + "/api/member-details/", params={"mobile_number": mobile_number})
+        response = auth_server_call("GET", "/api/member-details/", params={"mobile_number": mobile_number})
         if response.status_code == 200:
             return response.json()
         return None
@@ -36,15 +56,28 @@ def get_member_details_by_mobile(mobile_number):
 
 # AUTH_SERVICE_CARD_URL = settings.AUTH_SERVER_URL + "/cardno/member-details/",  
 
-def get_member_details_by_card(card_number):
+def _fetch_member_details_by_card(card_number):
     try:
-        response = requests.get(settings.AUTH_SERVER_URL + "/api/cardno/member-details/", params={"card_number": card_number})
+        response = auth_server_call("GET", "/api/cardno/member-details/", params={"card_number": card_number})
         if response.status_code == 200:
             return response.json()
         return None
     except requests.RequestException as e:
         print(f"Error contacting auth service: {e}")
         return None
+
+
+def _member_details_key(card_number):
+    return f"details:card:{card_number}"
+
+
+def get_member_details_by_card(card_number):
+    """
+    Member details from the auth server, cached in the member_profiles region.
+    """
+    return member_profiles.get_or_compute(
+        _member_details_key(card_number), lambda: _fetch_member_details_by_card(card_number)
+    )
     
     
     
@@ -53,8 +86,21 @@ def get_member_details_by_card(card_number):
 # AUTH_SERVICE_BUSINESS_URL = settings.AUTH_SERVER_URL + "/business/details/",
 
 def get_business_details_by_id(business_id):
+    """
+    Business details from the auth server, cached in the business_directory region.
+    """
+    return business_directory.get_or_compute(
+        _business_details_key(business_id), lambda: _fetch_business_details_by_id(business_id)
+    )
+
+
+def _business_details_key(business_id):
+    return f"business:{business_id}"
+
+
+def _fetch_business_details_by_id(business_id):
     try:
-        response = requests.get(settings.AUTH_SERVER_URL + "/api/business/details/", params={"business_id": business_id})
+        response = auth_server_call("GET", "/api/business/details/", params={"business_id": business_id})
         if response.status_code == 200:
             return response.json()
         return None
@@ -63,3 +109,61 @@ def get_business_details_by_id(business_id):
         return None
 
 
+
+
+def _get_many_details(region, key, lookup, ids, max_workers):
+    """
+    {id: lookup(id)} for many ids: cached ones from one cache read, each
+    other distinct id looked up once, with up to `max_workers` requests in
+    flight.
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    if not unique_ids:
+        return {}
+
+    cached = region.get_many(key(item) for item in unique_ids)
+    result = {item: cached.get(key(item)) for item in unique_ids}
+    missing = [item for item, data in result.items() if data is None]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as pool:
+            result.update(zip(missing, pool.map(with_request_stats(lookup), missing)))
+    return result
+
+
+def get_members_details_by_cards(card_numbers, max_workers=8):
+    """
+    Fetch member details for many card numbers at once. Cached members come
+    from one cache read; each other distinct card is looked up once, with up
+    to `max_workers` requests in flight.
+    Returns {card_number: member_data or None}.
+    """
+    return _get_many_details(
+        member_profiles, _member_details_key, get_member_details_by_card, card_numbers, max_workers
+    )
+
+
+def get_businesses_details_by_ids(business_ids, max_workers=8):
+    """
+    get_members_details_by_cards for businesses.
+    Returns {business_id: business_data or None}.
+    """
+    return _get_many_details(
+        business_directory, _business_details_key, get_business_details_by_id, business_ids, max_workers
+    )
+
+
+def verify_sso_token(path, token):
+    """
+    The auth server's user data for a valid token, or None. Valid tokens are
+    cached in the auth_tokens region (keyed by a hash, never the token), so a
+    revoked token keeps working for at most that region's TIMEOUT. Raises
+    requests.RequestException when the auth server is unreachable.
+    """
+    def verify():
+        response = auth_server_call("POST", path, json={"token": token}, timeout=5)
+        if response.status_code != 200:
+            return None
+        return response.json()
+
+    key = f"{path}:{hashlib.sha256(token.encode()).hexdigest()}"
+    return auth_tokens.get_or_compute(key, verify)
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.core import checks
 
 
 class JobcardAdminConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobcard_admin'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from helpers.cache import check_shared_regions
+        checks.register(check_shared_regions, checks.Tags.caches)
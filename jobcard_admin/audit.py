@@ -0,0 +1,85 @@
+import logging
+from asgiref.local import Local
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import StatusChangeEvent
+
+FLUSH_SIZE = getattr(settings, "AUDIT_FLUSH_SIZE", 500)
+# Events kept for retry while the table can't be written; older ones are logged and dropped
+MAX_PENDING = getattr(settings, "AUDIT_MAX_PENDING", FLUSH_SIZE * 10)
+
+logger = logging.getLogger(__name__)
+
+_local = Local()
+
+
+def _pending():
+    if not hasattr(_local, "events"):
+        _local.events = []
+    return _local.events
+
+
+def _buffer(event):
+    events = _pending()
+    events.append(event)
+    # A multiple, not a minimum: events kept after a failed insert must not retry on every append
+    if len(events) % FLUSH_SIZE == 0:
+        flush_events()
+
+
+def record_status_change(entity_type, entity_id, old_status, new_status, actor_id=None,
+                         card_number=None, document_type=""):
+    """
+    Buffer one status change event. Inside a transaction the event is only
+    buffered once it commits, so rolled back changes leave no history.
+    Unchanged statuses are not recorded.
+    """
+    if old_status == new_status:
+        return
+    event = StatusChangeEvent(
+        entity_type=entity_type,
+        entity_id=entity_id,
+        document_type=document_type,
+        card_number=card_number,
+        old_status=old_status,
+        new_status=new_status,
+        actor_id=actor_id,
+        occurred_at=timezone.now(),
+    )
+    transaction.on_commit(lambda: _buffer(event))
+
+
+def flush_events():
+    """
+    Write the buffered events with one bulk insert. Runs when a request
+    finishes and whenever FLUSH_SIZE events are waiting; call it directly
+    from scripts and commands. Returns the number written.
+
+    A failed insert never breaks the caller: the events stay buffered for
+    the next flush, and past MAX_PENDING the oldest are written to the log
+    instead.
+    """
+    events = _pending()
+    if not events:
+        return 0
+    _local.events = []
+    try:
+        with transaction.atomic():
+            StatusChangeEvent.objects.bulk_create(events, batch_size=FLUSH_SIZE)
+    except Exception:
+        logger.exception("Failed to write %d status change event(s); keeping them for the next flush", len(events))
+        _keep(events)
+        return 0
+    return len(events)
+
+
+def _keep(events):
+    events = events + _pending()
+    dropped, _local.events = events[:-MAX_PENDING], events[-MAX_PENDING:]
+    for event in dropped:
+        logger.error(
+            "Dropped status change event: %s %s %s -> %s by %s at %s",
+            event.entity_type, event.entity_id, event.old_status, event.new_status, event.actor_id,
+            event.occurred_at.isoformat(),
+        )
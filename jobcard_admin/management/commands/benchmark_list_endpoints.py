@@ -0,0 +1,104 @@
+import io
+import threading
+import time
+from wsgiref.util import setup_testing_defaults
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+DEFAULT_PATHS = [
+    "/business/employer/job-list/",
+    "/business/institution-jobs/",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Requests per second on list endpoints through the real WSGI handler, first with a new "
+        "database connection per request (CONN_MAX_AGE=0), then with the configured profile."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", action="append", dest="paths", help=f"Repeatable. Default: {', '.join(DEFAULT_PATHS)}")
+        parser.add_argument("--token", help="SSO token, sent as 'Authorization: Token <token>'")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per path and profile")
+        parser.add_argument("--threads", type=int, default=4, help="Concurrent workers, like server threads")
+
+    def _get(self, handler, path, token):
+        path, _, query = path.partition("?")
+        environ = {"REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": query, "wsgi.input": io.BytesIO()}
+        if token:
+            environ["HTTP_AUTHORIZATION"] = f"Token {token}"
+        setup_testing_defaults(environ)
+
+        status = []
+        response = handler(environ, lambda status_line, headers, exc_info=None: status.append(status_line))
+        try:
+            for _ in response:
+                pass
+        finally:
+            # Sends request_finished, which closes or keeps the connection as configured
+            response.close()
+        return int(status[0].split()[0])
+
+    def _run(self, handler, path, token, total, threads):
+        statuses = []
+        lock = threading.Lock()
+
+        def worker(count):
+            try:
+                results = [self._get(handler, path, token) for _ in range(count)]
+                with lock:
+                    statuses.extend(results)
+            finally:
+                connections.close_all()
+
+        shares = [total // threads + (1 if i < total % threads else 0) for i in range(threads)]
+        workers = [threading.Thread(target=worker, args=(share,)) for share in shares if share]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        failed = sum(1 for code in statuses if code >= 400)
+        return len(statuses) / elapsed if elapsed else 0.0, failed
+
+    def handle(self, *args, **options):
+        handler = WSGIHandler()
+        paths = options["paths"] or DEFAULT_PATHS
+        total, threads = max(options["requests"], 1), max(options["threads"], 1)
+
+        settings_dict = connections.settings["default"]
+        configured_max_age = settings_dict["CONN_MAX_AGE"]
+        if settings_dict.get("OPTIONS", {}).get("pool"):
+            self.stdout.write(self.style.WARNING("Connection pool enabled: both runs reuse pooled connections."))
+
+        profiles = [("per-request", 0), ("configured", configured_max_age)]
+        self.stdout.write(
+            f"{total} requests per run, {threads} thread(s). Configured CONN_MAX_AGE={configured_max_age}, "
+            f"CONN_HEALTH_CHECKS={settings_dict.get('CONN_HEALTH_CHECKS')}, "
+            f"DISABLE_SERVER_SIDE_CURSORS={settings_dict.get('DISABLE_SERVER_SIDE_CURSORS', False)}"
+        )
+
+        try:
+            for path in paths:
+                results = {}
+                for name, max_age in profiles:
+                    settings_dict["CONN_MAX_AGE"] = max_age
+                    self._get(handler, path, options["token"])  # warm up caches and imports
+                    connections.close_all()
+                    results[name] = self._run(handler, path, options["token"], total, threads)
+
+                baseline, _ = results["per-request"]
+                configured, _ = results["configured"]
+                change = (configured - baseline) / baseline * 100 if baseline else 0.0
+                self.stdout.write(
+                    f"{path}: {baseline:.1f} req/s per-request, {configured:.1f} req/s configured ({change:+.1f}%)"
+                )
+                failed = sum(failed for _, failed in results.values())
+                if failed:
+                    self.stdout.write(self.style.WARNING(f"  {failed} response(s) were 4xx/5xx; check --token and --path."))
+        finally:
+            settings_dict["CONN_MAX_AGE"] = configured_max_age
@@ -0,0 +1,27 @@
+import time
+from django.core.management.base import BaseCommand
+from jobcard_admin.outbox import build_session, claim_batch, send_batch
+
+
+class Command(BaseCommand):
+    help = "Send queued emails from the EmailOutbox table. Several workers can run side by side."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--concurrency", type=int, default=4, help="Maximum requests in flight to the SES API.")
+        parser.add_argument("--max-attempts", type=int, default=6)
+        parser.add_argument("--poll-interval", type=float, default=5, help="Seconds to sleep when the outbox is empty.")
+        parser.add_argument("--once", action="store_true", help="Process one batch and exit.")
+
+    def handle(self, *args, **options):
+        session = build_session(options["concurrency"])
+
+        while True:
+            messages = claim_batch(options["batch_size"])
+            if messages:
+                sent, failed = send_batch(messages, session, options["concurrency"], options["max_attempts"])
+                self.stdout.write(f"Sent {sent}, failed {failed} of {len(messages)} email(s).")
+            if options["once"]:
+                break
+            if not messages:
+                time.sleep(options["poll_interval"])
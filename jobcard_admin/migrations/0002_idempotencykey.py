@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:10
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_admin', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(help_text='Endpoint and caller the key belongs to', max_length=255)),
+                ('key', models.CharField(max_length=255)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('response_body', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('scope', 'key'), name='unique_idempotency_key_per_scope')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:25
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_admin', '0002_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusChangeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity_type', models.CharField(choices=[('job_application', 'Job application'), ('document', 'Document')], max_length=32)),
+                ('entity_id', models.BigIntegerField(help_text='JobApplication id, or DocumentVerificationRequest id for documents')),
+                ('document_type', models.CharField(blank=True, default='', max_length=50)),
+                ('card_number', models.BigIntegerField(blank=True, null=True, verbose_name='Member Card Number')),
+                ('old_status', models.CharField(blank=True, max_length=20, null=True)),
+                ('new_status', models.CharField(max_length=20)),
+                ('actor_id', models.BigIntegerField(blank=True, help_text='Staff user who made the change', null=True)),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['entity_type', 'entity_id', 'occurred_at'], name='jobcard_adm_entity__726177_idx'), models.Index(fields=['occurred_at'], name='jobcard_adm_occurre_f943c5_idx'), models.Index(fields=['entity_type', 'new_status', 'occurred_at'], name='jobcard_adm_entity__a173cc_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_admin', '0003_statuschangeevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencykey',
+            name='request_hash',
+            field=models.CharField(blank=True, help_text='SHA-256 of the request body', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='idempotencykey',
+            name='scope',
+            field=models.CharField(help_text='Endpoint and authenticated caller the key belongs to', max_length=255),
+        ),
+    ]
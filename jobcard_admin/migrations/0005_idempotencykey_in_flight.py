@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_admin', '0004_idempotencykey_request_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='idempotencykey',
+            name='status_code',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Empty while the first request runs', null=True),
+        ),
+    ]
@@ -1,3 +1,94 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class EmailOutbox(models.Model):
+    """
+    Emails waiting to be sent. Request handlers only insert rows here; the
+    `send_outbox_emails` worker renders and delivers them.
+    """
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("sending", "Sending"),
+        ("sent", "Sent"),
+        ("failed", "Failed"),
+    ]
+
+    recipient = models.EmailField(max_length=254)
+    subject = models.CharField(max_length=255)
+    template_name = models.CharField(max_length=255)
+    context = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    attachments = models.JSONField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipient} ({self.status})"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Response stored for a client supplied `Idempotency-Key`, so a retried
+    request gets the original response back instead of running again.
+    """
+    scope = models.CharField(max_length=255, help_text="Endpoint and authenticated caller the key belongs to")
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64, blank=True, help_text="SHA-256 of the request body")
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True, help_text="Empty while the first request runs")
+    response_body = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "key"], name="unique_idempotency_key_per_scope"),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.key} ({self.status_code})"
+
+
+class StatusChangeEvent(models.Model):
+    """
+    Append-only history of application and document status changes, for
+    timelines and funnel timing. Rows are only inserted, in bulk, by
+    `jobcard_admin.audit`; they are never updated.
+    """
+    ENTITY_CHOICES = [
+        ("job_application", "Job application"),
+        ("document", "Document"),
+    ]
+
+    entity_type = models.CharField(max_length=32, choices=ENTITY_CHOICES)
+    entity_id = models.BigIntegerField(help_text="JobApplication id, or DocumentVerificationRequest id for documents")
+    document_type = models.CharField(max_length=50, blank=True, default="")
+    card_number = models.BigIntegerField(null=True, blank=True, verbose_name="Member Card Number")
+    old_status = models.CharField(max_length=20, null=True, blank=True)
+    new_status = models.CharField(max_length=20)
+    actor_id = models.BigIntegerField(null=True, blank=True, help_text="Staff user who made the change")
+    occurred_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["entity_type", "entity_id", "occurred_at"]),
+            models.Index(fields=["occurred_at"]),
+            models.Index(fields=["entity_type", "new_status", "occurred_at"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Status change events are append-only.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.entity_type} {self.entity_id}: {self.old_status} -> {self.new_status}"
@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import requests
+from requests.adapters import HTTPAdapter
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from helpers.email import deliver_email
+from .models import EmailOutbox
+
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 60 * 60
+
+
+def build_session(concurrency):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Content-Type"] = "application/json"
+    return session
+
+
+def claim_batch(batch_size, stale_after=timedelta(minutes=10)):
+    """
+    Lock up to `batch_size` due messages with SKIP LOCKED so parallel workers
+    never pick the same rows, and mark them as sending. Messages left in
+    'sending' by a crashed worker become claimable again after `stale_after`.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status="pending", next_attempt_at__lte=now)
+                | Q(status="sending", claimed_at__lt=now - stale_after)
+            )
+            .order_by("next_attempt_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        EmailOutbox.objects.filter(id__in=ids).update(
+            status="sending", claimed_at=now, attempts=F("attempts") + 1
+        )
+    return list(EmailOutbox.objects.filter(id__in=ids))
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+def send_batch(messages, session, concurrency, max_attempts):
+    """
+    Deliver claimed messages with at most `concurrency` requests in flight,
+    then record each outcome. Returns (sent, failed) counts.
+    """
+    def attempt(message):
+        try:
+            deliver_email(message, session)
+            return message, None
+        except Exception as e:
+            return message, str(e)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(attempt, messages))
+
+    sent = failed = 0
+    now = timezone.now()
+    for message, error in outcomes:
+        if error is None:
+            sent += 1
+            EmailOutbox.objects.filter(pk=message.pk).update(status="sent", sent_at=now, last_error=None)
+        elif message.attempts >= max_attempts:
+            failed += 1
+            EmailOutbox.objects.filter(pk=message.pk).update(status="failed", last_error=error)
+        else:
+            failed += 1
+            EmailOutbox.objects.filter(pk=message.pk).update(
+                status="pending", last_error=error, next_attempt_at=now + _retry_delay(message.attempts)
+            )
+    return sent, failed
@@ -0,0 +1,8 @@
+from django.core.signals import request_finished
+from django.dispatch import receiver
+from .audit import flush_events
+
+
+@receiver(request_finished)
+def request_done(sender, **kwargs):
+    flush_events()
@@ -1,3 +1,329 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import timedelta
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.db import DatabaseError, connections, router, transaction
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from helpers.cache import CacheRegion, cache_metrics, check_shared_regions, replica_sticky, reset_cache_metrics
+from helpers.cache_config import build_caches
+from helpers.metrics import metrics_view
+from jobcard_admin import audit
+from jobcard_admin.models import EmailOutbox, StatusChangeEvent
+from jobcard_admin.outbox import claim_batch, send_batch
+from jobcard_business.models import Job
+from jsj_jobcard.db_router import (
+    PRIMARY_ALIAS, REPLICA_ALIAS, PrimaryReplicaRouter, ReplicaRoutingMiddleware, use_replica,
+)
 
-# Create your tests here.
+
+class ReplicaReadView(APIView):
+    authentication_classes = []
+    permission_classes = []
+    read_from_replica = True
+
+    def get(self, request):
+        reads_before = router.db_for_read(Job)
+        if request.GET.get("write"):
+            router.db_for_write(Job)
+        return Response({"read": reads_before, "read_after_write": router.db_for_read(Job)})
+
+    def post(self, request):
+        return self.get(request)
+
+
+class PrimaryOnlyView(ReplicaReadView):
+    read_from_replica = False
+
+
+def call_through_middleware(view_class, method="get", path="/jobs/", token="Token a"):
+    view = view_class.as_view()
+    request = getattr(RequestFactory(), method)(path, HTTP_AUTHORIZATION=token)
+
+    def get_response(request):
+        middleware.process_view(request, view, (), {})
+        return view(request)
+
+    middleware = ReplicaRoutingMiddleware(get_response)
+    return middleware(request).data
+
+
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    router = PrimaryReplicaRouter()
+
+    def test_without_replica_the_router_does_nothing(self):
+        with mock.patch("jsj_jobcard.db_router.replica_available", return_value=False), use_replica():
+            self.assertIsNone(self.router.db_for_read(Job))
+            self.assertIsNone(self.router.db_for_write(Job))
+
+    @mock.patch("jsj_jobcard.db_router.replica_available", return_value=True)
+    def test_reads_use_the_replica_only_when_asked(self, _):
+        self.assertEqual(self.router.db_for_read(Job), PRIMARY_ALIAS)
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Job), REPLICA_ALIAS)
+            self.assertEqual(self.router.db_for_write(Job), PRIMARY_ALIAS)
+            # Read your own writes for the rest of the block
+            self.assertEqual(self.router.db_for_read(Job), PRIMARY_ALIAS)
+        self.assertEqual(self.router.db_for_read(Job), PRIMARY_ALIAS)
+
+    @mock.patch("jsj_jobcard.db_router.replica_available", return_value=True)
+    def test_the_replica_is_never_migrated(self, _):
+        self.assertFalse(self.router.allow_migrate(REPLICA_ALIAS, "jobcard_business"))
+        self.assertIsNone(self.router.allow_migrate(PRIMARY_ALIAS, "jobcard_business"))
+
+
+@mock.patch("jsj_jobcard.db_router.replica_available", return_value=True)
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        replica_sticky.backend.clear()
+
+    def test_safe_requests_to_opted_in_views_read_from_the_replica(self, _):
+        self.assertEqual(call_through_middleware(ReplicaReadView)["read"], REPLICA_ALIAS)
+        self.assertEqual(call_through_middleware(PrimaryOnlyView)["read"], PRIMARY_ALIAS)
+        self.assertEqual(call_through_middleware(ReplicaReadView, method="post")["read"], PRIMARY_ALIAS)
+
+    def test_a_write_pins_the_request_and_then_the_client_to_the_primary(self, _):
+        data = call_through_middleware(ReplicaReadView, path="/jobs/?write=1")
+        self.assertEqual(data, {"read": REPLICA_ALIAS, "read_after_write": PRIMARY_ALIAS})
+
+        self.assertEqual(call_through_middleware(ReplicaReadView)["read"], PRIMARY_ALIAS)
+        self.assertEqual(call_through_middleware(ReplicaReadView, token="Token b")["read"], REPLICA_ALIAS)
+
+    def test_routing_state_does_not_leak_past_the_request(self, _):
+        call_through_middleware(ReplicaReadView)
+        self.assertEqual(router.db_for_read(Job), PRIMARY_ALIAS)
+
+
+@skipUnless(REPLICA_ALIAS in settings.DATABASES, "needs a 'replica' database alias")
+class ReplicaQueryTests(TestCase):
+    databases = "__all__"
+
+    def test_queries_run_on_the_replica_connection(self):
+        with CaptureQueriesContext(connections[REPLICA_ALIAS]) as replica_queries, use_replica():
+            list(Job.objects.all())
+        self.assertEqual(len(replica_queries), 1)
+
+
+class SharedCacheRegionCheckTests(SimpleTestCase):
+    REGIONS = {"profiles": {}, "lists": {"SHARED": True}}
+
+    def check(self, backend, required=True):
+        with override_settings(CACHE_REGIONS=self.REGIONS, CACHES=build_caches(self.REGIONS, backend),
+                               CACHE_REQUIRE_SHARED_BACKEND=required):
+            return [(message.id, message.msg) for message in check_shared_regions()]
+
+    def test_shared_regions_need_a_shared_backend(self):
+        self.assertEqual(self.check("locmem"), [
+            ("helpers.E001", "Cache region 'lists' must be shared between processes but uses helpers.cache.LocMemRegionCache."),
+        ])
+        self.assertEqual([check_id for check_id, _ in self.check("file", required=False)], ["helpers.W001"])
+        self.assertEqual(self.check("db"), [])
+        self.assertEqual(self.check("redis"), [])
+
+
+class MetricsAccessTests(SimpleTestCase):
+
+    def get(self, remote_addr="127.0.0.1", **headers):
+        return metrics_view(RequestFactory().get("/metrics", REMOTE_ADDR=remote_addr, **headers)).status_code
+
+    @override_settings(METRICS_TOKEN="secret", METRICS_ALLOWED_IPS=[], METRICS_NUM_PROXIES=0)
+    def test_token_required_by_default(self):
+        self.assertEqual(self.get(), 403)
+        self.assertEqual(self.get(HTTP_AUTHORIZATION="Bearer wrong"), 403)
+        self.assertEqual(self.get(HTTP_AUTHORIZATION="Bearer secret"), 200)
+        self.assertEqual(self.get(HTTP_AUTHORIZATION="Bearer s\u00e9cret"), 403)
+
+    @override_settings(METRICS_TOKEN=None, METRICS_ALLOWED_IPS=[], METRICS_NUM_PROXIES=0)
+    def test_closed_without_a_token(self):
+        self.assertEqual(self.get(HTTP_AUTHORIZATION="Bearer "), 403)
+
+    @override_settings(METRICS_TOKEN=None, METRICS_ALLOWED_IPS=["10.0.0.5"], METRICS_NUM_PROXIES=0)
+    def test_forwarded_requests_are_not_matched_by_address(self):
+        self.assertEqual(self.get("10.0.0.5"), 200)
+        self.assertEqual(self.get("10.0.0.5", HTTP_X_FORWARDED_FOR="203.0.113.9"), 403)
+
+    @override_settings(METRICS_TOKEN=None, METRICS_ALLOWED_IPS=["10.0.0.5"], METRICS_NUM_PROXIES=1)
+    def test_allowed_ips_behind_a_trusted_proxy(self):
+        self.assertEqual(self.get(HTTP_X_FORWARDED_FOR="10.0.0.5"), 200)
+        self.assertEqual(self.get(HTTP_X_FORWARDED_FOR="10.0.0.5, 203.0.113.9"), 403)
+        self.assertEqual(self.get("10.0.0.5"), 403)
+
+
+class StatusChangeAuditTests(TestCase):
+
+    def setUp(self):
+        audit._local.events = []
+
+    def record(self, entity_id, new_status="shortlisted"):
+        audit.record_status_change("job_application", entity_id, "applied", new_status, actor_id=4)
+
+    def test_events_are_buffered_until_commit_and_flushed_in_one_insert(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.record(1)
+            self.record(2)
+            self.record(3, new_status="applied")  # unchanged, not recorded
+            self.assertEqual(audit._pending(), [])
+        self.assertEqual(len(audit._pending()), 2)
+        self.assertFalse(StatusChangeEvent.objects.exists())
+
+        with self.assertNumQueries(3):  # savepoint, insert, release
+            self.assertEqual(audit.flush_events(), 2)
+        self.assertEqual(sorted(StatusChangeEvent.objects.values_list("entity_id", flat=True)), [1, 2])
+
+    def test_a_full_buffer_flushes_itself(self):
+        with mock.patch.object(audit, "FLUSH_SIZE", 2), self.captureOnCommitCallbacks(execute=True):
+            self.record(1)
+            self.record(2)
+            self.record(3)
+        self.assertEqual(StatusChangeEvent.objects.count(), 2)
+        self.assertEqual(len(audit._pending()), 1)
+
+    def test_rolled_back_changes_leave_no_history(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.record(1)
+                    raise DatabaseError()
+            except DatabaseError:
+                pass
+            self.record(2)
+        audit.flush_events()
+        self.assertEqual(list(StatusChangeEvent.objects.values_list("entity_id", flat=True)), [2])
+
+    def test_a_failed_insert_keeps_the_events_for_the_next_flush(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.record(1)
+            self.record(2)
+
+        with mock.patch.object(StatusChangeEvent.objects, "bulk_create", side_effect=DatabaseError("down")), \
+                self.assertLogs("jobcard_admin.audit", "ERROR"):
+            self.assertEqual(audit.flush_events(), 0)
+        self.assertEqual(len(audit._pending()), 2)
+
+        self.assertEqual(audit.flush_events(), 2)
+        self.assertEqual(StatusChangeEvent.objects.count(), 2)
+
+    def test_events_past_the_retry_limit_are_logged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for entity_id in range(3):
+                self.record(entity_id)
+
+        with mock.patch.object(audit, "MAX_PENDING", 2), \
+                mock.patch.object(StatusChangeEvent.objects, "bulk_create", side_effect=DatabaseError("down")), \
+                self.assertLogs("jobcard_admin.audit", "ERROR") as logs:
+            audit.flush_events()
+        self.assertEqual([event.entity_id for event in audit._pending()], [1, 2])
+        self.assertIn("Dropped status change event: job_application 0 applied -> shortlisted", "\n".join(logs.output))
+
+
+class EmailOutboxTests(TestCase):
+
+    def setUp(self):
+        self.message = EmailOutbox.objects.create(
+            recipient="member@example.com", subject="Status", template_name="email_template/job_status.html",
+        )
+
+    def send(self, error=None, max_attempts=3):
+        messages = claim_batch(10)
+        with mock.patch("jobcard_admin.outbox.deliver_email", side_effect=error):
+            result = send_batch(messages, session=None, concurrency=2, max_attempts=max_attempts)
+        self.message.refresh_from_db()
+        return result
+
+    def test_claimed_rows_are_leased(self):
+        self.assertEqual([message.pk for message in claim_batch(10)], [self.message.pk])
+        self.assertEqual(claim_batch(10), [])
+
+        # The worker holding the lease died; the row is claimable once the lease is stale
+        EmailOutbox.objects.update(claimed_at=timezone.now() - timedelta(minutes=11))
+        self.assertEqual([message.attempts for message in claim_batch(10)], [2])
+
+    def test_failures_are_retried_with_backoff(self):
+        self.assertEqual(self.send(error=Exception("SES down")), (0, 1))
+        self.assertEqual((self.message.status, self.message.attempts), ("pending", 1))
+        self.assertEqual(self.message.last_error, "SES down")
+        first_retry = self.message.next_attempt_at
+        self.assertGreater(first_retry, timezone.now() + timedelta(seconds=25))
+
+        # Not due yet
+        self.assertEqual(claim_batch(10), [])
+
+        EmailOutbox.objects.update(next_attempt_at=timezone.now())
+        before = timezone.now()
+        self.send(error=Exception("SES down"))
+        self.assertEqual(self.message.attempts, 2)
+        self.assertGreaterEqual(self.message.next_attempt_at - before, timedelta(seconds=60))
+
+    def test_last_attempt_fails_the_message(self):
+        EmailOutbox.objects.update(attempts=2)
+        self.assertEqual(self.send(error=Exception("rejected"), max_attempts=3), (0, 1))
+        self.assertEqual((self.message.status, self.message.attempts), ("failed", 3))
+        self.assertEqual(claim_batch(10), [])
+
+    def test_sent(self):
+        self.assertEqual(self.send(), (1, 0))
+        self.assertEqual(self.message.status, "sent")
+        self.assertIsNotNone(self.message.sent_at)
+
+
+STAMPEDE_REGIONS = {"reports": {"TIMEOUT": 60, "MAX_ENTRIES": 6}}
+
+
+@override_settings(CACHE_REGIONS=STAMPEDE_REGIONS, CACHES=build_caches(STAMPEDE_REGIONS, "locmem"))
+class CacheRegionTests(SimpleTestCase):
+
+    def setUp(self):
+        self.region = CacheRegion("reports")
+        self.region.backend.clear()
+        reset_cache_metrics()
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)  # Long enough for every other caller to miss and wait
+            return {"total": 42}
+
+        callers = 8
+        barrier = threading.Barrier(callers)
+        results = []
+
+        def call():
+            barrier.wait()
+            results.append(self.region.get_or_compute("summary", compute))
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"total": 42}] * callers)
+        metrics = cache_metrics()["reports"]
+        self.assertEqual((metrics["misses"], metrics["computes"], metrics["sets"]), (callers, 1, 1))
+        # Threads share the in-process call instead of polling the cross-process lock
+        self.assertEqual(metrics["waits"], 0)
+
+        self.assertEqual(self.region.get_or_compute("summary", compute), {"total": 42})
+        self.assertEqual(cache_metrics()["reports"]["hits"], 1)
+
+    def test_none_is_not_cached(self):
+        compute = mock.Mock(return_value=None)
+        self.region.get_or_compute("empty", compute)
+        self.region.get_or_compute("empty", compute)
+        self.assertEqual(compute.call_count, 2)
+
+    def test_evictions_are_counted(self):
+        for n in range(10):
+            self.region.set(f"key-{n}", n)
+        metrics = cache_metrics()["reports"]
+        self.assertEqual(metrics["sets"], 10)
+        self.assertGreater(metrics["evictions"], 0)
+        self.assertEqual(len(self.region.get_many(f"key-{n}" for n in range(10))), 10 - metrics["evictions"])
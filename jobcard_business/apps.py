@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class JobcardBusinessConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobcard_business'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,55 @@
+from django.db.models import Count, Q
+from helpers.cache import dashboards
+from .models import Job
+
+APPLICATION_STATUSES = ["applied", "under_review", "shortlisted", "rejected", "selected"]
+
+
+def dashboard_cache_key(business_id):
+    return f"employer_dashboard:{business_id}"
+
+
+def invalidate_employer_dashboard(business_id):
+    if business_id:
+        dashboards.delete(dashboard_cache_key(business_id))
+
+
+def build_employer_dashboard(business_id):
+    """
+    Dashboard stats for one business from a single grouped query:
+    every job with its application count per status.
+    """
+    status_counts = {
+        status: Count("applications", filter=Q(applications__status=status))
+        for status in APPLICATION_STATUSES
+    }
+    jobs = list(
+        Job.objects.filter(business_id=business_id)
+        .annotate(total_applications=Count("applications"), **status_counts)
+        .values("id", "title", "is_active", "total_applications", *APPLICATION_STATUSES)
+        .order_by("-created_at")
+    )
+
+    totals = {status: sum(job[status] for job in jobs) for status in APPLICATION_STATUSES}
+    return {
+        "total_jobs": len(jobs),
+        "total_applications": sum(job["total_applications"] for job in jobs),
+        "total_placed_students": totals["selected"],
+        "status_counts": totals,
+        "jobs": [
+            {
+                "job_id": job["id"],
+                "title": job["title"],
+                "is_active": job["is_active"],
+                "total_applications": job["total_applications"],
+                "status_counts": {status: job[status] for status in APPLICATION_STATUSES},
+            }
+            for job in jobs
+        ],
+    }
+
+
+def get_employer_dashboard(business_id):
+    return dashboards.get_or_compute(
+        dashboard_cache_key(business_id), lambda: build_employer_dashboard(business_id)
+    )
@@ -0,0 +1,117 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Feedback, FeedbackRatingRollup
+
+# NPS-style buckets on the 1-10 happiness scale
+PROMOTER_MIN_RATING = 9
+PASSIVE_MIN_RATING = 7
+
+# Feedback fields that decide its bucket and counts
+ROLLUP_FIELDS = ("business_id", "happiness_rating", "has_issues", "created_at")
+
+
+def _bucket_for(feedback):
+    created_at = timezone.localtime(feedback.created_at) if feedback.created_at else timezone.localtime()
+    return {
+        "business_id": feedback.business_id,
+        "month": created_at.date().replace(day=1),
+        "rating": feedback.happiness_rating,
+    }
+
+
+def record_feedback(feedback, sign=1):
+    """
+    Add (or with sign=-1 remove) one feedback to its business/month/rating bucket.
+    """
+    if feedback.business_id is None:
+        return
+
+    bucket = _bucket_for(feedback)
+    if sign > 0:
+        FeedbackRatingRollup.objects.get_or_create(**bucket)
+
+    FeedbackRatingRollup.objects.filter(**bucket).update(
+        responses=F("responses") + sign,
+        with_issues=F("with_issues") + (sign if feedback.has_issues else 0),
+    )
+
+
+def stored_feedback(feedback):
+    """
+    The saved copy of `feedback` with only its ROLLUP_FIELDS, or None when
+    it is not saved yet. Read before a save to know what it counted as.
+    """
+    if feedback._state.adding or feedback.pk is None:
+        return None
+    values = Feedback.objects.filter(pk=feedback.pk).values(*ROLLUP_FIELDS).first()
+    return Feedback(**values) if values else None
+
+
+def move_feedback(old, feedback):
+    """
+    Move an edited feedback from the bucket it counted in as `old` to the
+    one it counts in now, in one transaction.
+    """
+    if all(getattr(old, field) == getattr(feedback, field) for field in ROLLUP_FIELDS):
+        return
+    with transaction.atomic():
+        record_feedback(old, sign=-1)
+        record_feedback(feedback)
+
+
+def _rate(part, whole):
+    return round(part / whole, 4) if whole else None
+
+
+def feedback_summary(business_id=None):
+    """
+    Satisfaction stats summed from the rollup buckets of one business, or of
+    every business when business_id is None.
+    """
+    buckets = FeedbackRatingRollup.objects.filter(responses__gt=0)
+    if business_id is not None:
+        buckets = buckets.filter(business_id=business_id)
+
+    distribution = {rating: 0 for rating in range(1, 11)}
+    months = {}
+    total = rating_sum = with_issues = 0
+
+    for bucket in buckets.values("month", "rating", "responses", "with_issues").order_by("month"):
+        responses = bucket["responses"]
+        total += responses
+        rating_sum += bucket["rating"] * responses
+        with_issues += bucket["with_issues"]
+        distribution[bucket["rating"]] += responses
+
+        month = months.setdefault(bucket["month"], {"responses": 0, "rating_sum": 0, "with_issues": 0})
+        month["responses"] += responses
+        month["rating_sum"] += bucket["rating"] * responses
+        month["with_issues"] += bucket["with_issues"]
+
+    promoters = sum(count for rating, count in distribution.items() if rating >= PROMOTER_MIN_RATING)
+    passives = sum(count for rating, count in distribution.items() if PASSIVE_MIN_RATING <= rating < PROMOTER_MIN_RATING)
+    detractors = total - promoters - passives
+
+    return {
+        "business_id": business_id,
+        "total_responses": total,
+        "average_rating": round(rating_sum / total, 2) if total else None,
+        "distribution": distribution,
+        "nps": {
+            "promoters": promoters,
+            "passives": passives,
+            "detractors": detractors,
+            "score": round((promoters - detractors) * 100 / total, 1) if total else None,
+        },
+        "issues_share": _rate(with_issues, total),
+        "trend": [
+            {
+                "month": month.strftime("%Y-%m"),
+                "responses": stats["responses"],
+                "average_rating": round(stats["rating_sum"] / stats["responses"], 2),
+                "issues_share": _rate(stats["with_issues"], stats["responses"]),
+            }
+            for month, stats in months.items()
+        ],
+    }
@@ -9,9 +9,10 @@ from django.utils.timezone import now
 from jobcard_business.authentication import SSOBusinessTokenAuthentication
 from jobcard_staff.serializers import JobpostSerializer
 from jobcard_business import models
-from jobcard_member.serializers import JobApplicationListSerializer
+from jobcard_business.job_lists import institute_job_list_page
+from jobcard_member.serializers import ApplicantListSerializer, DOCUMENT_FILTER_PARAMETERS
+from jobcard_member.completeness import InvalidDocumentFilter, filter_by_documents
 from helpers.utils import get_member_details_by_card
-from helpers.pagination import paginate
 
 
 class JobListInstituteAPI(APIView):
@@ -20,6 +21,7 @@ class JobListInstituteAPI(APIView):
     """
     authentication_classes = [SSOBusinessTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
         operation_description="Retrieve a paginated list of all job postings for institutes.",
@@ -28,25 +30,13 @@ class JobListInstituteAPI(APIView):
     )
     def get(self, request):
         try:
-            jobs = models.Job.objects.all().order_by("-id")
-            total_jobs = jobs.count()
-
-            # Pagination
-            page, pagination_meta = paginate(
-                request,
-                jobs,
-                data_per_page=int(request.GET.get("page_size", 20))
-            )
-
-            serializer = JobpostSerializer(page, many=True)
+            job_list = institute_job_list_page(request, int(request.GET.get("page_size", 20)))
 
             return Response({
                 "status": 200,
                 "success": True,
                 "message": "Job list retrieved successfully.",
-                "total_jobs": total_jobs,
-                "data": serializer.data,
-                "pagination_meta_data": pagination_meta
+                **job_list,
             }, status=status.HTTP_200_OK)
         except Exception as e:
             return Response(
@@ -62,10 +52,12 @@ class JobApplicationListInstituteAPIView(APIView):
     """
     authentication_classes = [SSOBusinessTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
-        operation_description="List all job applications received for this business, including job details.",
-        responses={200: JobApplicationListSerializer(many=True)},
+        operation_description="List all job applications received for this business, including job details, optionally filtered by the applicants' documents.",
+        manual_parameters=DOCUMENT_FILTER_PARAMETERS,
+        responses={200: ApplicantListSerializer(many=True)},
         tags=["Institute"]
     )
     def get(self, request, job_id):
@@ -78,8 +70,15 @@ class JobApplicationListInstituteAPIView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
 
             # Fetch applications
-            applications = models.JobApplication.objects.filter(job_id=job_id, institute_id=business_id)
-            application_serializer = JobApplicationListSerializer(applications, many=True)
+            try:
+                applications = filter_by_documents(
+                    models.JobApplication.objects.filter(job_id=job_id, institute_id=business_id).select_related("job"),
+                    request.query_params,
+                )
+            except InvalidDocumentFilter as e:
+                return Response({"success": False, "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            application_serializer = ApplicantListSerializer(applications, many=True)
 
             # ✅ Fetch job details (ignore business filter)
             try:
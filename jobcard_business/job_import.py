@@ -0,0 +1,187 @@
+import csv
+import io
+import json
+from django.core.exceptions import ValidationError
+from django.db import models as django_models, transaction
+from .dashboard import invalidate_employer_dashboard
+from .job_lists import invalidate_job_lists
+from .models import Job
+
+CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+FORMATS = ("csv", "jsonl")
+
+# Never taken from the file
+EXCLUDED_FIELDS = {"id", "created_at"}
+
+# JSON list columns whose entries must come from one of the Job choice lists
+LIST_FIELD_CHOICES = {
+    "job_type": Job.JOB_TYPE_CHOICES,
+    "schedule": Job.SCHEDULE_CHOICES,
+    "education_levels": Job.EDUCATION_LEVEL_CHOICES,
+}
+
+IMPORT_FIELDS = [field for field in Job._meta.concrete_fields if field.name not in EXCLUDED_FIELDS]
+
+TRUE_VALUES = {"1", "true", "t", "yes", "y"}
+FALSE_VALUES = {"0", "false", "f", "no", "n"}
+
+
+class JobImportError(Exception):
+    pass
+
+
+def detect_format(filename, requested=None):
+    fmt = (requested or "").lower() or ("jsonl" if filename.lower().endswith((".jsonl", ".json")) else "csv")
+    if fmt not in FORMATS:
+        raise JobImportError(f"format must be one of: {', '.join(FORMATS)}.")
+    return fmt
+
+
+def iter_rows(text_stream, fmt):
+    """
+    Yield (row_number, row) one row at a time; row is None when the line
+    could not be parsed.
+    """
+    if fmt == "csv":
+        for row_number, row in enumerate(csv.DictReader(text_stream), start=1):
+            yield row_number, row
+        return
+
+    for row_number, line in enumerate(text_stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            row = None
+        yield row_number, row if isinstance(row, dict) else None
+
+
+def _parse_list(value):
+    """
+    A list of strings from a list, a JSON list or '|' separated text.
+    Raises ValueError for anything else (JSON objects, numbers, nested values).
+    """
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith(("[", "{")):
+            value = json.loads(value)
+        else:
+            return [part.strip() for part in value.split("|") if part.strip()]
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError("Not a list of strings.")
+    return value
+
+
+def _coerce(field, value):
+    if isinstance(value, str):
+        value = value.strip()
+
+    if value in ("", None):
+        if field.has_default():
+            return field.get_default()
+        if field.null:
+            return None
+        if field.blank:
+            return ""
+        raise ValidationError("This field is required.")
+
+    if isinstance(field, django_models.JSONField):
+        try:
+            value = _parse_list(value)
+        except ValueError:
+            raise ValidationError("Enter a JSON list of strings or '|' separated values.")
+        allowed = LIST_FIELD_CHOICES.get(field.name)
+        if allowed:
+            invalid = [item for item in value if item not in dict(allowed)]
+            if invalid:
+                raise ValidationError(f"Invalid choice(s): {', '.join(map(str, invalid))}.")
+        return value
+
+    if isinstance(field, django_models.BooleanField) and isinstance(value, str):
+        if value.lower() in TRUE_VALUES:
+            return True
+        if value.lower() in FALSE_VALUES:
+            return False
+
+    return field.clean(value, None)
+
+
+def validate_row(row, business_id=None):
+    """
+    Validate one raw row against the Job model fields (types, lengths and
+    choices). Returns (Job, None) or (None, {field: [messages]}).
+    """
+    if row is None:
+        return None, {"row": ["Could not parse this line."]}
+
+    values, errors = {}, {}
+    for field in IMPORT_FIELDS:
+        try:
+            values[field.name] = _coerce(field, row.get(field.name))
+        except ValidationError as e:
+            errors[field.name] = e.messages
+
+    if business_id is not None:
+        values["business_id"] = business_id
+        errors.pop("business_id", None)
+
+    if errors:
+        return None, errors
+    return Job(**values), None
+
+
+def import_jobs(text_stream, fmt, business_id=None, dry_run=False):
+    """
+    Stream rows from `text_stream`, validate each one and insert the valid
+    ones with bulk_create in chunks, all inside one transaction. Only one
+    chunk of jobs is held in memory at a time.
+    """
+    summary = {"rows": 0, "created": 0, "failed": 0, "errors": []}
+    chunk = []
+    business_ids = set()
+
+    def flush():
+        if chunk:
+            Job.objects.bulk_create(chunk)
+            summary["created"] += len(chunk)
+            business_ids.update(job.business_id for job in chunk)
+            chunk.clear()
+
+    with transaction.atomic():
+        for row_number, row in iter_rows(text_stream, fmt):
+            summary["rows"] += 1
+            job, errors = validate_row(row, business_id)
+            if errors:
+                summary["failed"] += 1
+                if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+                    summary["errors"].append({"row": row_number, "errors": errors})
+                continue
+
+            chunk.append(job)
+            if len(chunk) >= CHUNK_SIZE:
+                flush()
+        flush()
+
+        if dry_run:
+            transaction.set_rollback(True)
+
+    # bulk_create skips the post_save signals that normally do this
+    if not dry_run:
+        for imported_business_id in business_ids:
+            invalidate_employer_dashboard(imported_business_id)
+        if summary["created"]:
+            invalidate_job_lists()
+
+    summary["dry_run"] = dry_run
+    return summary
+
+
+def import_jobs_from_upload(upload, fmt=None, business_id=None, dry_run=False):
+    fmt = detect_format(upload.name, fmt)
+    text_stream = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_jobs(text_stream, fmt, business_id=business_id, dry_run=dry_run)
+    finally:
+        text_stream.detach()
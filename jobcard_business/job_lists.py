@@ -0,0 +1,56 @@
+from django.utils import timezone
+from helpers.cache import job_lists
+from helpers.pagination import paginate
+from jobcard_staff.serializers import JobpostSerializer
+from .dashboard import invalidate_employer_dashboard
+from .models import Job
+
+JOB_LISTS_NAMESPACE = "jobs"
+
+
+def invalidate_job_lists():
+    """
+    Drop every cached job list page at once; call whenever a job changes.
+    """
+    job_lists.bump_version(JOB_LISTS_NAMESPACE)
+
+
+def deactivate_expired_jobs():
+    """
+    Job.check_and_deactivate for every active job at once: one query when
+    nothing has expired (so list views stay read-only and on the replica),
+    plus one UPDATE when something has. Returns the number deactivated.
+    """
+    expired = Job.objects.filter(is_active=True, application_end_date__lt=timezone.now().date())
+    business_ids = set(expired.values_list("business_id", flat=True).distinct())
+    if not business_ids:
+        return 0
+
+    # update() sends no post_save, so drop what the job_changed signal would have
+    deactivated = expired.update(is_active=False)
+    for business_id in business_ids:
+        invalidate_employer_dashboard(business_id)
+    invalidate_job_lists()
+    return deactivated
+
+
+def institute_job_list_page(request, page_size):
+    """
+    One page of the institute job list as {"total_jobs", "data",
+    "pagination_meta_data"}, cached in the job_lists region until a job
+    changes or the region's TIMEOUT passes.
+    """
+    key = ":".join(map(str, [
+        "institute", job_lists.get_version(JOB_LISTS_NAMESPACE), request.GET.get("page", 1), page_size,
+    ]))
+
+    def build():
+        jobs = Job.objects.all().order_by("-id")
+        page, pagination_meta = paginate(request, jobs, data_per_page=page_size)
+        return {
+            "total_jobs": pagination_meta["total_items"],
+            "data": JobpostSerializer(page, many=True).data,
+            "pagination_meta_data": pagination_meta,
+        }
+
+    return job_lists.get_or_compute(key, build)
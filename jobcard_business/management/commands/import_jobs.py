@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from jobcard_business.job_import import FORMATS, JobImportError, detect_format, import_jobs
+
+
+class Command(BaseCommand):
+    help = "Bulk import job postings from a CSV or JSON Lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV (header row with Job field names) or JSON Lines file.")
+        parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension (.jsonl/.json or csv).")
+        parser.add_argument("--business-id", type=int, help="Post every job for this business, ignoring the file column.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate only; nothing is saved.")
+
+    def handle(self, *args, **options):
+        try:
+            fmt = detect_format(options["path"], options["format"])
+        except JobImportError as e:
+            raise CommandError(str(e))
+
+        with open(options["path"], encoding="utf-8-sig", newline="") as text_stream:
+            summary = import_jobs(
+                text_stream, fmt, business_id=options["business_id"], dry_run=options["dry_run"]
+            )
+
+        for error in summary["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        verb = "Validated" if summary["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {summary['created']} of {summary['rows']} row(s); {summary['failed']} failed."
+        ))
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # Was 0025_jobapplication_updated_at_alter_hrfeedback_feedbacks, which also
+    # re-stated the help text of HRFeedback.feedbacks (dropped again in 0028)
+    replaces = [('jobcard_business', '0025_jobapplication_updated_at_alter_hrfeedback_feedbacks')]
+
+    dependencies = [
+        ('jobcard_business', '0024_remove_hrfeedback_comments_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, null=True),
+        ),
+    ]
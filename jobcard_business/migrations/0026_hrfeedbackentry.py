@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:03
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_business', '0025_jobapplication_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HRFeedbackEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('card_number', models.BigIntegerField(verbose_name='Card Number')),
+                ('business_id', models.IntegerField(blank=True, null=True, verbose_name='Business ID')),
+                ('company_name', models.CharField(max_length=255, verbose_name='Company Name')),
+                ('job_title', models.CharField(blank=True, max_length=255, null=True)),
+                ('employee_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('department', models.CharField(blank=True, max_length=255, null=True, verbose_name='Department/Role')),
+                ('date_of_joining', models.DateField(blank=True, null=True)),
+                ('last_working_day', models.DateField(blank=True, null=True)),
+                ('feedback_questions', models.JSONField(blank=True, default=dict, null=True)),
+                ('comments', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='jobcard_business.hrfeedback')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['business_id', 'created_at'], name='jobcard_bus_busines_51419e_idx'), models.Index(fields=['card_number', 'created_at'], name='jobcard_bus_card_nu_5711c9_idx'), models.Index(fields=['date_of_joining'], name='jobcard_bus_date_of_5859ba_idx'), models.Index(fields=['last_working_day'], name='jobcard_bus_last_wo_5625f9_idx')],
+            },
+        ),
+    ]
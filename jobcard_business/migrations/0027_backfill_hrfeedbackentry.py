@@ -0,0 +1,53 @@
+from django.db import migrations
+from django.utils.dateparse import parse_date
+
+
+def _date(value):
+    try:
+        return parse_date(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def forwards(apps, schema_editor):
+    HRFeedback = apps.get_model('jobcard_business', 'HRFeedback')
+    HRFeedbackEntry = apps.get_model('jobcard_business', 'HRFeedbackEntry')
+
+    batch = []
+    for candidate in HRFeedback.objects.all().iterator(chunk_size=500):
+        for item in candidate.feedbacks or []:
+            if not isinstance(item, dict):
+                continue
+            batch.append(HRFeedbackEntry(
+                candidate_id=candidate.id,
+                card_number=candidate.card_number,
+                business_id=item.get('business_id'),
+                company_name=item.get('company_name') or '',
+                job_title=item.get('job_title'),
+                employee_id=item.get('employee_id'),
+                department=item.get('department') or item.get('department_role'),
+                date_of_joining=_date(item.get('date_of_joining')),
+                last_working_day=_date(item.get('last_working_day')),
+                feedback_questions=item.get('feedback_questions'),
+                comments=item.get('comments'),
+                created_at=candidate.created_at,
+            ))
+        if len(batch) >= 1000:
+            HRFeedbackEntry.objects.bulk_create(batch)
+            batch = []
+    HRFeedbackEntry.objects.bulk_create(batch)
+
+
+def backwards(apps, schema_editor):
+    apps.get_model('jobcard_business', 'HRFeedbackEntry').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_business', '0026_hrfeedbackentry'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:04
+
+from django.db import migrations
+
+
+def restore_feedbacks(apps, schema_editor):
+    """
+    Unapplying: rebuild each candidate's `feedbacks` JSON list, in the shape
+    0027 read it, from HRFeedbackEntry, including entries added since.
+    """
+    HRFeedback = apps.get_model('jobcard_business', 'HRFeedback')
+    HRFeedbackEntry = apps.get_model('jobcard_business', 'HRFeedbackEntry')
+
+    feedbacks = {}
+    for entry in HRFeedbackEntry.objects.order_by('candidate_id', 'id').iterator(chunk_size=1000):
+        feedbacks.setdefault(entry.candidate_id, []).append({
+            'business_id': entry.business_id,
+            'company_name': entry.company_name,
+            'job_title': entry.job_title,
+            'employee_id': entry.employee_id,
+            'department': entry.department,
+            'date_of_joining': entry.date_of_joining.isoformat() if entry.date_of_joining else None,
+            'last_working_day': entry.last_working_day.isoformat() if entry.last_working_day else None,
+            'feedback_questions': entry.feedback_questions,
+            'comments': entry.comments,
+        })
+    for candidate_id, items in feedbacks.items():
+        HRFeedback.objects.filter(id=candidate_id).update(feedbacks=items)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_business', '0027_backfill_hrfeedbackentry'),
+    ]
+
+    operations = [
+        # 0027 copied the column into HRFeedbackEntry; unapplying refills it from there
+        migrations.RunPython(migrations.RunPython.noop, restore_feedbacks),
+        migrations.RemoveField(
+            model_name='hrfeedback',
+            name='feedbacks',
+        ),
+    ]
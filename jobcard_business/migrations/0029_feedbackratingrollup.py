@@ -0,0 +1,53 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:05
+
+from django.db import migrations, models
+from django.db.models import Count, DateField, Q
+from django.db.models.functions import TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    Feedback = apps.get_model('jobcard_business', 'Feedback')
+    FeedbackRatingRollup = apps.get_model('jobcard_business', 'FeedbackRatingRollup')
+
+    buckets = (
+        Feedback.objects.filter(business_id__isnull=False)
+        .annotate(month=TruncMonth('created_at', output_field=DateField()))
+        .values('business_id', 'month', 'happiness_rating')
+        .annotate(responses=Count('id'), with_issues=Count('id', filter=Q(has_issues=True)))
+        .order_by()
+    )
+    FeedbackRatingRollup.objects.bulk_create([
+        FeedbackRatingRollup(
+            business_id=bucket['business_id'],
+            month=bucket['month'],
+            rating=bucket['happiness_rating'],
+            responses=bucket['responses'],
+            with_issues=bucket['with_issues'],
+        )
+        for bucket in buckets
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_business', '0028_remove_hrfeedback_feedbacks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackRatingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('business_id', models.IntegerField(verbose_name='Business ID')),
+                ('month', models.DateField(help_text='First day of the month the feedback was given')),
+                ('rating', models.PositiveSmallIntegerField(choices=[(1, '1'), (2, '2'), (3, '3'), (4, '4'), (5, '5'), (6, '6'), (7, '7'), (8, '8'), (9, '9'), (10, '10')])),
+                ('responses', models.PositiveIntegerField(default=0)),
+                ('with_issues', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('business_id', 'month', 'rating'), name='unique_feedback_rollup_bucket')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
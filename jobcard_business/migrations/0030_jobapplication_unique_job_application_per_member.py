@@ -0,0 +1,53 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:10
+
+import json
+import logging
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+from django.db.models import Count
+
+logger = logging.getLogger(__name__)
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    """
+    Keep one application of each (job, member_card) pair so the unique
+    constraint can be added: the oldest one. Every deleted row is logged
+    in full, as JSON, so it can be restored by hand.
+    """
+    JobApplication = apps.get_model('jobcard_business', 'JobApplication')
+
+    duplicates = (
+        JobApplication.objects.values('job_id', 'member_card')
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+        .order_by()
+    )
+    for pair in list(duplicates):
+        rows = list(
+            JobApplication.objects.filter(job_id=pair['job_id'], member_card=pair['member_card'])
+            .order_by('id').values()
+        )
+        keep, remove = rows[0], rows[1:]
+        for row in remove:
+            logger.warning(
+                "Deleting duplicate application %s of job %s, member %s (keeping %s): %s",
+                row['id'], pair['job_id'], pair['member_card'], keep['id'], json.dumps(row, cls=DjangoJSONEncoder),
+            )
+        JobApplication.objects.filter(id__in=[row['id'] for row in remove]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_business', '0029_feedbackratingrollup'),
+    ]
+
+    operations = [
+        # Unapplying drops the constraint only; deleted duplicates are restored from the log if needed
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='jobapplication',
+            constraint=models.UniqueConstraint(fields=('job', 'member_card'), name='unique_job_application_per_member'),
+        ),
+    ]
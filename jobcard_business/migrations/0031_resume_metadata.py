@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_business', '0030_jobapplication_unique_job_application_per_member'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='has_resume',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_extension',
+            field=models.CharField(blank=True, max_length=16, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='resume_name',
+            field=models.CharField(blank=True, max_length=15, null=True),
+        ),
+    ]
@@ -0,0 +1,42 @@
+import os
+from urllib.parse import urlparse
+from django.db import migrations
+
+FIELDS = ["has_resume", "resume_name", "resume_extension"]
+
+
+def _metadata(resume_url):
+    # helpers.resume.resume_metadata at the time of this migration
+    if not resume_url or not resume_url.strip():
+        return False, None, None
+    try:
+        full_filename = os.path.basename(urlparse(resume_url.strip()).path)
+    except ValueError:
+        return True, None, None
+    extension = os.path.splitext(full_filename)[1].lstrip(".").lower()[:16] or None
+    return True, full_filename[-15:], extension
+
+
+def forwards(apps, schema_editor):
+    JobApplication = apps.get_model('jobcard_business', 'JobApplication')
+
+    batch = []
+    rows = JobApplication.objects.exclude(resume__isnull=True).exclude(resume="").only("pk", "resume")
+    for instance in rows.iterator(chunk_size=500):
+        instance.has_resume, instance.resume_name, instance.resume_extension = _metadata(instance.resume)
+        batch.append(instance)
+        if len(batch) >= 500:
+            JobApplication.objects.bulk_update(batch, FIELDS)
+            batch = []
+    JobApplication.objects.bulk_update(batch, FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_business', '0031_resume_metadata'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:57
+
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+
+def backfill_selected_at(apps, schema_editor):
+    # The selection time was never stored; the last change is the closest there is
+    JobApplication = apps.get_model('jobcard_business', 'JobApplication')
+    JobApplication.objects.filter(status='selected', selected_at__isnull=True).update(
+        selected_at=Coalesce(F('updated_at'), F('applied_at'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_business', '0032_backfill_resume_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='selected_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text="When the status first became 'selected'; kept if it changes again", null=True),
+        ),
+        migrations.RunPython(backfill_selected_at, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
 from django.utils import timezone
+from helpers.resume import (
+    RESUME_EXTENSION_LENGTH, RESUME_NAME_LENGTH, set_resume_metadata, with_resume_metadata_fields,
+)
 
 class Job(models.Model):
     WORKPLACE_CHOICES = [
@@ -125,6 +128,10 @@ class JobApplication(models.Model):
     institute_id = models.IntegerField(verbose_name="Institute ID" , null=True, blank=True)
     cover_letter = models.TextField(blank=True)
     resume = models.TextField(max_length=255)
+    # Derived from resume on save
+    has_resume = models.BooleanField(default=False)
+    resume_name = models.CharField(max_length=RESUME_NAME_LENGTH, blank=True, null=True)
+    resume_extension = models.CharField(max_length=RESUME_EXTENSION_LENGTH, blank=True, null=True)
     applied_at = models.DateTimeField(default=timezone.now)
     status = models.CharField(
         max_length=50,
@@ -142,10 +149,31 @@ class JobApplication(models.Model):
         blank=True,
         help_text="ID of the employee who submitted the application"
     )
+    updated_at = models.DateTimeField(auto_now=True, null=True, db_index=True)
+    selected_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="When the status first became 'selected'; kept if it changes again"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'member_card'], name='unique_job_application_per_member'),
+        ]
 
     def __str__(self):
         return f"{self.member_card} applied to {self.job.title}"
 
+    def save(self, *args, **kwargs):
+        set_resume_metadata(self, self.resume)
+        kwargs["update_fields"] = with_resume_metadata_fields(kwargs.get("update_fields"), "resume")
+        if self.status == "selected" and self.selected_at is None:
+            self.selected_at = timezone.now()
+            if kwargs["update_fields"] is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "selected_at"}
+        super().save(*args, **kwargs)
+
     
 
 class Feedback(models.Model):
@@ -162,33 +190,66 @@ class Feedback(models.Model):
 
     def __str__(self):
         return f"{self.card_number} - {self.happiness_rating}/10"
+
+
+class FeedbackRatingRollup(models.Model):
+    """
+    Feedback counts per business, month and happiness rating, kept up to date
+    as Feedback rows are written. Satisfaction stats are summed from these rows.
+    """
+    business_id = models.IntegerField(verbose_name="Business ID")
+    month = models.DateField(help_text="First day of the month the feedback was given")
+    rating = models.PositiveSmallIntegerField(choices=Feedback.HAPPINESS_CHOICES)
+    responses = models.PositiveIntegerField(default=0)
+    with_issues = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['business_id', 'month', 'rating'], name='unique_feedback_rollup_bucket'),
+        ]
+
+    def __str__(self):
+        return f"{self.business_id} {self.month:%Y-%m} rating {self.rating}: {self.responses}"
     
     
 class HRFeedback(models.Model):
+    """
+    One row per candidate; the company feedbacks live in HRFeedbackEntry.
+    """
     candidate_name = models.CharField(max_length=255, verbose_name="Candidate Name")
     card_number = models.BigIntegerField(unique=True, verbose_name="Card Number")  # unique per candidate
-    feedbacks = models.JSONField(
-        default=list,
-        help_text="""Store multiple company feedbacks as a list of dicts. 
-        Each dict can include company info, job info, feedback, comments, and business ID, e.g.:
-
-        [
-            {
-                'company_name': 'ABC',
-                'job_title': 'Developer',
-                'employee_id': 'E123',
-                'feedback_questions': {'Question 1': 'Answer'},
-                'comments': 'Good candidate',
-                'business_id': 101365,
-                'department_role': 'IT',
-                'date_of_joining': '2022-01-01',
-                'last_working_day': '2023-01-01'
-            },
-        ]
-        """
-    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.candidate_name} - {self.card_number}"
\ No newline at end of file
+        return f"{self.candidate_name} - {self.card_number}"
+
+
+class HRFeedbackEntry(models.Model):
+    """
+    One company's feedback for a candidate. Adding a feedback is a plain insert,
+    and feedbacks can be looked up by business, card number and dates.
+    """
+    candidate = models.ForeignKey(HRFeedback, on_delete=models.CASCADE, related_name='entries')
+    card_number = models.BigIntegerField(verbose_name="Card Number")
+    business_id = models.IntegerField(null=True, blank=True, verbose_name="Business ID")
+    company_name = models.CharField(max_length=255, verbose_name="Company Name")
+    job_title = models.CharField(max_length=255, blank=True, null=True)
+    employee_id = models.CharField(max_length=100, blank=True, null=True)
+    department = models.CharField(max_length=255, blank=True, null=True, verbose_name="Department/Role")
+    date_of_joining = models.DateField(blank=True, null=True)
+    last_working_day = models.DateField(blank=True, null=True)
+    feedback_questions = models.JSONField(default=dict, blank=True, null=True)
+    comments = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['business_id', 'created_at']),
+            models.Index(fields=['card_number', 'created_at']),
+            models.Index(fields=['date_of_joining']),
+            models.Index(fields=['last_working_day']),
+        ]
+
+    def __str__(self):
+        return f"{self.card_number} - {self.company_name}"
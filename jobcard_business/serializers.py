@@ -1,7 +1,9 @@
 # serializers.py
 from rest_framework import serializers
 from . import models
-from helpers.utils import get_member_details_by_card
+from jobcard_member.serializers import (
+    DocumentProfileSerializerMixin, MemberDetailsListSerializer, MemberDetailsSerializerMixin,
+)
  
 class InstitutionJobListSerializer(serializers.ModelSerializer):  # Renamed class
     class Meta:
@@ -9,39 +11,35 @@ class InstitutionJobListSerializer(serializers.ModelSerializer):  # Renamed clas
         fields = '__all__'
 
 
-class JobApplicationListForBusinessSerializer(serializers.ModelSerializer):
+class JobApplicationListForBusinessSerializer(
+    MemberDetailsSerializerMixin, DocumentProfileSerializerMixin, serializers.ModelSerializer
+):
     job_title = serializers.CharField(source='job.title', read_only=True)
-    full_name = serializers.SerializerMethodField()
-   
 
     class Meta:
         model = models.JobApplication
         fields = [
             'id', 'job_title', 'member_card',
             'full_name','status', 'applied_at',
-            
+            *DocumentProfileSerializerMixin.PROFILE_FIELDS,
         ]
-
-    def get_full_name(self, obj):
-         
-        member_card = obj.member_card
-        try:
-            member_data = get_member_details_by_card(member_card)
-            return member_data.get('full_name')
-        except Exception:
-            return None
-
-    def get_email(self, obj):
-          # Replace with actual path
-        member_card = obj.member_card
-        try:
-            member_data = get_member_details_by_card(member_card)
-            return member_data.get('email')
-        except Exception:
-            return None
+        list_serializer_class = MemberDetailsListSerializer
         
         
+class HRFeedbackEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.HRFeedbackEntry
+        fields = [
+            'company_name', 'job_title', 'employee_id', 'department',
+            'date_of_joining', 'last_working_day', 'feedback_questions',
+            'comments', 'business_id', 'created_at',
+        ]
+        read_only_fields = ['business_id', 'created_at']
+
+
 class HRFeedbackSerializer(serializers.ModelSerializer):
+    feedbacks = HRFeedbackEntrySerializer(source='entries', many=True, read_only=True)
+
     class Meta:
         model = models.HRFeedback
         fields = '__all__'
\ No newline at end of file
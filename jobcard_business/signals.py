@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from .dashboard import invalidate_employer_dashboard
+from .feedback_stats import move_feedback, record_feedback, stored_feedback
+from .job_lists import invalidate_job_lists
+from .models import Feedback, Job, JobApplication
+
+
+@receiver([post_save, post_delete], sender=Job)
+def job_changed(sender, instance, **kwargs):
+    invalidate_employer_dashboard(instance.business_id)
+    invalidate_job_lists()
+
+
+@receiver([post_save, post_delete], sender=JobApplication)
+def application_changed(sender, instance, **kwargs):
+    try:
+        business_id = instance.job.business_id
+    except Job.DoesNotExist:
+        return
+    invalidate_employer_dashboard(business_id)
+
+
+@receiver(pre_save, sender=Feedback)
+def feedback_saving(sender, instance, **kwargs):
+    instance._rollup_old = stored_feedback(instance)
+
+
+@receiver(post_save, sender=Feedback)
+def feedback_saved(sender, instance, created, **kwargs):
+    old = getattr(instance, "_rollup_old", None)
+    if created or old is None:
+        record_feedback(instance)
+    else:
+        move_feedback(old, instance)
+
+
+@receiver(post_delete, sender=Feedback)
+def feedback_deleted(sender, instance, **kwargs):
+    record_feedback(instance, sign=-1)
@@ -1,3 +1,264 @@
-from django.test import TestCase
+import io
+import threading
+from unittest import mock
+from datetime import date
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from helpers.testing import (
+    INSTITUTE_ID, MEMBER_CARD, EndpointBudgetTestCase, distinct_members, job_payload, job_upload, seed_applications,
+    seed_jobs, seed_members,
+)
+from jobcard_business.authentication import AuthenticatedBusinessUser
+from jobcard_business.feedback_stats import feedback_summary
+from jobcard_business.job_import import import_jobs, validate_row
+from jobcard_business.job_lists import deactivate_expired_jobs
+from jobcard_business.models import Feedback, FeedbackRatingRollup, HRFeedback, HRFeedbackEntry, Job
+from jobcard_business.views import HRFeedbackCreateAPIView
 
-# Create your tests here.
+CARD_NUMBER = "1234567890123456"
+
+
+def submit_hr_feedback(business_id, **data):
+    payload = {"candidate_name": "Asha Rao", "company_name": f"Company {business_id}"}
+    payload.update(data)
+    request = APIRequestFactory().post("/business/hr-feedback/", payload, format="json")
+    force_authenticate(request, user=AuthenticatedBusinessUser(id=1, business_id=business_id, business_name="Acme"))
+    return HRFeedbackCreateAPIView.as_view()(request, card_number=CARD_NUMBER)
+
+
+class HRFeedbackAppendTests(TestCase):
+
+    def test_append_inserts_without_rewriting_previous_entries(self):
+        submit_hr_feedback(101, employee_id="E1")
+        first = HRFeedbackEntry.objects.get()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = submit_hr_feedback(102, employee_id="E2")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["data"]["feedbacks"]), 2)
+        writes = [q["sql"] for q in queries if q["sql"].lstrip().upper().startswith(("UPDATE", "DELETE"))]
+        self.assertEqual(writes, [])
+        first.refresh_from_db()
+        self.assertEqual(first.employee_id, "E1")
+
+
+class HRFeedbackConcurrentAppendTests(TransactionTestCase):
+
+    def test_parallel_appends_are_all_kept(self):
+        workers = 8
+        barrier = threading.Barrier(workers)
+        results = []
+
+        def worker(business_id):
+            try:
+                barrier.wait()
+                results.append(submit_hr_feedback(business_id, employee_id=f"E{business_id}").status_code)
+            except Exception as exc:
+                results.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(100 + i,)) for i in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [201] * workers)
+        self.assertEqual(HRFeedback.objects.filter(card_number=CARD_NUMBER).count(), 1)
+        self.assertEqual(
+            sorted(HRFeedbackEntry.objects.filter(card_number=CARD_NUMBER).values_list("business_id", flat=True)),
+            [100 + i for i in range(workers)]
+        )
+
+
+class BusinessEndpointBudgetTests(EndpointBudgetTestCase):
+    """
+    Queries and auth server calls per request stay fixed however many jobs,
+    applicants and feedbacks there are; applicant lists look each member
+    up at most once.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.jobs = seed_jobs(2)
+        seed_applications(self.jobs, 3)
+        seed_members(3)
+        self.members = 3
+
+    def grow(self):
+        jobs = seed_jobs(5, start=self.members * 10)
+        seed_applications([self.jobs[0], *jobs], 6, start=self.members)
+        seed_members(6, start=self.members)
+        self.members += 6
+
+    def test_job_list(self):
+        response = self.assertScalesFlat("get", "/business/employer/job-list/", "business-token", 2, 1, self.grow).response
+        self.assertEqual(len(response.data["data"]), 7)
+
+    def test_dashboard_and_feedback_summary(self):
+        self.assertScalesFlat("get", "/business/employer/dashboard/", "business-token", 1, 1, self.grow)
+        response = self.assertScalesFlat(
+            "get", "/business/employer/feedback-summary/", "business-token", 1, 1, self.grow
+        ).response
+        self.assertEqual(response.data["data"]["total_responses"], self.members)
+
+    def test_job_details(self):
+        self.assertScalesFlat("get", f"/business/job-details/{self.jobs[0].id}/", "business-token", 1, 1, self.grow)
+
+    def test_job_writes(self):
+        created = self.assertWithinBudget(
+            "post", "/business/employer/job-list/", "business-token", 1, 1, data=job_payload(), status_code=201,
+        ).response
+        self.assertEqual(created.data["data"]["business_id"], 101)
+        self.assertWithinBudget(
+            "put", f"/business/job-details/{self.jobs[0].id}/", "business-token", 3, 1,
+            data=job_payload(title="Senior Welder", business_id=101),
+        )
+
+    def test_job_import(self):
+        def upload(count):
+            return self.assertWithinBudget(
+                "post", "/business/employer/job-import/", "business-token", 3, 1,
+                data={"file": job_upload(count)}, format="multipart",
+            )
+
+        # One insert per chunk; kept under SQLite's 999 parameter split of one insert
+        before = upload(3)
+        after = upload(30)
+        self.assertEqual(after.response.data["data"]["created"], 30)
+        self.assertEqual(after.queries, before.queries)
+
+    def test_hr_feedback_create(self):
+        self.assertWithinBudget(
+            "post", f"/business/hr-feedback/{MEMBER_CARD}/", "business-token", 3, 1,
+            data={"candidate_name": "Member One", "company_name": "Acme", "job_title": "Welder"}, status_code=201,
+        )
+
+    def test_applicants(self):
+        response = self.assertScalesFlat(
+            "get", f"/business/list/student/{self.jobs[0].id}/", "business-token", 1, 1, self.grow,
+            lookups=distinct_members,
+        ).response
+        self.assertEqual(len(response.data["data"]), 9)
+        self.assertEqual(response.data["data"][0]["full_name"], f"Member {response.data['data'][0]['member_card']}")
+
+    def test_member_documents(self):
+        self.assertScalesFlat(
+            "get", f"/business/documents/details/{MEMBER_CARD}/", "business-token", 2, 1, self.grow
+        )
+        self.assertWithinBudget(
+            "post", f"/business/documents/details/{MEMBER_CARD}/", "business-token", 4, 1,
+            data={"documents": ["Resume", "TenthCertificate"]}, status_code=201,
+        )
+
+    def test_hr_feedback(self):
+        self.assertScalesFlat(
+            "get", f"/business/hr-feedback/{MEMBER_CARD}/", "business-token", 2, 1, self.grow
+        )
+        self.assertScalesFlat("get", "/business/my-feedbacks/", "business-token", 1, 1, self.grow)
+
+    def test_institute_lists(self):
+        self.assertScalesFlat("get", "/business/institution-jobs/", "institute-token", 2, 1, self.grow)
+        response = self.assertScalesFlat(
+            "get", f"/business/applied/student/{self.jobs[0].id}/", "institute-token", 2, 1, self.grow,
+            lookups=distinct_members,
+        ).response
+        self.assertEqual(len(response.data["data"]), 15)
+
+    def test_mobile_lookup_errors_are_not_cached(self):
+        path = f"/business/hr-feedback/{str(MEMBER_CARD)[-10:]}/"
+        respond = self.stub.respond
+
+        def auth_server_down(method, stub_path, query, body):
+            if stub_path == "/api/member-details/":
+                return 503, {}
+            return respond(method, stub_path, query, body)
+
+        with mock.patch.object(self.stub, "respond", side_effect=auth_server_down):
+            self.assertWithinBudget("get", path, "business-token", 0, 2, status_code=503)
+
+        self.stub.reset()
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.stub.count("/api/member-details/"), 1)
+
+    def test_unknown_mobile_is_cached(self):
+        path = "/business/hr-feedback/0000000000/"
+        respond = self.stub.respond
+
+        def no_such_member(method, stub_path, query, body):
+            return (404, {}) if stub_path == "/api/member-details/" else respond(method, stub_path, query, body)
+
+        with mock.patch.object(self.stub, "respond", side_effect=no_such_member):
+            self.assertWithinBudget("get", path, "business-token", 0, 2, status_code=404)
+            self.stub.reset()
+            self.assertEqual(self.client.get(path).status_code, 404)
+            self.assertEqual(self.stub.count("/api/member-details/"), 0)
+
+
+class DeactivateExpiredJobsTests(TestCase):
+
+    def test_one_update_however_many_jobs_expired(self):
+        seed_jobs(2)
+        expired = seed_jobs(5, start=10, application_end_date=date(2020, 1, 1))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(deactivate_expired_jobs(), 5)
+        self.assertEqual(len(queries), 2)
+        self.assertFalse(Job.objects.filter(id__in=[job.id for job in expired], is_active=True).exists())
+        self.assertEqual(Job.objects.filter(is_active=True).count(), 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(deactivate_expired_jobs(), 0)
+        self.assertEqual(len(queries), 1)
+
+
+class JobImportListFieldTests(TestCase):
+
+    def test_list_values_must_be_strings(self):
+        for value in ('[{"a": 1}]', '[["Full-time"]]', '[1]', '{"a": 1}', '"Full-time"', {"a": 1}, 5):
+            with self.subTest(value=value):
+                _, errors = validate_row({"job_type": value})
+                self.assertIn("job_type", errors)
+
+        for value in ('["Full-time", "Part-time"]', "Full-time | Part-time", ["Full-time", "Part-time"]):
+            with self.subTest(value=value):
+                _, errors = validate_row({"job_type": value})
+                self.assertNotIn("job_type", errors)
+
+    def test_bad_list_value_is_a_row_error(self):
+        rows = io.StringIO('{"title": "Welder", "job_type": [{"a": 1}]}\n{"title": "Fitter", "job_type": 7}\n')
+        summary = import_jobs(rows, "jsonl", business_id=101)
+        self.assertEqual((summary["failed"], summary["created"]), (2, 0))
+        self.assertEqual([error["row"] for error in summary["errors"]], [1, 2])
+        self.assertTrue(all("job_type" in error["errors"] for error in summary["errors"]))
+
+
+class FeedbackRollupTests(TestCase):
+
+    def test_edits_move_feedback_between_buckets(self):
+        feedback = Feedback.objects.create(card_number=1, business_id=101, happiness_rating=9, has_issues=False)
+        Feedback.objects.create(card_number=2, business_id=101, happiness_rating=9, has_issues=False)
+
+        feedback.happiness_rating = 3
+        feedback.has_issues = True
+        feedback.save()
+        summary = feedback_summary(101)
+        self.assertEqual(summary["total_responses"], 2)
+        self.assertEqual((summary["distribution"][9], summary["distribution"][3]), (1, 1))
+        self.assertEqual(summary["issues_share"], 0.5)
+
+        feedback.business_id = 102
+        feedback.save()
+        self.assertEqual(feedback_summary(101)["distribution"][3], 0)
+        self.assertEqual(feedback_summary(102)["distribution"][3], 1)
+
+        # Saves that change none of the counted fields leave the buckets alone
+        feedback.suggestions = "More jobs nearby"
+        with self.assertNumQueries(2):
+            feedback.save()
+        self.assertEqual(sum(FeedbackRatingRollup.objects.values_list("responses", flat=True)), 2)
@@ -4,7 +4,9 @@ from . import views, institute_api
 
 urlpatterns = [
     path('employer/job-list/', views.JobListBusinessAPIView.as_view(), name='employer-applications'),
+    path('employer/job-import/', views.JobImportBusinessAPIView.as_view(), name='employer-job-import'),
     path('employer/dashboard/', views.EmployerDashboardAPIView.as_view(), name='employer-dashboard'),
+    path('employer/feedback-summary/', views.FeedbackSummaryBusinessAPIView.as_view(), name='employer-feedback-summary'),
     path('job-details/<int:job_id>/', views.JobDetailBusinessAPIView.as_view(), name='job-details'),
     path('list/student/<int:job_id>/', views.JobApplicationListBusinessAPI.as_view(), name='business-job-applications'),
     path('documents/details/<int:card_number>/', views.GetMemberDocumentsAPIView.as_view(), name='get-member-documents'),
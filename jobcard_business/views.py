@@ -9,9 +9,16 @@ from django.utils.timezone import now
 from jobcard_business.authentication import SSOBusinessTokenAuthentication
 from jobcard_staff.serializers import JobpostSerializer
 from jobcard_business import models, serializers
-from jobcard_member.serializers import MbrDocumentsSerializer
-from jobcard_member.models import MbrDocuments, DocumentVerificationRequest
-from helpers.utils import get_member_details_by_mobile, get_member_details_by_card, get_business_details_by_id
+from jobcard_member.serializers import DOCUMENT_FILTER_PARAMETERS, MbrDocumentsSerializer
+from jobcard_member.completeness import InvalidDocumentFilter, filter_by_documents
+from jobcard_member.models import MbrDocuments
+from jobcard_member.document_status import InvalidDocumentStatus, create_verification_request
+from jobcard_business.dashboard import get_employer_dashboard
+from jobcard_business.feedback_stats import feedback_summary
+from jobcard_business.job_import import JobImportError, import_jobs_from_upload
+from jobcard_business.job_lists import deactivate_expired_jobs
+from rest_framework.parsers import MultiPartParser
+from helpers.member_resolver import InvalidMemberIdentifier, MemberLookupFailed, resolve_member
 
 class JobListBusinessAPIView(APIView):
     """
@@ -19,6 +26,7 @@ class JobListBusinessAPIView(APIView):
     """
     authentication_classes = [SSOBusinessTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
         operation_description="Retrieve a list of all job postings.",
@@ -35,8 +43,7 @@ class JobListBusinessAPIView(APIView):
                     "success": False,
                     "message": "Authenticated user is not associated with a business."
                 }, status=status.HTTP_400_BAD_REQUEST)
-            for job in models.Job.objects.filter(is_active=True):
-                job.check_and_deactivate()
+            deactivate_expired_jobs()
             jobs = models.Job.objects.filter(business_id=business).order_by('-created_at')
             serializer = JobpostSerializer(jobs, many=True)
 
@@ -101,6 +108,53 @@ class JobListBusinessAPIView(APIView):
             
             
 
+class JobImportBusinessAPIView(APIView):
+    """
+    API to bulk import job posts for the authenticated business from a CSV or JSON Lines file.
+    """
+    authentication_classes = [SSOBusinessTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    @swagger_auto_schema(
+        operation_description="Bulk import jobs. Columns/keys are Job field names; list fields take a JSON list or '|' separated values.",
+        manual_parameters=[
+            openapi.Parameter('file', openapi.IN_FORM, type=openapi.TYPE_FILE, required=True, description="CSV or JSON Lines file"),
+            openapi.Parameter('format', openapi.IN_FORM, type=openapi.TYPE_STRING, enum=["csv", "jsonl"], description="Defaults to the file extension"),
+            openapi.Parameter('dry_run', openapi.IN_FORM, type=openapi.TYPE_BOOLEAN, description="Validate only"),
+        ],
+        responses={200: "Import summary with per-row errors"},
+        tags=["Business"]
+    )
+    def post(self, request):
+        business = request.user.business_id
+        if not business:
+            return Response({
+                "success": False,
+                "message": "Authenticated user is not associated with a business."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        upload = request.FILES.get("file")
+        if not upload:
+            return Response({"success": False, "message": "file is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            summary = import_jobs_from_upload(
+                upload,
+                fmt=request.data.get("format"),
+                business_id=business,
+                dry_run=str(request.data.get("dry_run", "")).lower() in ("1", "true", "yes"),
+            )
+        except (JobImportError, UnicodeDecodeError) as e:
+            return Response({"success": False, "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "success": True,
+            "message": f"{summary['created']} of {summary['rows']} job(s) imported.",
+            "data": summary
+        }, status=status.HTTP_200_OK)
+
+
 class JobDetailBusinessAPIView(APIView):
     """
     API to retrieve, update, or delete a job post by ID.
@@ -157,9 +211,11 @@ class JobApplicationListBusinessAPI(APIView):
     """
     authentication_classes = [SSOBusinessTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
-        operation_description="List all job applications received for this business.",
+        operation_description="List all job applications received for this business, optionally filtered by the applicants' documents.",
+        manual_parameters=DOCUMENT_FILTER_PARAMETERS,
         responses={200: serializers.JobApplicationListForBusinessSerializer(many=True)},tags=["Business"]
     )
     def get(self, request, job_id):
@@ -171,7 +227,13 @@ class JobApplicationListBusinessAPI(APIView):
             #         "message": "Authenticated user is not associated with a business."
             #     }, status=status.HTTP_400_BAD_REQUEST)
            
-            applications = models.JobApplication.objects.filter(job_id=job_id)
+            try:
+                applications = filter_by_documents(
+                    models.JobApplication.objects.filter(job_id=job_id).select_related("job"), request.query_params
+                )
+            except InvalidDocumentFilter as e:
+                return Response({"success": False, "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
             serializer = serializers.JobApplicationListForBusinessSerializer(applications, many=True)
 
             return Response({
@@ -191,9 +253,11 @@ class EmployerDashboardAPIView(APIView):
     - Total jobs posted
     - Total applications received
     - Total students placed
+    - Application counts per status, overall and per job
     """
     authentication_classes = [SSOBusinessTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
         operation_description="Get employer dashboard stats: total jobs, applications, and placed students.",
@@ -209,29 +273,10 @@ class EmployerDashboardAPIView(APIView):
                     "message": "Authenticated user is not associated with a business."
                 }, status=status.HTTP_400_BAD_REQUEST)
 
-            # Get all jobs for this business
-            job_ids = models.Job.objects.filter(business_id=business_id).values_list('id', flat=True)
-
-            # Total jobs
-            total_jobs = job_ids.count()
-
-            # Total applications across all jobs
-            total_applications = models.JobApplication.objects.filter(job_id__in=job_ids).count()
-
-            # Total placed students (assuming status = 'placed' or 'selected')
-            total_placed = models.JobApplication.objects.filter(
-                job_id__in=job_ids,
-                status__in=["placed", "selected"]
-            ).count()
-
             return Response({
                 "success": True,
                 "message": "Dashboard data retrieved successfully.",
-                "data": {
-                    "total_jobs": total_jobs,
-                    "total_applications": total_applications,
-                    "total_placed_students": total_placed
-                }
+                "data": get_employer_dashboard(business_id)
             }, status=status.HTTP_200_OK)
 
         except Exception as e:
@@ -243,6 +288,35 @@ class EmployerDashboardAPIView(APIView):
 
 
 
+class FeedbackSummaryBusinessAPIView(APIView):
+    """
+    Employee satisfaction stats for the authenticated business, read from the
+    precomputed feedback rollups.
+    """
+    authentication_classes = [SSOBusinessTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    read_from_replica = True
+
+    @swagger_auto_schema(
+        operation_description="Average happiness rating, rating distribution, NPS buckets, issue share and monthly trend.",
+        responses={200: 'Feedback summary'},
+        tags=["Business"]
+    )
+    def get(self, request):
+        business_id = request.user.business_id
+        if not business_id:
+            return Response({
+                "success": False,
+                "message": "Authenticated user is not associated with a business."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "success": True,
+            "message": "Feedback summary retrieved successfully.",
+            "data": feedback_summary(business_id)
+        }, status=status.HTTP_200_OK)
+
+
 class GetMemberDocumentsAPIView(APIView):
     """
     API to fetch documents for a member by card number or mobile number.
@@ -255,31 +329,28 @@ class GetMemberDocumentsAPIView(APIView):
         tags=["Job Profile Management"]
     )
     def get(self, request, card_number):
-        card_no = str(card_number).strip()
-
-        # ✅ Decide whether it's a card number or mobile number
-        mbrcardno = None
-        full_name = None 
-        if len(card_no) == 16 and card_no.isdigit():
-            # Directly use as card number
-            mbrcardno = card_no
-        elif len(card_no) == 10 and card_no.isdigit():
-            # Lookup by mobile number
-            member_data = get_member_details_by_mobile(card_no)
-            mbrcardno = member_data.get("mbrcardno") 
-            print(mbrcardno,"mbrcardno")
-            full_name = member_data.get("full_name") if member_data else None
-        else:
+        # ✅ Accepts a 16-digit card number or a 10-digit mobile number
+        try:
+            member = resolve_member(card_number)
+        except InvalidMemberIdentifier:
             return Response(
                 {"error": "Invalid input. Provide a valid 16-digit card number or 10-digit mobile number."},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except MemberLookupFailed as e:
+            print(e)
+            return Response(
+                {"success": False, "message": "Member service unavailable, please try again."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
 
-        if not mbrcardno:
+        if not member:
             return Response(
                 {"success": False, "message": "Member not found."},
                 status=status.HTTP_404_NOT_FOUND
             )
+        mbrcardno = member["card_number"]
+        full_name = member["full_name"]
 
         # ✅ Fetch documents
         try:
@@ -316,29 +387,31 @@ class GetMemberDocumentsAPIView(APIView):
         documents = request.data.get("documents")
         requested_by = request.user.business_id  # HR user ID
 
-        mbrcardno = None
-        full_name = None 
-        card_number_str = str(card_number)
-
-        if len(card_number_str) == 16 and card_number_str.isdigit():
-            # Directly use as card number
-            mbrcardno = card_number_str
-        elif len(card_number_str) == 10 and card_number_str.isdigit():
-            # Lookup by mobile number
-            member_data = get_member_details_by_mobile(card_number_str)
-            mbrcardno = member_data.get("mbrcardno") if member_data else None
-        else:
+        try:
+            member = resolve_member(card_number)
+        except InvalidMemberIdentifier:
             return Response(
                 {"success": False, "message": "documents are required"},
                 status=status.HTTP_400_BAD_REQUEST
     )
+        except MemberLookupFailed as e:
+            print(e)
+            return Response(
+                {"success": False, "message": "Member service unavailable, please try again."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        if not member:
+            return Response(
+                {"success": False, "message": "Member not found."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        mbrcardno = member["card_number"]
 
         # Create the verification request
-        doc_request = DocumentVerificationRequest.objects.create(
-            card_number=mbrcardno,
-            requested_by=requested_by,
-            documents=documents
-        )
+        try:
+            doc_request, documents = create_verification_request(mbrcardno, requested_by, documents)
+        except InvalidDocumentStatus as e:
+            return Response({"success": False, "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response({
             "success": True,
@@ -346,7 +419,7 @@ class GetMemberDocumentsAPIView(APIView):
             "data": {
                 "id": doc_request.id,
                 "card_number": doc_request.card_number,
-                "documents": doc_request.documents,
+                "documents": documents,
                 "status": doc_request.status
             }
         }, status=status.HTTP_201_CREATED)
@@ -406,57 +479,54 @@ class HRFeedbackCreateAPIView(APIView):
         tags=["HR Feedback"]
     )
     def post(self, request, card_number):
-        card_number = str(card_number).strip()
-
         # Determine if it's card number or mobile number
-        if len(card_number) == 16 and card_number.isdigit():
-            card_number = card_number
-        elif len(card_number) == 10 and card_number.isdigit():
-            member_data = get_member_details_by_mobile(card_number)
-            if member_data:
-                card_number = member_data.get("mbrcardno")
-            else:
-                return Response(
-                    {"success": False, "message": "Member not found for this mobile number."},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-        else:
+        try:
+            member = resolve_member(card_number)
+        except InvalidMemberIdentifier:
             return Response(
                 {"success": False, "message": "Invalid card number or mobile number."},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except MemberLookupFailed as e:
+            print(e)
+            return Response(
+                {"success": False, "message": "Member service unavailable, please try again."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        if not member:
+            return Response(
+                {"success": False, "message": "Member not found for this mobile number."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        card_number = member["card_number"]
 
         candidate_name = request.data.get("candidate_name")
 
-        new_feedback = {
-            "company_name": request.data.get("company_name"),
-            "job_title": request.data.get("job_title"),
-            "employee_id": request.data.get("employee_id"),
-            "department": request.data.get("department"),
-            "date_of_joining": request.data.get("date_of_joining"),
-            "last_working_day": request.data.get("last_working_day"),
-            "feedback_questions": request.data.get("feedback_questions"),
-            "comments": request.data.get("comments"),
-            "business_id": request.user.business_id  # HR submitting the feedback
-        }
-
-        if not card_number or not candidate_name or not new_feedback["company_name"]:
+        if not card_number or not candidate_name or not request.data.get("company_name"):
             return Response(
                 {"success": False, "message": "card_number, candidate_name, and company_name are required."},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Get or create feedback object
+        entry_serializer = serializers.HRFeedbackEntrySerializer(data=request.data)
+        if not entry_serializer.is_valid():
+            return Response(
+                {"success": False, "message": "Invalid data.", "errors": entry_serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Get or create the candidate record (the unique card_number settles concurrent creates)
         feedback_obj, created = models.HRFeedback.objects.get_or_create(
             card_number=card_number,
-            defaults={"candidate_name": candidate_name, "feedbacks": []}
+            defaults={"candidate_name": candidate_name}
         )
 
-        # Append new company feedback
-        feedback_list = feedback_obj.feedbacks or []
-        feedback_list.append(new_feedback)
-        feedback_obj.feedbacks = feedback_list
-        feedback_obj.save(update_fields=["feedbacks", "updated_at"])
+        # Append new company feedback: a single INSERT, earlier feedbacks are never rewritten
+        entry_serializer.save(
+            candidate=feedback_obj,
+            card_number=feedback_obj.card_number,
+            business_id=request.user.business_id  # HR submitting the feedback
+        )
 
         serializer = serializers.HRFeedbackSerializer(feedback_obj)
         return Response({
@@ -483,25 +553,27 @@ class HRFeedbackCreateAPIView(APIView):
         """
         Fetch all feedbacks for a candidate using either card number or mobile number.
         """
-        mbrcardno = None
-        full_name = None
-        if len(card_number) == 16 and card_number.isdigit():
-            mbrcardno = card_number
-        elif len(card_number) == 10 and card_number.isdigit():
-            member_data = get_member_details_by_mobile(card_number)
-            mbrcardno = member_data.get("mbrcardno") if member_data else None
-            full_name = member_data.get("full_name") if member_data else None
-            mobile_number = member_data.get("mobile_number") if member_data else None
-        else:
+        try:
+            member = resolve_member(card_number)
+        except InvalidMemberIdentifier:
             return Response({"success": False, "message": "Provide a valid 16-digit card number or 10-digit mobile number."},
                             status=status.HTTP_400_BAD_REQUEST)
+        except MemberLookupFailed as e:
+            print(e)
+            return Response(
+                {"success": False, "message": "Member service unavailable, please try again."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
 
-        if not mbrcardno:
+        if not member:
             return Response({"success": False, "message": "Member not found."},
                             status=status.HTTP_404_NOT_FOUND)
+        mbrcardno = member["card_number"]
+        full_name = member["full_name"]
+        mobile_number = member["mobile_number"]
 
         try:
-            feedback_obj = models.HRFeedback.objects.get(card_number=mbrcardno)
+            feedback_obj = models.HRFeedback.objects.prefetch_related("entries").get(card_number=mbrcardno)
         except models.HRFeedback.DoesNotExist:
             return Response({"success": False,"candidate_name":full_name,"card_number":mbrcardno,"mobile_number":mobile_number,"company_name":request.user.business_name, "message": "No feedback found for this candidate."},
                             status=status.HTTP_400_BAD_REQUEST)
@@ -527,6 +599,7 @@ class HRFeedbackByBusinessAPIView(APIView):
     """
     authentication_classes = [SSOBusinessTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
         operation_description="Fetch all feedbacks submitted by the logged-in HR/business.",
@@ -563,18 +636,22 @@ class HRFeedbackByBusinessAPIView(APIView):
     def get(self, request):
         business_id = request.user.business_id
 
-        all_feedbacks = models.HRFeedback.objects.all()
-        filtered_feedbacks = []
+        entries = (
+            models.HRFeedbackEntry.objects.filter(business_id=business_id)
+            .select_related("candidate")
+            .order_by("card_number", "created_at")
+        )
 
-        for fb in all_feedbacks:
-            # Filter only feedbacks given by this business
-            my_feedbacks = [f for f in (fb.feedbacks or []) if f.get("business_id") == business_id]
-            if my_feedbacks:
+        # Group this business's entries per candidate
+        filtered_feedbacks = []
+        for entry in entries:
+            if not filtered_feedbacks or filtered_feedbacks[-1]["card_number"] != entry.card_number:
                 filtered_feedbacks.append({
-                    "card_number": fb.card_number,
-                    "candidate_name": fb.candidate_name,
-                    "feedbacks": my_feedbacks
+                    "card_number": entry.card_number,
+                    "candidate_name": entry.candidate.candidate_name,
+                    "feedbacks": []
                 })
+            filtered_feedbacks[-1]["feedbacks"].append(serializers.HRFeedbackEntrySerializer(entry).data)
 
         return Response({
             "success": True,
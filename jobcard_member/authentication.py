@@ -1,7 +1,7 @@
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 import requests
-from django.conf import settings
+from helpers.utils import verify_sso_token
 
 
 class SSOMemberTokenAuthentication(BaseAuthentication):
@@ -13,15 +13,10 @@ class SSOMemberTokenAuthentication(BaseAuthentication):
         token = auth_header.split("Token ")[1]
 
         try:
-            response = requests.post(
-                settings.AUTH_SERVER_URL + "/api/member/verify-token/",
-                json={"token": token},
-                timeout=5
-            )
-            if response.status_code != 200:
+            data = verify_sso_token("/api/member/verify-token/", token)
+            if data is None:
                 raise AuthenticationFailed("Invalid or expired token.")
 
-            data = response.json()
             user = AuthenticatedMemberUser(
                 id=data["user_id"],
                 mbrcardno=data["mbrcardno"],
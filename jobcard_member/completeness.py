@@ -0,0 +1,107 @@
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from .models import DocumentStatus, MbrDocuments
+
+ORDERINGS = {
+    "completeness": ("document_completeness_score", "id"),
+    "-completeness": ("-document_completeness_score", "-id"),
+}
+
+
+class InvalidDocumentFilter(ValueError):
+    pass
+
+
+def document_names(mask):
+    return [field for bit, field in enumerate(MbrDocuments.DOCUMENT_FIELDS) if mask & (1 << bit)]
+
+
+def refresh_verified(card_number):
+    """
+    Recompute the member's verified_mask and score from their current
+    document statuses. Call after anything that changes those statuses.
+    """
+    verified = (
+        DocumentStatus.objects.filter(card_number=card_number, request__isnull=True, status="verified")
+        .values_list("document_type", flat=True)
+    )
+    documents = MbrDocuments.objects.filter(card_number=card_number).only("pk", *MbrDocuments.DOCUMENT_FIELDS).first()
+    if documents is None:
+        return
+
+    documents.refresh_completeness(
+        MbrDocuments.document_mask(name for name in verified if name in MbrDocuments.DOCUMENT_FIELDS)
+    )
+    # update() keeps UpdatedAt as the member's last upload time
+    MbrDocuments.objects.filter(pk=documents.pk).update(
+        **{field: getattr(documents, field) for field in MbrDocuments.COMPLETENESS_FIELDS}
+    )
+
+
+def with_document_profile(queryset, card_field="member_card"):
+    """
+    Annotate each row with its member's document_present_mask,
+    document_verified_mask and document_completeness_score (0 when the
+    member has no documents row), looked up by `card_field`.
+    """
+    documents = MbrDocuments.objects.filter(card_number=OuterRef(card_field))
+    return queryset.annotate(**{
+        f"document_{field}": Coalesce(Subquery(documents.values(field)[:1]), 0)
+        for field in MbrDocuments.COMPLETENESS_FIELDS
+    })
+
+
+def _mask_param(value):
+    names = [name.strip() for name in (value or "").split(",") if name.strip()]
+    invalid = [name for name in names if name not in MbrDocuments.DOCUMENT_FIELDS]
+    if invalid:
+        raise InvalidDocumentFilter(f"Unknown document(s): {', '.join(invalid)}.")
+    return MbrDocuments.document_mask(names)
+
+
+def filter_by_documents(queryset, query_params, card_field="member_card"):
+    """
+    Annotate with the document profile and apply the optional filters:
+
+    - documents=Resume,GraduationCertificate: all of these uploaded
+    - verified_documents=...: all of these uploaded and verified
+    - min_completeness=0-100: completeness score at least this
+    - ordering=completeness or -completeness
+
+    Everything runs in SQL on the member's stored masks. The filters apply
+    to MbrDocuments' own columns, matched to the rows by card number, not
+    to the per-row profile annotations. Raises InvalidDocumentFilter for
+    unknown documents or a bad value.
+    """
+    documents = MbrDocuments.objects.all()
+    filtered = False
+
+    for param, column in (("documents", "present_mask"), ("verified_documents", "verified_mask")):
+        mask = _mask_param(query_params.get(param))
+        if mask:
+            alias = f"{column}_matched"
+            documents = documents.alias(**{alias: F(column).bitand(mask)}).filter(**{alias: mask})
+            filtered = True
+
+    min_completeness = query_params.get("min_completeness")
+    if min_completeness not in (None, ""):
+        try:
+            min_completeness = int(min_completeness)
+        except ValueError:
+            raise InvalidDocumentFilter("min_completeness must be a number from 0 to 100.")
+        # Members without documents score 0, so only a positive minimum filters
+        if min_completeness > 0:
+            documents = documents.filter(completeness_score__gte=min_completeness)
+            filtered = True
+
+    if filtered:
+        queryset = queryset.filter(**{f"{card_field}__in": documents.values("card_number")})
+    queryset = with_document_profile(queryset, card_field)
+
+    ordering = query_params.get("ordering")
+    if ordering:
+        if ordering not in ORDERINGS:
+            raise InvalidDocumentFilter(f"ordering must be one of: {', '.join(ORDERINGS)}.")
+        queryset = queryset.order_by(*ORDERINGS[ordering])
+
+    return queryset
@@ -0,0 +1,95 @@
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+from helpers.cache import document_sharing
+from .models import DocumentAccess, MbrDocuments
+
+KEY_SALT = "jobcard_member.DocumentAccess.pin"
+SHARED_DOCUMENTS_CACHE_TIMEOUT = getattr(settings, "SHARED_DOCUMENTS_CACHE_TIMEOUT", 60 * 5)
+PURGE_BATCH_SIZE = 1000
+
+
+class AccessExpired(Exception):
+    pass
+
+
+def hash_pin(token, pin):
+    return salted_hmac(KEY_SALT, f"{token}:{pin}", algorithm="sha256").hexdigest()
+
+
+def _cache_key(token):
+    return f"document-access:{token}"
+
+
+def create_access(member, selected_fields, pin, minutes):
+    access = DocumentAccess(
+        member=member,
+        selected_fields=selected_fields,
+        expiry_time=timezone.now() + timedelta(minutes=minutes),
+    )
+    access.pin_hash = hash_pin(access.token, pin)
+    access.save()
+    return access
+
+
+def _load_grant(token):
+    """
+    The grant with only its selected document columns, as a plain dict.
+    """
+    access = (
+        DocumentAccess.objects.filter(token=token)
+        .only("member_id", "selected_fields", "pin_hash", "expiry_time")
+        .first()
+    )
+    if access is None:
+        return None
+
+    fields = [field for field in access.selected_fields if field in MbrDocuments.DOCUMENT_FIELDS]
+    documents = MbrDocuments.objects.filter(pk=access.member_id).values(*fields).first() or {}
+    return {
+        "pin_hash": access.pin_hash,
+        "expiry_time": access.expiry_time,
+        "documents": {field: documents.get(field) for field in fields},
+    }
+
+
+def get_shared_documents(token, pin):
+    """
+    The shared documents for a valid token and PIN, or None when either is
+    wrong. Raises AccessExpired for an expired grant. Grants are cached for
+    at most SHARED_DOCUMENTS_CACHE_TIMEOUT and never beyond their expiry, so
+    repeated views skip the database.
+    """
+    if not token or pin is None:
+        return None
+
+    grant = document_sharing.get(_cache_key(token))
+    if grant is None:
+        grant = _load_grant(token)
+        if grant is None:
+            return None
+        remaining = (grant["expiry_time"] - timezone.now()).total_seconds()
+        if remaining > 0:
+            document_sharing.set(_cache_key(token), grant, min(SHARED_DOCUMENTS_CACHE_TIMEOUT, int(remaining) + 1))
+
+    if not constant_time_compare(grant["pin_hash"], hash_pin(token, str(pin))):
+        return None
+    if grant["expiry_time"] <= timezone.now():
+        raise AccessExpired()
+    return grant["documents"]
+
+
+def purge_expired_access(batch_size=PURGE_BATCH_SIZE):
+    """
+    Delete expired grants in batches of `batch_size` so no single statement
+    holds locks for long. Returns the number deleted.
+    """
+    now = timezone.now()
+    deleted = 0
+    while True:
+        ids = list(DocumentAccess.objects.filter(expiry_time__lt=now).values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        DocumentAccess.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
@@ -0,0 +1,176 @@
+from django.db import transaction
+from django.db.models import Case, CharField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from jobcard_admin.audit import record_status_change
+from .completeness import refresh_verified
+from .models import DocumentStatus, DocumentVerificationRequest, MbrDocuments
+from .verification_queue import finish_if_complete
+
+STATUSES = {value for value, _ in DocumentStatus.STATUS_CHOICES}
+
+
+class InvalidDocumentStatus(ValueError):
+    pass
+
+
+def member_document_status(card_number):
+    """
+    {document_type: status} for the member, i.e. the MbrDocuments `document_status` view.
+    """
+    return dict(
+        DocumentStatus.objects.filter(card_number=card_number, request__isnull=True)
+        .values_list("document_type", "status")
+    )
+
+
+def members_document_status(card_numbers):
+    """
+    {card_number: {document_type: status}} for several members from one
+    query. Members without any status get an empty dict.
+    """
+    result = {card_number: {} for card_number in card_numbers}
+    rows = DocumentStatus.objects.filter(card_number__in=list(result), request__isnull=True).values_list(
+        "card_number", "document_type", "status"
+    )
+    for card_number, document_type, status in rows:
+        result[card_number][document_type] = status
+    return result
+
+
+def request_documents(doc_request):
+    """
+    {document_type: status} for one verification request. Uses the prefetched
+    `document_statuses` when available.
+    """
+    return {row.document_type: row.status for row in doc_request.document_statuses.all()}
+
+
+def requested_documents_with_files(card_number, request_ids):
+    """
+    {request_id: {document_type: {"file", "status"}}} for the given requests
+    of one member, from a single query. Each row carries only its own file
+    column from MbrDocuments and the member's current status for it.
+    """
+    documents = MbrDocuments.objects.filter(card_number=card_number)
+    member_status = DocumentStatus.objects.filter(
+        card_number=card_number, request__isnull=True, document_type=OuterRef("document_type")
+    ).values("status")[:1]
+
+    rows = (
+        DocumentStatus.objects.filter(request_id__in=request_ids)
+        .annotate(
+            file=Case(
+                *[
+                    When(document_type=field, then=Subquery(documents.values(field)[:1]))
+                    for field in MbrDocuments.DOCUMENT_FIELDS
+                ],
+                output_field=CharField(),
+            ),
+            member_status=Coalesce(Subquery(member_status), Value("pending")),
+        )
+        .order_by("request_id", "id")
+        .values_list("request_id", "document_type", "file", "member_status")
+    )
+
+    result = {request_id: {} for request_id in request_ids}
+    for request_id, document_type, file, member_status in rows:
+        result[request_id][document_type] = {"file": file, "status": member_status}
+    return result
+
+
+def _check(documents):
+    invalid = [name for name in documents if name not in MbrDocuments.DOCUMENT_FIELDS]
+    if invalid:
+        raise InvalidDocumentStatus(f"Unknown document(s): {', '.join(map(str, invalid))}.")
+    invalid = [status for status in documents.values() if status not in STATUSES]
+    if invalid:
+        raise InvalidDocumentStatus(f"Status must be one of: {', '.join(sorted(STATUSES))}.")
+
+
+def mark_uploaded(card_number, uploaded):
+    """
+    Set the member's uploaded documents back to pending, give every other
+    tracked document a pending row if it has none yet, and drop re-uploaded
+    documents from the member's verified profile. The verified mask is
+    recomputed only once the status rows are written, in the same
+    transaction as the caller's document save.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        # Rows that exist already, or are created concurrently, are left to the update below
+        DocumentStatus.objects.bulk_create([
+            DocumentStatus(card_number=card_number, document_type=name, status="pending", created_at=now)
+            for name in MbrDocuments.DOCUMENT_FIELDS
+        ], ignore_conflicts=True)
+
+        if uploaded:
+            DocumentStatus.objects.filter(
+                card_number=card_number, request__isnull=True, document_type__in=list(uploaded)
+            ).update(status="pending", updated_at=now)
+            refresh_verified(card_number)
+
+
+def create_verification_request(card_number, requested_by, documents):
+    """
+    Create a verification request with one status row per requested document.
+    `documents` is a {document_type: status} dict or a list of document types.
+    """
+    if isinstance(documents, list):
+        documents = {name: "pending" for name in documents}
+    if not isinstance(documents, dict) or not documents:
+        raise InvalidDocumentStatus("documents must be a non-empty object or list.")
+    _check(documents)
+
+    with transaction.atomic():
+        doc_request = DocumentVerificationRequest.objects.create(card_number=card_number, requested_by=requested_by)
+        DocumentStatus.objects.bulk_create([
+            DocumentStatus(
+                card_number=card_number, document_type=name, status=status,
+                request=doc_request, created_at=doc_request.created_at,
+            )
+            for name, status in documents.items()
+        ])
+    return doc_request, documents
+
+
+def set_document_status(doc_request, document_type, status, actor_id=None):
+    """
+    Set one document's status on the request and on the member's current
+    status, closing the request once all its documents are decided, and
+    record the change in the status history. Returns the member's
+    {document_type: status}.
+    """
+    _check({document_type: status})
+    now = timezone.now()
+
+    with transaction.atomic():
+        # Lock the request's row and the member's row for this document, then write both
+        rows = DocumentStatus.objects.filter(card_number=doc_request.card_number, document_type=document_type).filter(
+            Q(request_id=doc_request.id) | Q(request__isnull=True)
+        )
+        found = dict(rows.select_for_update().values_list("request_id", "status"))
+
+        # A concurrent request may create a missing row first; its insert wins and the update covers both
+        missing = [request_id for request_id in (doc_request.id, None) if request_id not in found]
+        if missing:
+            DocumentStatus.objects.bulk_create([
+                DocumentStatus(
+                    card_number=doc_request.card_number, document_type=document_type, status=status,
+                    request_id=request_id, created_at=now,
+                )
+                for request_id in missing
+            ], ignore_conflicts=True)
+        rows.update(status=status, updated_at=now)
+
+        # Closes the request and ends its lease once every document is decided
+        if not finish_if_complete(doc_request):
+            DocumentVerificationRequest.objects.filter(id=doc_request.id).update(updated_at=now)
+
+        refresh_verified(doc_request.card_number)
+        record_status_change(
+            "document", doc_request.id, found.get(doc_request.id), status,
+            actor_id=actor_id, card_number=doc_request.card_number, document_type=document_type,
+        )
+
+    return member_document_status(doc_request.card_number)
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from helpers.resume import RESUME_METADATA_FIELDS, set_resume_metadata
+from jobcard_business.models import JobApplication
+from jobcard_member.models import MbrDocuments
+
+
+class Command(BaseCommand):
+    help = "Compute the stored resume metadata (has_resume, resume_name, resume_extension) for existing rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def backfill(self, model, resume_field, batch_size):
+        updated = 0
+        batch = []
+        for instance in model.objects.only("pk", resume_field, *RESUME_METADATA_FIELDS).iterator(chunk_size=batch_size):
+            before = tuple(getattr(instance, field) for field in RESUME_METADATA_FIELDS)
+            set_resume_metadata(instance, getattr(instance, resume_field))
+            if tuple(getattr(instance, field) for field in RESUME_METADATA_FIELDS) != before:
+                batch.append(instance)
+            if len(batch) >= batch_size:
+                model.objects.bulk_update(batch, RESUME_METADATA_FIELDS)
+                updated += len(batch)
+                batch = []
+        model.objects.bulk_update(batch, RESUME_METADATA_FIELDS)
+        return updated + len(batch)
+
+    def handle(self, *args, **options):
+        documents = self.backfill(MbrDocuments, "Resume", options["batch_size"])
+        applications = self.backfill(JobApplication, "resume", options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated {documents} member document row(s) and {applications} application(s)."
+        ))
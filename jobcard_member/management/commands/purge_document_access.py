@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from jobcard_member.document_sharing import PURGE_BATCH_SIZE, purge_expired_access
+
+
+class Command(BaseCommand):
+    help = "Delete expired document share grants in batches. Meant to run periodically (e.g. from cron)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_access(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired share grant(s)."))
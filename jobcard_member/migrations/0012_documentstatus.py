@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:13
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_member', '0011_rename_twelfthcertificate_mbrdocuments_twelthcertificate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('card_number', models.BigIntegerField(verbose_name='Member Card Number')),
+                ('document_type', models.CharField(choices=[('TenthCertificate', 'TenthCertificate'), ('TwelthCertificate', 'TwelthCertificate'), ('GraduationCertificate', 'GraduationCertificate'), ('GraduationMarksheet', 'GraduationMarksheet'), ('PgCertificate', 'PgCertificate'), ('UpskillCertificate', 'UpskillCertificate'), ('ItiCertificate', 'ItiCertificate'), ('ItiMarksheet', 'ItiMarksheet'), ('DiplomaCertificate', 'DiplomaCertificate'), ('DiplomaMarksheet', 'DiplomaMarksheet'), ('CoverLetter', 'CoverLetter'), ('AdharcardVoterid', 'AdharcardVoterid'), ('LinkedinUrl', 'LinkedinUrl'), ('GithubUrl', 'GithubUrl'), ('OtherLink', 'OtherLink'), ('Resume', 'Resume')], max_length=50)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('verified', 'Verified'), ('rejected', 'Rejected')], default='pending', max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='document_statuses', to='jobcard_member.documentverificationrequest')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'document_type', 'created_at'], name='jobcard_mem_status_cdaf3e_idx'), models.Index(fields=['card_number', 'document_type'], name='jobcard_mem_card_nu_1b48d0_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('request__isnull', True)), fields=('card_number', 'document_type'), name='unique_member_document_status'), models.UniqueConstraint(condition=models.Q(('request__isnull', False)), fields=('request', 'document_type'), name='unique_request_document_status')],
+            },
+        ),
+    ]
@@ -0,0 +1,81 @@
+from django.db import migrations
+
+DOCUMENT_FIELDS = [
+    "TenthCertificate", "TwelthCertificate", "GraduationCertificate", "GraduationMarksheet",
+    "PgCertificate", "UpskillCertificate", "ItiCertificate", "ItiMarksheet",
+    "DiplomaCertificate", "DiplomaMarksheet", "CoverLetter", "AdharcardVoterid",
+    "LinkedinUrl", "GithubUrl", "OtherLink", "Resume",
+]
+STATUSES = {"pending", "processing", "verified", "rejected"}
+
+
+def _statuses(value):
+    """
+    (document_type, status) pairs from a JSON status map; lists of names count as pending.
+    """
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = ((name, "pending") for name in value)
+    else:
+        items = ()
+    for name, status in items:
+        if name in DOCUMENT_FIELDS:
+            yield name, status if status in STATUSES else "pending"
+
+
+def forwards(apps, schema_editor):
+    MbrDocuments = apps.get_model('jobcard_member', 'MbrDocuments')
+    DocumentVerificationRequest = apps.get_model('jobcard_member', 'DocumentVerificationRequest')
+    DocumentStatus = apps.get_model('jobcard_member', 'DocumentStatus')
+
+    batch = []
+    for documents in MbrDocuments.objects.exclude(card_number__isnull=True).iterator(chunk_size=500):
+        for name, status in _statuses(documents.document_status):
+            batch.append(DocumentStatus(
+                card_number=documents.card_number, document_type=name, status=status,
+                created_at=documents.UpdatedAt or documents.CreatedAt,
+            ))
+        if len(batch) >= 1000:
+            DocumentStatus.objects.bulk_create(batch)
+            batch = []
+
+    for doc_request in DocumentVerificationRequest.objects.all().iterator(chunk_size=500):
+        for name, status in _statuses(doc_request.documents):
+            batch.append(DocumentStatus(
+                card_number=doc_request.card_number, document_type=name, status=status,
+                request_id=doc_request.id, created_at=doc_request.created_at,
+            ))
+        if len(batch) >= 1000:
+            DocumentStatus.objects.bulk_create(batch)
+            batch = []
+    DocumentStatus.objects.bulk_create(batch)
+
+
+def backwards(apps, schema_editor):
+    MbrDocuments = apps.get_model('jobcard_member', 'MbrDocuments')
+    DocumentVerificationRequest = apps.get_model('jobcard_member', 'DocumentVerificationRequest')
+    DocumentStatus = apps.get_model('jobcard_member', 'DocumentStatus')
+
+    member_statuses, request_statuses = {}, {}
+    for row in DocumentStatus.objects.values('card_number', 'request_id', 'document_type', 'status').iterator():
+        if row['request_id'] is None:
+            member_statuses.setdefault(row['card_number'], {})[row['document_type']] = row['status']
+        else:
+            request_statuses.setdefault(row['request_id'], {})[row['document_type']] = row['status']
+
+    for card_number, statuses in member_statuses.items():
+        MbrDocuments.objects.filter(card_number=card_number).update(document_status=statuses)
+    for request_id, statuses in request_statuses.items():
+        DocumentVerificationRequest.objects.filter(id=request_id).update(documents=statuses)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_member', '0012_documentstatus'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
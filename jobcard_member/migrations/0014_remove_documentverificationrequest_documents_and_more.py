@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:13
+
+from django.db import migrations
+
+
+def restore_statuses(apps, schema_editor):
+    """
+    Unapplying: refill the `document_status` and `documents` JSON columns
+    from DocumentStatus, including statuses written since 0013 copied them.
+    """
+    MbrDocuments = apps.get_model('jobcard_member', 'MbrDocuments')
+    DocumentVerificationRequest = apps.get_model('jobcard_member', 'DocumentVerificationRequest')
+    DocumentStatus = apps.get_model('jobcard_member', 'DocumentStatus')
+
+    member_statuses, request_statuses = {}, {}
+    for row in DocumentStatus.objects.values('card_number', 'request_id', 'document_type', 'status').iterator():
+        if row['request_id'] is None:
+            member_statuses.setdefault(row['card_number'], {})[row['document_type']] = row['status']
+        else:
+            request_statuses.setdefault(row['request_id'], {})[row['document_type']] = row['status']
+
+    for card_number, statuses in member_statuses.items():
+        MbrDocuments.objects.filter(card_number=card_number).update(document_status=statuses)
+    for request_id, statuses in request_statuses.items():
+        DocumentVerificationRequest.objects.filter(id=request_id).update(documents=statuses)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_member', '0013_backfill_documentstatus'),
+    ]
+
+    operations = [
+        # 0013 copied both columns into DocumentStatus; unapplying refills them from there
+        migrations.RunPython(migrations.RunPython.noop, restore_statuses),
+        migrations.RemoveField(
+            model_name='documentverificationrequest',
+            name='documents',
+        ),
+        migrations.RemoveField(
+            model_name='mbrdocuments',
+            name='document_status',
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_member', '0014_remove_documentverificationrequest_documents_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentverificationrequest',
+            name='claimed_by',
+            field=models.IntegerField(blank=True, null=True, verbose_name='Staff user ID'),
+        ),
+        migrations.AddField(
+            model_name='documentverificationrequest',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='documentverificationrequest',
+            index=models.Index(fields=['status', 'lease_expires_at', 'created_at'], name='jobcard_mem_status_b92496_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documentverificationrequest',
+            index=models.Index(fields=['claimed_by', 'status'], name='jobcard_mem_claimed_e77606_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_member', '0015_documentverificationrequest_lease'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentaccess',
+            name='token',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='documentaccess',
+            name='pin_hash',
+            field=models.CharField(default='', max_length=64),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name='documentaccess',
+            name='expiry_time',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
@@ -0,0 +1,26 @@
+import secrets
+from django.db import migrations
+from django.utils.crypto import salted_hmac
+
+# Same as jobcard_member.document_sharing.hash_pin
+KEY_SALT = "jobcard_member.DocumentAccess.pin"
+
+
+def forwards(apps, schema_editor):
+    DocumentAccess = apps.get_model('jobcard_member', 'DocumentAccess')
+
+    for access in DocumentAccess.objects.filter(token__isnull=True).iterator(chunk_size=500):
+        access.token = secrets.token_urlsafe(32)
+        access.pin_hash = salted_hmac(KEY_SALT, f"{access.token}:{access.pin}", algorithm="sha256").hexdigest()
+        access.save(update_fields=['token', 'pin_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_member', '0016_documentaccess_token_pin_hash'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:20
+
+import jobcard_member.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_member', '0017_backfill_documentaccess_token'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='documentaccess',
+            name='token',
+            field=models.CharField(default=jobcard_member.models.generate_access_token, max_length=64, unique=True),
+        ),
+        migrations.RemoveField(
+            model_name='documentaccess',
+            name='pin',
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-19 18:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_member', '0019_resume_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mbrdocuments',
+            name='completeness_score',
+            field=models.PositiveSmallIntegerField(db_index=True, default=0, help_text='0-100'),
+        ),
+        migrations.AddField(
+            model_name='mbrdocuments',
+            name='present_mask',
+            field=models.PositiveIntegerField(default=0, help_text='Documents uploaded'),
+        ),
+        migrations.AddField(
+            model_name='mbrdocuments',
+            name='verified_mask',
+            field=models.PositiveIntegerField(default=0, help_text='Documents uploaded and verified'),
+        ),
+        migrations.AddIndex(
+            model_name='mbrdocuments',
+            index=models.Index(fields=['verified_mask', 'present_mask'], name='jobcard_mem_verifie_b3d435_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations
+
+# Bit order of MbrDocuments.DOCUMENT_FIELDS at the time of this migration
+DOCUMENT_FIELDS = [
+    "TenthCertificate", "TwelthCertificate", "GraduationCertificate", "GraduationMarksheet",
+    "PgCertificate", "UpskillCertificate", "ItiCertificate", "ItiMarksheet",
+    "DiplomaCertificate", "DiplomaMarksheet", "CoverLetter", "AdharcardVoterid",
+    "LinkedinUrl", "GithubUrl", "OtherLink", "Resume",
+]
+
+
+def _mask(names):
+    mask = 0
+    for name in names:
+        mask |= 1 << DOCUMENT_FIELDS.index(name)
+    return mask
+
+
+def forwards(apps, schema_editor):
+    MbrDocuments = apps.get_model('jobcard_member', 'MbrDocuments')
+    DocumentStatus = apps.get_model('jobcard_member', 'DocumentStatus')
+
+    verified = {}
+    rows = DocumentStatus.objects.filter(
+        request__isnull=True, status="verified", document_type__in=DOCUMENT_FIELDS
+    ).values_list("card_number", "document_type")
+    for card_number, document_type in rows.iterator(chunk_size=2000):
+        verified.setdefault(card_number, set()).add(document_type)
+
+    batch = []
+    for documents in MbrDocuments.objects.only("pk", "card_number", *DOCUMENT_FIELDS).iterator(chunk_size=500):
+        present_mask = _mask(name for name in DOCUMENT_FIELDS if (getattr(documents, name) or "").strip())
+        verified_mask = _mask(verified.get(documents.card_number, ())) & present_mask
+        documents.present_mask = present_mask
+        documents.verified_mask = verified_mask
+        documents.completeness_score = round(
+            100 * (bin(present_mask).count("1") + bin(verified_mask).count("1")) / (2 * len(DOCUMENT_FIELDS))
+        )
+        batch.append(documents)
+        if len(batch) >= 500:
+            MbrDocuments.objects.bulk_update(batch, ["present_mask", "verified_mask", "completeness_score"])
+            batch = []
+    MbrDocuments.objects.bulk_update(batch, ["present_mask", "verified_mask", "completeness_score"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_member', '0020_mbrdocuments_completeness'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
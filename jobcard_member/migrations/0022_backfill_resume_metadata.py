@@ -0,0 +1,42 @@
+import os
+from urllib.parse import urlparse
+from django.db import migrations
+
+FIELDS = ["has_resume", "resume_name", "resume_extension"]
+
+
+def _metadata(resume_url):
+    # helpers.resume.resume_metadata at the time of this migration
+    if not resume_url or not resume_url.strip():
+        return False, None, None
+    try:
+        full_filename = os.path.basename(urlparse(resume_url.strip()).path)
+    except ValueError:
+        return True, None, None
+    extension = os.path.splitext(full_filename)[1].lstrip(".").lower()[:16] or None
+    return True, full_filename[-15:], extension
+
+
+def forwards(apps, schema_editor):
+    MbrDocuments = apps.get_model('jobcard_member', 'MbrDocuments')
+
+    batch = []
+    rows = MbrDocuments.objects.exclude(Resume__isnull=True).exclude(Resume="").only("pk", "Resume")
+    for instance in rows.iterator(chunk_size=500):
+        instance.has_resume, instance.resume_name, instance.resume_extension = _metadata(instance.Resume)
+        batch.append(instance)
+        if len(batch) >= 500:
+            MbrDocuments.objects.bulk_update(batch, FIELDS)
+            batch = []
+    MbrDocuments.objects.bulk_update(batch, FIELDS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_member', '0021_backfill_completeness'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-19 19:01
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobcard_member', '0022_backfill_resume_metadata'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='mbrdocuments',
+            name='jobcard_mem_verifie_b3d435_idx',
+        ),
+    ]
@@ -1,8 +1,32 @@
+import secrets
 from django.db import models
+from helpers.resume import (
+    RESUME_EXTENSION_LENGTH, RESUME_NAME_LENGTH, set_resume_metadata, with_resume_metadata_fields,
+)
 from django.utils import timezone
 from datetime import timedelta
 
 class MbrDocuments(models.Model):
+    # Actual documents, tracked individually in document_status.
+    # The position is the document's bit in present_mask/verified_mask: only append.
+    DOCUMENT_FIELDS = [
+        "TenthCertificate",
+        "TwelthCertificate",
+        "GraduationCertificate",
+        "GraduationMarksheet",
+        "PgCertificate",
+        "UpskillCertificate",
+        "ItiCertificate",
+        "ItiMarksheet",
+        "DiplomaCertificate",
+        "DiplomaMarksheet",
+        "CoverLetter",
+        "AdharcardVoterid",
+        "LinkedinUrl",
+        "GithubUrl",
+        "OtherLink",
+        "Resume"
+    ]
 
     card_number = models.BigIntegerField(unique=True, verbose_name="Member Card Number", null=True, blank=True)
     TenthCertificate = models.TextField(blank=True, null=True)
@@ -17,26 +41,70 @@ class MbrDocuments(models.Model):
     DiplomaMarksheet = models.TextField(blank=True, null=True)
     CoverLetter = models.TextField(blank=True, null=True)
     Resume = models.TextField(blank=True, null=True)
-    # Status field
-    document_status = models.JSONField(
-        default=dict,
-        help_text="Store status of each document individually, e.g., {'Resume': 'verified', 'TenthCertificate': 'pending'}"
-    )
+    # Derived from Resume on save
+    has_resume = models.BooleanField(default=False)
+    resume_name = models.CharField(max_length=RESUME_NAME_LENGTH, blank=True, null=True)
+    resume_extension = models.CharField(max_length=RESUME_EXTENSION_LENGTH, blank=True, null=True)
     # Links
     AdharcardVoterid = models.TextField(blank=True, null=True)
     LinkedinUrl = models.URLField(blank=True, null=True)
     GithubUrl = models.URLField(blank=True, null=True)
     OtherLink = models.URLField(blank=True, null=True)
 
+    # Completeness profile: one bit per DOCUMENT_FIELDS entry
+    present_mask = models.PositiveIntegerField(default=0, help_text="Documents uploaded")
+    verified_mask = models.PositiveIntegerField(default=0, help_text="Documents uploaded and verified")
+    completeness_score = models.PositiveSmallIntegerField(default=0, db_index=True, help_text="0-100")
+
     CreatedAt = models.DateTimeField(auto_now_add=True)
     UpdatedAt = models.DateTimeField(auto_now=True)
+
+    COMPLETENESS_FIELDS = ("present_mask", "verified_mask", "completeness_score")
+
+    @classmethod
+    def document_mask(cls, document_types):
+        mask = 0
+        for document_type in document_types:
+            mask |= 1 << cls.DOCUMENT_FIELDS.index(document_type)
+        return mask
+
+    @classmethod
+    def score(cls, present_mask, verified_mask):
+        """
+        0-100: half for uploading every document, half for having them all verified.
+        """
+        total = 2 * len(cls.DOCUMENT_FIELDS)
+        return round(100 * (bin(present_mask).count("1") + bin(verified_mask).count("1")) / total)
+
+    def refresh_completeness(self, verified_mask=None):
+        self.present_mask = self.document_mask(
+            field for field in self.DOCUMENT_FIELDS if (getattr(self, field) or "").strip()
+        )
+        if verified_mask is not None:
+            self.verified_mask = verified_mask
+        self.verified_mask &= self.present_mask
+        self.completeness_score = self.score(self.present_mask, self.verified_mask)
+
+    def save(self, *args, **kwargs):
+        set_resume_metadata(self, self.Resume)
+        self.refresh_completeness()
+        update_fields = with_resume_metadata_fields(kwargs.get("update_fields"), "Resume")
+        if update_fields is not None and set(update_fields) & set(self.DOCUMENT_FIELDS):
+            update_fields = {*update_fields, *self.COMPLETENESS_FIELDS}
+        kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
     
     
+def generate_access_token():
+    return secrets.token_urlsafe(32)
+
+
 class DocumentAccess(models.Model):
     member = models.ForeignKey(MbrDocuments, on_delete=models.CASCADE)
+    token = models.CharField(max_length=64, unique=True, default=generate_access_token)  # opaque share link id
     selected_fields = models.JSONField()  # Store field names selected
-    pin = models.CharField(max_length=10)
-    expiry_time = models.DateTimeField()
+    pin_hash = models.CharField(max_length=64)  # HMAC of token and PIN, see document_sharing.hash_pin
+    expiry_time = models.DateTimeField(db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def is_valid(self):
@@ -54,13 +122,64 @@ class DocumentVerificationRequest(models.Model):
 
     card_number = models.BigIntegerField(verbose_name="Member Card Number")
     requested_by = models.IntegerField(verbose_name="Business/HR ID")  # HR or business requesting
-    documents = models.JSONField(
-        default=dict,
-        help_text="List of documents requested for verification with initial status, e.g., {'Resume': 'pending', 'TenthCertificate': 'pending'}"
-    )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    # Work queue lease: the staff user verifying this request and until when
+    claimed_by = models.IntegerField(null=True, blank=True, verbose_name="Staff user ID")
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "lease_expires_at", "created_at"]),
+            models.Index(fields=["claimed_by", "status"]),
+        ]
+
     def __str__(self):
         return f"{self.card_number} requested by {self.requested_by}"
+
+    def is_leased_to_other(self, staff_id, now=None):
+        return (
+            self.claimed_by is not None
+            and self.claimed_by != staff_id
+            and self.lease_expires_at is not None
+            and self.lease_expires_at > (now or timezone.now())
+        )
+
+
+class DocumentStatus(models.Model):
+    """
+    Verification status of one document. Rows without a request hold the
+    member's current status per document (shown as MbrDocuments
+    `document_status`); rows with a request hold that request's documents.
+    """
+    STATUS_CHOICES = DocumentVerificationRequest.STATUS_CHOICES
+    DOCUMENT_TYPE_CHOICES = [(field, field) for field in MbrDocuments.DOCUMENT_FIELDS]
+
+    card_number = models.BigIntegerField(verbose_name="Member Card Number")
+    document_type = models.CharField(max_length=50, choices=DOCUMENT_TYPE_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    request = models.ForeignKey(
+        DocumentVerificationRequest, on_delete=models.CASCADE, null=True, blank=True, related_name="document_statuses"
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["card_number", "document_type"], condition=models.Q(request__isnull=True),
+                name="unique_member_document_status",
+            ),
+            models.UniqueConstraint(
+                fields=["request", "document_type"], condition=models.Q(request__isnull=False),
+                name="unique_request_document_status",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["status", "document_type", "created_at"]),
+            models.Index(fields=["card_number", "document_type"]),
+        ]
+
+    def __str__(self):
+        return f"{self.card_number} {self.document_type}: {self.status}"
@@ -1,12 +1,32 @@
+from django.db.models.manager import BaseManager
+from drf_yasg import openapi
 from rest_framework import serializers
 from .models import MbrDocuments
+from .completeness import document_names
+from .document_status import member_document_status
 from jobcard_business.models import JobApplication, Job, Feedback
-from helpers.utils import get_member_details_by_card
+from helpers.utils import get_member_details_by_card, get_members_details_by_cards
 class MbrDocumentsSerializer(serializers.ModelSerializer):
+    """
+    Pass the statuses of all rows as the `document_status` context, from
+    members_document_status(), when serializing many; otherwise each row
+    looks its own up.
+    """
+    document_status = serializers.SerializerMethodField()
+
     class Meta:
         model = MbrDocuments
         fields = '__all__'
-        read_only_fields = ["card_number"]
+        read_only_fields = [
+            "card_number", "has_resume", "resume_name", "resume_extension",
+            "present_mask", "verified_mask", "completeness_score",
+        ]
+
+    def get_document_status(self, obj):
+        statuses = self.context.get("document_status")
+        if statuses is not None:
+            return statuses.get(obj.card_number, {})
+        return member_document_status(obj.card_number)
 
 
 class JobApplicationCreateSerializer(serializers.Serializer):
@@ -15,12 +35,44 @@ class JobApplicationCreateSerializer(serializers.Serializer):
     institute_id = serializers.CharField(max_length=6, allow_blank=True, required=False)
     cover_letter = serializers.CharField(allow_blank=True, required=False)
 
-class JobApplicationListSerializer(serializers.ModelSerializer):
+class MemberDetailsListSerializer(serializers.ListSerializer):
+    """
+    Looks up the members of all rows in one batch before serializing them,
+    instead of one auth server call per row.
+    """
+    def to_representation(self, data):
+        rows = list(data.all() if isinstance(data, BaseManager) else data)
+        self.child.members = get_members_details_by_cards(row.member_card for row in rows)
+        return super().to_representation(rows)
+
+
+class MemberDetailsSerializerMixin(serializers.Serializer):
+    """
+    full_name and email of the row's member (`member_card`). Set
+    `list_serializer_class = MemberDetailsListSerializer` in Meta so lists
+    fetch them all at once.
+    """
+    full_name = serializers.SerializerMethodField()
+    email = serializers.SerializerMethodField()
+
+    members = None
+
+    def member_details(self, obj):
+        if self.members is not None and obj.member_card in self.members:
+            return self.members[obj.member_card] or {}
+        return get_member_details_by_card(obj.member_card) or {}
+
+    def get_full_name(self, obj):
+        return self.member_details(obj).get('full_name')
+
+    def get_email(self, obj):
+        return self.member_details(obj).get('email')
+
+
+class JobApplicationListSerializer(MemberDetailsSerializerMixin, serializers.ModelSerializer):
     job_title = serializers.CharField(source='job.title', read_only=True)
     company_name = serializers.CharField(source='job.company_name', read_only=True)
     job_id = serializers.IntegerField(source='job.id', read_only=True)
-    full_name = serializers.SerializerMethodField()
-    email = serializers.SerializerMethodField()
 
     class Meta:
         model = JobApplication
@@ -29,34 +81,59 @@ class JobApplicationListSerializer(serializers.ModelSerializer):
             'full_name', 'email','resume', 'cover_letter', 'status', 'applied_at',
             
         ]
+        list_serializer_class = MemberDetailsListSerializer
 
-    def get_full_name(self, obj):
-         
-        member_card = obj.member_card
-        try:
-            member_data = get_member_details_by_card(member_card)
-            return member_data.get('full_name')
-        except Exception:
-            return None
 
-    def get_email(self, obj):
-          # Replace with actual path
-        member_card = obj.member_card
-        try:
-            member_data = get_member_details_by_card(member_card)
-            return member_data.get('email')
-        except Exception:
-            return None
 
 
 
 
+class DocumentProfileSerializerMixin(serializers.Serializer):
+    """
+    Document profile of rows annotated by completeness.with_document_profile.
+    """
+    completeness_score = serializers.IntegerField(source="document_completeness_score", read_only=True)
+    uploaded_documents = serializers.SerializerMethodField()
+    verified_documents = serializers.SerializerMethodField()
+
+    PROFILE_FIELDS = ["completeness_score", "uploaded_documents", "verified_documents"]
+
+    def get_uploaded_documents(self, obj):
+        return document_names(getattr(obj, "document_present_mask", 0))
+
+    def get_verified_documents(self, obj):
+        return document_names(getattr(obj, "document_verified_mask", 0))
+
+
+class ApplicantListSerializer(DocumentProfileSerializerMixin, JobApplicationListSerializer):
+    class Meta(JobApplicationListSerializer.Meta):
+        fields = JobApplicationListSerializer.Meta.fields + DocumentProfileSerializerMixin.PROFILE_FIELDS
+
+
+DOCUMENT_FILTER_PARAMETERS = [
+    openapi.Parameter(
+        "documents", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+        description="Comma separated documents the applicant must have uploaded, e.g. Resume,GraduationCertificate",
+    ),
+    openapi.Parameter(
+        "verified_documents", openapi.IN_QUERY, type=openapi.TYPE_STRING,
+        description="Comma separated documents that must be uploaded and verified",
+    ),
+    openapi.Parameter(
+        "min_completeness", openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+        description="Minimum document completeness score (0-100)",
+    ),
+    openapi.Parameter(
+        "ordering", openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=["completeness", "-completeness"],
+        description="Sort by document completeness score",
+    ),
+]
 
 
 class DocumentShareSerializer(serializers.Serializer):
-    selected_fields = serializers.ListField(child=serializers.CharField())
-    pin = serializers.CharField()
-    access_time_minutes = serializers.IntegerField()
+    selected_fields = serializers.ListField(child=serializers.ChoiceField(choices=MbrDocuments.DOCUMENT_FIELDS), allow_empty=False)
+    pin = serializers.CharField(max_length=10)
+    access_time_minutes = serializers.IntegerField(min_value=1)
     
     
     
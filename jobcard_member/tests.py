@@ -1,3 +1,291 @@
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import AnonymousUser
+from django.db import DatabaseError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from helpers.testing import (
+    MEMBER_CARD, EndpointBudgetTestCase, member_card, seed_applications, seed_jobs, seed_members,
+)
+from helpers.idempotency import idempotent_response
+from jobcard_admin.models import IdempotencyKey
+from jobcard_business.authentication import AuthenticatedBusinessUser
+from jobcard_business.models import JobApplication
+from jobcard_member.completeness import InvalidDocumentFilter, filter_by_documents
+from jobcard_member.document_status import (
+    create_verification_request, mark_uploaded, members_document_status, set_document_status,
+)
+from jobcard_member.models import DocumentStatus, MbrDocuments
+from jobcard_member.serializers import MbrDocumentsSerializer
 
-# Create your tests here.
+
+class MemberEndpointBudgetTests(EndpointBudgetTestCase):
+    """
+    Queries and auth server calls per request stay fixed however many jobs
+    and applications there are.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.jobs = seed_jobs(2)
+        seed_applications(self.jobs, 3)
+        seed_members(3)
+        self.more = 0
+
+    def grow(self):
+        self.more += 1
+        jobs = seed_jobs(5, start=self.more * 100)
+        seed_applications(jobs, 4)
+
+    def test_documents(self):
+        self.assertScalesFlat("get", "/member/documents/", "member-token", 2, 1, self.grow)
+
+    def test_document_statuses_come_from_serializer_context(self):
+        mark_uploaded(member_card(1), {})
+        documents = list(MbrDocuments.objects.order_by("card_number"))
+        with self.assertNumQueries(1):
+            statuses = members_document_status({document.card_number for document in documents})
+            data = MbrDocumentsSerializer(documents, many=True, context={"document_status": statuses}).data
+        self.assertEqual([row["document_status"] for row in data[::2]], [{}, {}])
+        self.assertEqual(set(data[1]["document_status"].values()), {"pending"})
+
+    def test_upload_documents(self):
+        one = self.assertWithinBudget(
+            "post", "/member/documents/", "member-token", 13, 1,
+            data={"Resume": "https://files.example.com/new-resume.pdf"},
+        )
+        many = self.assertWithinBudget(
+            "post", "/member/documents/", "member-token", 13, 1,
+            data={name: f"https://files.example.com/{name}.pdf" for name in MbrDocuments.DOCUMENT_FIELDS[:10]},
+        )
+        self.assertEqual(many.response.data["data"]["TenthCertificate"], "https://files.example.com/TenthCertificate.pdf")
+        # Documents are written in one statement each, not one per document
+        self.assertLessEqual(many.queries, one.queries)
+
+    def test_job_list(self):
+        response = self.assertScalesFlat("get", "/member/job/list/", "member-token", 3, 1, self.grow).response
+        self.assertEqual(len(response.data["data"]), 7)
+        self.assertEqual({job["status"] for job in response.data["data"]}, {"applied"})
+
+    def test_job_details(self):
+        self.assertScalesFlat("get", f"/member/job/details/{self.jobs[0].id}/", "member-token", 2, 2, self.grow)
+
+    def test_applied_jobs(self):
+        response = self.assertScalesFlat("get", "/member/apply/job/", "member-token", 2, 1, self.grow, lookups=1).response
+        self.assertEqual(len(response.data["data"]), 7)
+
+    def test_apply(self):
+        job = seed_jobs(1, start=50)[0]
+        self.assertWithinBudget(
+            "post", "/member/apply/job/", "member-token", 6, 1, lookups=1,
+            data={"job": job.id, "cover_letter": "Hello"}, status_code=201,
+        )
+        self.assertTrue(job.applications.filter(member_card=MEMBER_CARD).exists())
+
+    def test_share_and_view_documents(self):
+        share = self.assertWithinBudget(
+            "post", "/member/share-documents/", "member-token", 2, 1,
+            data={"selected_fields": ["Resume"], "pin": "1234", "access_time_minutes": 10},
+        ).response
+        view = self.assertWithinBudget(
+            "post", "/member/view-shared-documents/", "", 2, 0,
+            data={"access_token": share.data["access_token"], "pin": "1234"},
+        ).response
+        self.assertEqual(view.data["documents"], {"Resume": MbrDocuments.objects.get(card_number=MEMBER_CARD).Resume})
+
+    def test_feedback(self):
+        self.assertScalesFlat("get", "/member/feedback/?businessId=101", "member-token", 1, 1, self.grow, lookups=1)
+        self.assertWithinBudget(
+            "post", "/member/feedback/?businessId=101", "member-token", 6, 1,
+            data={"happiness_rating": 9, "has_issues": False}, status_code=201,
+        )
+
+    def test_apply_idempotency_key(self):
+        first, second = seed_jobs(2, start=60)
+        self.client.credentials(HTTP_AUTHORIZATION="Token member-token", HTTP_IDEMPOTENCY_KEY="retry-1")
+        response = self.client.post("/member/apply/job/", {"job": first.id}, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+
+        replay = self.client.post("/member/apply/job/", {"job": first.id}, format="json")
+        self.assertEqual((replay.status_code, replay.data), (201, response.data))
+        self.assertEqual(replay.headers["Idempotent-Replayed"], "true")
+
+        reused = self.client.post("/member/apply/job/", {"job": second.id}, format="json")
+        self.assertEqual(reused.status_code, 422)
+        self.assertFalse(second.applications.exists())
+
+    def test_job_mitra_apply_idempotency_key(self):
+        job = seed_jobs(1, start=70)[0]
+        data = {"card_number": str(MEMBER_CARD), "job_id": job.id, "resume": ""}
+        self.client.credentials(HTTP_IDEMPOTENCY_KEY="retry-1")
+        # Keys are scoped to the caller, so the endpoint needs one
+        self.assertEqual(self.client.post("/staff/jobmitra/apply-for-member/", data, format="json").status_code, 403)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Token jobmitra-token", HTTP_IDEMPOTENCY_KEY="retry-1")
+        response = self.client.post("/staff/jobmitra/apply-for-member/", data, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        retry = self.client.post("/staff/jobmitra/apply-for-member/", data, format="json")
+        self.assertEqual((retry.status_code, retry.data), (201, response.data))
+        self.assertEqual(retry.headers["Idempotent-Replayed"], "true")
+
+
+class IdempotencyKeyTests(TestCase):
+
+    def request(self, key="retry-1", data=None):
+        request = Request(APIRequestFactory().post("/", data or {"job": 1}, format="json", HTTP_IDEMPOTENCY_KEY=key),
+                          parsers=[JSONParser()])
+        request.user = AuthenticatedBusinessUser(id=1, business_id=101, business_name="Acme")
+        return request
+
+    def respond(self, status_code=201, request=None):
+        handler = mock.Mock(return_value=Response({"success": status_code < 400}, status=status_code))
+        return idempotent_response(request or self.request(), "test", handler), handler
+
+    def test_key_is_claimed_before_the_handler_runs(self):
+        def handler():
+            # A concurrent request with the same key arrives while this one runs
+            self.assertEqual(self.respond()[0].status_code, 409)
+            return Response({"success": True}, status=201)
+
+        response = idempotent_response(self.request(), "test", handler)
+        self.assertEqual(response.status_code, 201)
+        replay, again = self.respond()
+        self.assertEqual((replay.status_code, replay.headers["Idempotent-Replayed"]), (201, "true"))
+        again.assert_not_called()
+
+    def test_server_errors_release_the_key(self):
+        self.assertEqual(self.respond(503)[0].status_code, 503)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        response, handler = self.respond()
+        self.assertEqual(response.status_code, 201)
+        handler.assert_called_once()
+
+    def test_abandoned_claims_expire(self):
+        IdempotencyKey.objects.create(
+            scope="test:jobcard_business:1", key="retry-1", created_at=timezone.now() - timedelta(hours=1),
+        )
+        response, handler = self.respond()
+        self.assertEqual(response.status_code, 201)
+        handler.assert_called_once()
+
+    def test_anonymous_callers_are_not_stored(self):
+        request = self.request()
+        request.user = AnonymousUser()
+        self.respond(request=request)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+
+class DocumentFilterTests(TestCase):
+
+    def setUp(self):
+        seed_applications(seed_jobs(1), 4)
+        seed_members(2)  # members 2 and 3 have no documents
+        MbrDocuments.objects.filter(card_number=member_card(1)).update(
+            verified_mask=MbrDocuments.document_mask(["Resume"]), completeness_score=20,
+        )
+
+    def cards(self, **params):
+        applications = filter_by_documents(JobApplication.objects.order_by("member_card"), params)
+        return [application.member_card - MEMBER_CARD for application in applications]
+
+    def test_filters(self):
+        self.assertEqual(self.cards(), [0, 1, 2, 3])
+        self.assertEqual(self.cards(documents="Resume,TenthCertificate"), [0, 1])
+        self.assertEqual(self.cards(documents="PgCertificate"), [])
+        self.assertEqual(self.cards(verified_documents="Resume"), [1])
+        self.assertEqual(self.cards(min_completeness="0"), [0, 1, 2, 3])
+        self.assertEqual(self.cards(min_completeness="15"), [1])
+        self.assertEqual(self.cards(documents="Resume", min_completeness="1"), [0, 1])
+
+    def test_profile_and_ordering(self):
+        applications = list(filter_by_documents(JobApplication.objects.all(), {"ordering": "-completeness"}))
+        self.assertEqual([application.member_card - MEMBER_CARD for application in applications[:2]], [1, 0])
+        self.assertEqual(applications[0].document_verified_mask, MbrDocuments.document_mask(["Resume"]))
+        # Members without documents get an empty profile
+        self.assertEqual({application.document_present_mask for application in applications[2:]}, {0})
+        self.assertEqual({application.document_completeness_score for application in applications[2:]}, {0})
+
+    def test_bad_values(self):
+        for params in ({"documents": "Passport"}, {"min_completeness": "high"}, {"ordering": "name"}):
+            with self.subTest(params=params), self.assertRaises(InvalidDocumentFilter):
+                self.cards(**params)
+
+
+class DocumentStatusRaceTests(EndpointBudgetTestCase):
+
+    def test_status_row_created_concurrently_is_updated(self):
+        seed_members(1)
+        doc_request, _ = create_verification_request(MEMBER_CARD, 101, ["Resume"])
+        bulk_create = DocumentStatus.objects.bulk_create
+
+        def racing_bulk_create(rows, **kwargs):
+            # Another verifier creates the member's row between the read and the insert
+            bulk_create([DocumentStatus(card_number=MEMBER_CARD, document_type="Resume", status="rejected")])
+            return bulk_create(rows, **kwargs)
+
+        with mock.patch.object(DocumentStatus.objects, "bulk_create", side_effect=racing_bulk_create):
+            statuses = set_document_status(doc_request, "Resume", "verified", actor_id=4)
+        self.assertEqual(statuses, {"Resume": "verified"})
+        self.assertEqual(
+            set(DocumentStatus.objects.filter(card_number=MEMBER_CARD).values_list("request_id", "status")),
+            {(doc_request.id, "verified"), (None, "verified")},
+        )
+        self.assertEqual(
+            MbrDocuments.objects.get(card_number=MEMBER_CARD).verified_mask, MbrDocuments.document_mask(["Resume"])
+        )
+
+    def test_failed_status_write_rolls_back_the_upload(self):
+        seed_members(1)
+        before = MbrDocuments.objects.get(card_number=MEMBER_CARD)
+        with mock.patch.object(DocumentStatus.objects, "bulk_create", side_effect=DatabaseError("conflict")), \
+                self.assertRaises(DatabaseError):
+            self.measure("post", "/member/documents/", "member-token", {"Resume": "https://files.example.com/new.pdf"})
+        after = MbrDocuments.objects.get(card_number=MEMBER_CARD)
+        self.assertEqual((after.Resume, after.present_mask), (before.Resume, before.present_mask))
+
+    def test_upload_after_verification_resets_the_mask(self):
+        seed_members(1)
+        doc_request, _ = create_verification_request(MEMBER_CARD, 101, ["Resume"])
+        set_document_status(doc_request, "Resume", "verified")
+        response = self.measure(
+            "post", "/member/documents/", "member-token", {"Resume": "https://files.example.com/new.pdf"}
+        ).response
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["data"]["document_status"]["Resume"], "pending")
+        self.assertEqual(MbrDocuments.objects.get(card_number=MEMBER_CARD).verified_mask, 0)
+
+
+class SharedDocumentThrottleTests(EndpointBudgetTestCase):
+    """
+    PIN guesses against one share token: 10 per hour, refilled one every 6 minutes.
+    """
+
+    def guess(self, clock, remote_addr):
+        with mock.patch("helpers.throttling.time") as fake_time:
+            fake_time.time.return_value = clock
+            return self.client.post(
+                "/member/view-shared-documents/", {"access_token": "share-1", "pin": "0000"}, format="json",
+                REMOTE_ADDR=remote_addr,
+            )
+
+    def test_resource_bucket(self):
+        self.clear_caches()
+        start = 1_000_000.0
+        # From different addresses, so only the per-token bucket applies
+        for n in range(10):
+            self.assertNotEqual(self.guess(start, f"10.0.0.{n}").status_code, 429)
+
+        with CaptureQueriesContext(connection) as queries:
+            throttled = self.guess(start, "10.0.1.1")
+        self.assertEqual(throttled.status_code, 429)
+        self.assertEqual(throttled.headers["Retry-After"], "360")
+        self.assertEqual(len(queries), 0)
+
+        self.assertEqual(self.guess(start + 300, "10.0.1.2").status_code, 429)
+        self.assertNotEqual(self.guess(start + 360, "10.0.1.3").status_code, 429)
+        self.assertEqual(self.guess(start + 360, "10.0.1.4").status_code, 429)
@@ -0,0 +1,92 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import DocumentVerificationRequest
+
+LEASE_SECONDS = getattr(settings, "VERIFICATION_LEASE_SECONDS", 10 * 60)
+MAX_LEASE_SECONDS = 60 * 60
+MAX_CLAIM = 50
+
+DONE_STATUSES = {"verified", "rejected"}
+
+
+def _lease_until(now, lease_seconds):
+    return now + timedelta(seconds=min(max(int(lease_seconds or LEASE_SECONDS), 1), MAX_LEASE_SECONDS))
+
+
+def claim_requests(staff_id, limit=10, lease_seconds=None):
+    """
+    Lease up to `limit` of the oldest claimable requests to `staff_id`.
+    Claimable means pending, or processing with an expired lease. Rows locked
+    by another verifier's claim are skipped instead of waited on, so
+    concurrent claims never hand out the same request.
+    """
+    limit = min(max(int(limit), 1), MAX_CLAIM)
+    now = timezone.now()
+
+    with transaction.atomic():
+        ids = list(
+            DocumentVerificationRequest.objects
+            .filter(Q(status="pending") | Q(status="processing", lease_expires_at__lt=now))
+            .order_by("created_at", "id")
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)[:limit]
+        )
+        DocumentVerificationRequest.objects.filter(id__in=ids).update(
+            status="processing",
+            claimed_by=staff_id,
+            lease_expires_at=_lease_until(now, lease_seconds),
+            updated_at=now,
+        )
+
+    return (
+        DocumentVerificationRequest.objects.filter(id__in=ids)
+        .prefetch_related("document_statuses")
+        .order_by("created_at", "id")
+    )
+
+
+def _held_by(staff_id, request_ids):
+    return DocumentVerificationRequest.objects.filter(id__in=request_ids, claimed_by=staff_id, status="processing")
+
+
+def renew_leases(staff_id, request_ids, lease_seconds=None):
+    """
+    Extend the staff member's leases. A lease that already expired can still
+    be renewed as long as nobody else claimed the request. Returns the ids renewed.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        held = _held_by(staff_id, request_ids)
+        ids = list(held.select_for_update().values_list("id", flat=True))
+        held.filter(id__in=ids).update(lease_expires_at=_lease_until(now, lease_seconds), updated_at=now)
+    return ids
+
+
+def release_requests(staff_id, request_ids):
+    """
+    Hand unfinished requests back to the queue. Returns the number released.
+    """
+    return _held_by(staff_id, request_ids).update(
+        status="pending", claimed_by=None, lease_expires_at=None, updated_at=timezone.now()
+    )
+
+
+def finish_if_complete(doc_request):
+    """
+    Close the request and end its lease once every requested document is
+    verified or rejected. Call inside the transaction that changed a status.
+    """
+    statuses = set(doc_request.document_statuses.values_list("status", flat=True))
+    if not statuses or not statuses <= DONE_STATUSES:
+        return False
+
+    DocumentVerificationRequest.objects.filter(id=doc_request.id).update(
+        status="rejected" if "rejected" in statuses else "verified",
+        claimed_by=None,
+        lease_expires_at=None,
+        updated_at=timezone.now(),
+    )
+    return True
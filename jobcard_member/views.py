@@ -7,17 +7,20 @@ from rest_framework.permissions import IsAuthenticated
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from helpers.utils import get_member_details_by_mobile, get_member_details_by_card
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import ValidationError
 from .authentication import SSOMemberTokenAuthentication
 from . import serializers, models
+from .document_status import mark_uploaded
+from .document_sharing import AccessExpired, create_access, get_shared_documents
+from helpers.throttling import IPRateThrottle, ResourceRateThrottle
 from jobcard_business.models import JobApplication, Job, Feedback
 from jobcard_staff.serializers import JobpostSerializer
-import os
-from urllib.parse import urlparse
+from jobcard_business.job_lists import deactivate_expired_jobs
 import re
 from helpers.email import send_template_email
+from helpers.idempotency import idempotent_response
 from django.utils import timezone
 from datetime import timedelta
 from helpers.utils import get_member_job_prifile_by_card
@@ -46,13 +49,9 @@ class MbrDocumentsAPI(APIView):
         serializer = serializers.MbrDocumentsSerializer(documents)
         data = dict(serializer.data)
 
-        # Extract short resume file name if resume URL exists
-        resume_url = documents.Resume
-        if resume_url and resume_url.strip():
-            path = urlparse(resume_url).path
-            full_filename = os.path.basename(path)
-            short_resume_name = full_filename[-15:] if len(full_filename) >= 15 else full_filename
-            data["Resume_name"] = short_resume_name  # Add custom field
+        # Short resume file name, stored when the resume is saved
+        if documents.has_resume:
+            data["Resume_name"] = documents.resume_name  # Add custom field
 
         return Response({"success": True, "data": data}, status=status.HTTP_200_OK)
 
@@ -67,62 +66,36 @@ class MbrDocumentsAPI(APIView):
         Upload or update document URLs for the authenticated member.
         Existing documents are preserved if not included in the request.
         Only actual documents are tracked in document_status.
+        Only the documents sent are validated and written.
         """
         card_number = request.user.mbrcardno
 
-        # Get or create the document instance for this card number
-        documents, created = models.MbrDocuments.objects.get_or_create(card_number=card_number)
-
-        # Convert existing data to dict
-        existing_data = serializers.MbrDocumentsSerializer(documents).data
-
-        # Initialize or copy existing document_status
-        document_status = documents.document_status or {}
-
-        # Define actual document fields to track
-        document_fields = [
-            "TenthCertificate",
-            "TwelthCertificate",
-            "GraduationCertificate",
-            "GraduationMarksheet",
-            "PgCertificate",
-            "UpskillCertificate",
-            "ItiCertificate",
-            "ItiMarksheet",
-            "DiplomaCertificate",
-            "DiplomaMarksheet",
-            "CoverLetter",
-            "AdharcardVoterid",
-            "LinkedinUrl",
-            "GithubUrl",
-            "OtherLink",
-            "Resume"
-        ]
-
-        merged_data = {}
-        for field in document_fields:
-            if field in request.data and request.data[field] not in [None, ""]:
-                merged_data[field] = request.data[field]
-                document_status[field] = "pending"  # new upload → pending
-            else:
-                merged_data[field] = existing_data.get(field)
-                if field not in document_status:
-                    document_status[field] = "pending"
-
-        # Include updated document_status in merged_data
-        merged_data["document_status"] = document_status
-
-        # Save updated data
-        serializer = serializers.MbrDocumentsSerializer(documents, data=merged_data, partial=True)
-        if serializer.is_valid():
-            serializer.save(card_number=card_number)
-            return Response({
-                "success": True,
-                "message": "Documents updated successfully",
-                "data": serializer.data
-            }, status=status.HTTP_200_OK)
+        # Documents actually sent in this request
+        changes = {
+            field: request.data[field]
+            for field in models.MbrDocuments.DOCUMENT_FIELDS
+            if field in request.data and request.data[field] not in [None, ""]
+        }
+
+        serializer = serializers.MbrDocumentsSerializer(data=changes, partial=True)
+        if not serializer.is_valid():
+            return Response({"success": False, "error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response({"success": False, "error": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            documents, created = models.MbrDocuments.objects.get_or_create(card_number=card_number)
+
+            for field, value in serializer.validated_data.items():
+                setattr(documents, field, value)
+            documents.save(update_fields=[*serializer.validated_data, "UpdatedAt"])
+
+            # new upload → pending
+            mark_uploaded(card_number, serializer.validated_data)
+
+        return Response({
+            "success": True,
+            "message": "Documents updated successfully",
+            "data": serializers.MbrDocumentsSerializer(documents).data
+        }, status=status.HTTP_200_OK)
 
     
     
@@ -142,17 +115,14 @@ class JoblistAPIView(APIView):
     def get(self, request):
         try:
             member_card = request.user.mbrcardno
-            for job in Job.objects.filter(is_active=True):
-                job.check_and_deactivate()
+            deactivate_expired_jobs()
             jobs = Job.objects.all().order_by('-created_at')
-            job_list = []
 
-            for job in jobs:
-                # Check if member has applied to this job
-                application = JobApplication.objects.filter(job=job, member_card=member_card).first()
-                job_data = JobpostSerializer(job).data
-                job_data['status'] = application.status if application else None
-                job_list.append(job_data)
+            # The member's application status per job, from one query
+            applied = dict(JobApplication.objects.filter(member_card=member_card).values_list("job_id", "status"))
+            job_list = JobpostSerializer(jobs, many=True).data
+            for job_data in job_list:
+                job_data['status'] = applied.get(job_data['id'])
 
             return Response({
                 "success": True,
@@ -196,22 +166,11 @@ class JobDetailAPIView(APIView):
             job = Job.objects.get(id=job_id)
             serializer = JobpostSerializer(job)
 
-            # Check Resume
-            is_resume = False
-            resume_name = None
-            try:
-                doc = models.MbrDocuments.objects.get(card_number=member_card)
-                resume_url = doc.Resume
-                if resume_url and resume_url.strip():
-                    is_resume = True
-                    path = urlparse(resume_url).path
-                    full_filename = os.path.basename(path)
-
-                    # ✅ Get the last 15 characters of the filename
-                    resume_name = full_filename[-15:] if len(full_filename) >= 15 else full_filename
-
-            except models.MbrDocuments.DoesNotExist:
-                pass
+            # Check Resume (flag and short file name are stored when the resume is saved)
+            is_resume, resume_name = (
+                models.MbrDocuments.objects.filter(card_number=member_card, has_resume=True)
+                .values_list("has_resume", "resume_name").first()
+            ) or (False, None)
 
             return Response({
                 "success": True,
@@ -255,11 +214,7 @@ class JobApplyAPIView(APIView):
             member_card = request.user.mbrcardno  # from SSO
             
             # Check resume status
-            try:
-                doc = models.MbrDocuments.objects.get(card_number=member_card)
-                is_resume = bool(doc.Resume and doc.Resume.strip())
-            except models.MbrDocuments.DoesNotExist:
-                is_resume = False
+            is_resume = models.MbrDocuments.objects.filter(card_number=member_card, has_resume=True).exists()
 
             # Fetch applications
             applications = JobApplication.objects.filter(member_card=member_card).select_related('job').order_by('-applied_at')
@@ -279,33 +234,36 @@ class JobApplyAPIView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
     @swagger_auto_schema(
-        operation_description="Apply for a job by providing job ID, resume, and optional cover letter.",
+        operation_description="Apply for a job by providing job ID, resume, and optional cover letter. "
+                              "Send an Idempotency-Key header to make retries return the original response.",
         request_body=serializers.JobApplicationCreateSerializer,
+        manual_parameters=[
+            openapi.Parameter('Idempotency-Key', openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+                              description="Client generated key; a repeated key replays the stored response"),
+        ],
         responses={201: "Application submitted successfully."},
         tags=["Member"]
     )
     def post(self, request):
-        try:
-            serializer = serializers.JobApplicationCreateSerializer(data=request.data)
-            if serializer.is_valid():
-                job_id = serializer.validated_data.get('job')
-                job = Job.objects.get(id=job_id.id)
-
-                member_card = request.user.mbrcardno  # from SSO
-                member_data = get_member_details_by_card(member_card)
-                full_name = member_data.get('full_name')
-                email = member_data.get('email')
-                # Check if already applied
-                if JobApplication.objects.filter(job=job, member_card=member_card).exists():
-                    return Response({
-                        "success": False,
-                        "message": "You have already applied to this job."
-                    }, status=status.HTTP_400_BAD_REQUEST)
-
-                cover_letter = serializer.validated_data.get('cover_letter', '')
-                institute_id = serializer.validated_data.get('institute_id') or None
-                new_resume = serializer.validated_data.get('resume', '')
+        return idempotent_response(request, "member-apply", lambda: self._apply(request))
 
+    def _apply(self, request):
+        serializer = serializers.JobApplicationCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                "success": False,
+                "errors": serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        job = serializer.validated_data.get('job')
+        member_card = request.user.mbrcardno  # from SSO
+        cover_letter = serializer.validated_data.get('cover_letter', '')
+        institute_id = serializer.validated_data.get('institute_id') or None
+        new_resume = serializer.validated_data.get('resume', '')
+
+        # Insert first; the unique (job, member_card) constraint rejects a second application
+        try:
+            with transaction.atomic():
                 # ✅ Check if Resume already exists in MbrDocuments
                 doc_obj, created = models.MbrDocuments.objects.get_or_create(card_number=member_card)
 
@@ -324,37 +282,31 @@ class JobApplyAPIView(APIView):
                     cover_letter=cover_letter,
                     resume=resume_to_use
                 )
-                context = {
-                   "full_name": full_name,
-                    "mbrcardno": member_card,
-                    "institute_id": institute_id or "N/A",
-                    "resume": resume_to_use,
-                    "cover_letter": cover_letter or "N/A"
-                }
-                send_template_email(
-                    subject="Job Application Confirmation - JSJCard",
-                    template_name="email_template/job_applied.html",
-                    context=context,
-                    recipient_list=[email] 
-                    )
-                return Response({
-                    "success": True,
-                    "message": "Application submitted successfully."
-                }, status=status.HTTP_201_CREATED)
-
+        except IntegrityError:
             return Response({
                 "success": False,
-                "errors": serializer.errors
+                "message": "You have already applied to this job."
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        except Job.DoesNotExist:
-            return Response({
-                "success": False,
-                "message": "Invalid job ID."
-            }, status=status.HTTP_404_NOT_FOUND)
+        member_data = get_member_details_by_card(member_card) or {}
+        context = {
+            "full_name": member_data.get('full_name'),
+            "mbrcardno": member_card,
+            "institute_id": institute_id or "N/A",
+            "resume": resume_to_use,
+            "cover_letter": cover_letter or "N/A"
+        }
+        send_template_email(
+            subject="Job Application Confirmation - JSJCard",
+            template_name="email_template/job_applied.html",
+            context=context,
+            recipient_list=[member_data.get('email')]
+        )
+        return Response({
+            "success": True,
+            "message": "Application submitted successfully."
+        }, status=status.HTTP_201_CREATED)
 
-        
-        
 
 class ShareDocumentsAPIView(APIView):
     authentication_classes = [SSOMemberTokenAuthentication]
@@ -379,13 +331,12 @@ class ShareDocumentsAPIView(APIView):
             except models.MbrDocuments.DoesNotExist:
                 return Response({"error": "Member not found."}, status=404)
 
-            access = models.DocumentAccess.objects.create(
-                member=member,
-                selected_fields=selected_fields,
-                pin=pin,
-                expiry_time=timezone.now() + timedelta(minutes=minutes)
-            )
-            return Response({"message": "Document access created", "access_id": access.id})
+            access = create_access(member, selected_fields, pin, minutes)
+            return Response({
+                "message": "Document access created",
+                "access_token": access.token,
+                "expiry_time": access.expiry_time
+            })
         return Response(serializer.errors, status=400)
     
     
@@ -393,33 +344,36 @@ class ShareDocumentsAPIView(APIView):
     
     
 class ViewSharedDocumentsAPIView(APIView):
+    # Public: throttled per IP and per share token before any database work
+    authentication_classes = []
+    throttle_classes = [IPRateThrottle, ResourceRateThrottle]
+    throttle_scope = "shared_documents"
+    throttle_resource_param = "access_token"
+
     @swagger_auto_schema(
-        operation_description="View shared documents by providing access ID and PIN. Access is only valid for a limited time.",
+        operation_description="View shared documents by providing access token and PIN. Access is only valid for a limited time.",
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
-            required=["access_id", "pin"],
+            required=["access_token", "pin"],
             properties={
-                "access_id": openapi.Schema(type=openapi.TYPE_INTEGER),
+                "access_token": openapi.Schema(type=openapi.TYPE_STRING),
                 "pin": openapi.Schema(type=openapi.TYPE_STRING),
             },
         ),
-        responses={200: "Documents retrieved successfully", 403: "Access expired", 404: "Invalid access ID or PIN"},
+        responses={200: "Documents retrieved successfully", 403: "Access expired", 404: "Invalid access token or PIN"},
         tags=["Member"]
     )
     def post(self, request):
-        access_id = request.data.get("access_id")
+        access_token = request.data.get("access_token")
         pin = request.data.get("pin")
 
         try:
-            access = models.DocumentAccess.objects.get(id=access_id, pin=pin)
-        except models.DocumentAccess.DoesNotExist:
-            return Response({"error": "Invalid access ID or PIN"}, status=404)
-
-        if not access.is_valid():
+            data = get_shared_documents(access_token, pin)
+        except AccessExpired:
             return Response({"error": "Access expired"}, status=403)
 
-        member = access.member
-        data = {field: getattr(member, field) for field in access.selected_fields}
+        if data is None:
+            return Response({"error": "Invalid access token or PIN"}, status=404)
         return Response({"documents": data})
 
 
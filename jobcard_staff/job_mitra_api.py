@@ -7,15 +7,24 @@ from drf_yasg import openapi
 from jobcard_business.models import Job, JobApplication
 from . import serializers
 from .authentication import SSOUserTokenAuthentication
+from .permissions import IsJobMitra
 from jobcard_member.models import MbrDocuments
-from helpers.utils import get_member_details_by_card
+from helpers.utils import get_member_details_by_card, get_members_details_by_cards
+from jobcard_business.dashboard import invalidate_employer_dashboard
+from django.db import IntegrityError, transaction
+from helpers.idempotency import idempotent_response
+from helpers.throttling import IPRateThrottle, ThrottleBeforeAuthMixin, TokenRateThrottle
+from helpers.resume import set_resume_metadata
 import json
-class ApplicationListOfStudent(APIView):
+class ApplicationListOfStudent(ThrottleBeforeAuthMixin, APIView):
     """
     Staff can view job applications or update their status.
     """
     authentication_classes = [SSOUserTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    throttle_classes = [IPRateThrottle, TokenRateThrottle]
+    throttle_scope = "job_mitra"
+    read_from_replica = True
 
     @swagger_auto_schema(
         operation_description="Get all student applications for a specific job ID.",
@@ -24,7 +33,7 @@ class ApplicationListOfStudent(APIView):
     )
     def get(self, request, job_id):
         try:
-            applications = JobApplication.objects.filter(job_id=job_id)
+            applications = JobApplication.objects.filter(job_id=job_id).select_related("job")
             serializer = serializers.JobApplicationStaffViewSerializer(applications, many=True)
             return Response({
                 "success": True,
@@ -64,11 +73,13 @@ response_example = {
         "pincode": "751024"
     }
 }
-class GetMemberDetailsByCardApi(APIView):
+class GetMemberDetailsByCardApi(ThrottleBeforeAuthMixin, APIView):
     """
     API to retrieve member details using card number,
     including resume status and resume value from MbrDocuments.
     """
+    throttle_classes = [IPRateThrottle, TokenRateThrottle]
+    throttle_scope = "job_mitra"
 
     @swagger_auto_schema(
         operation_description="Enter member card number to retrieve member details and resume (if available).",
@@ -112,15 +123,10 @@ class GetMemberDetailsByCardApi(APIView):
                 }, status=status.HTTP_404_NOT_FOUND)
 
             # Step 2: Fetch resume from MbrDocuments
-            is_resume = False
-            resume_value = None
-            try:
-                doc = MbrDocuments.objects.get(card_number=card_number)
-                if doc.Resume and doc.Resume.strip():
-                    is_resume = True
-                    resume_value = doc.Resume
-            except MbrDocuments.DoesNotExist:
-                pass
+            is_resume, resume_value = (
+                MbrDocuments.objects.filter(card_number=card_number, has_resume=True)
+                .values_list("has_resume", "Resume").first()
+            ) or (False, None)
 
             # Step 3: Extract meta_data (handling both dict and string cases)
             address_raw = member_data.get("address", {})
@@ -164,10 +170,14 @@ class GetMemberDetailsByCardApi(APIView):
 
 
 
-class ApplyJobForMemberAPIView(APIView):
+class ApplyJobForMemberAPIView(ThrottleBeforeAuthMixin, APIView):
     """
     job mitra applies for a job on behalf of a member using their card number.
     """
+    authentication_classes = [SSOUserTokenAuthentication]
+    permission_classes = [IsAuthenticated, IsJobMitra]
+    throttle_classes = [IPRateThrottle, TokenRateThrottle]
+    throttle_scope = "job_mitra"
 
     @swagger_auto_schema(
         operation_description="Apply for a job using member card number.",
@@ -185,11 +195,19 @@ class ApplyJobForMemberAPIView(APIView):
         responses={
             201: openapi.Response(description="Job application created."),
             400: openapi.Response(description="Invalid request or already applied."),
-            404: openapi.Response(description="Member or Job not found.")
+            404: openapi.Response(description="Member or Job not found."),
+            409: openapi.Response(description="A request with the same Idempotency-Key is still running."),
         },
+        manual_parameters=[
+            openapi.Parameter('Idempotency-Key', openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+                              description="Client generated key; a repeated key replays the stored response"),
+        ],
         tags=["Job Mitra"]
     )
     def post(self, request):
+        return idempotent_response(request, "jobmitra-apply", lambda: self._apply(request))
+
+    def _apply(self, request):
         card_number = request.data.get('card_number')
         job_id = request.data.get('job_id')
         resume = request.data.get('resume')
@@ -207,21 +225,13 @@ class ApplyJobForMemberAPIView(APIView):
         except Job.DoesNotExist:
             return Response({"success": False, "message": "Invalid job ID."}, status=404)
 
-        # Step 3: Check if already applied
-        if JobApplication.objects.filter(job=job, member_card=card_number).exists():
-            return Response({
-                "success": False,
-                "message": "Member has already applied to this job."
-            }, status=400)
-
-        # Step 4: Check if resume exists in MbrDocuments or use given resume
-        try:
-            doc = MbrDocuments.objects.get(card_number=card_number)
-            has_resume = bool(doc.Resume and doc.Resume.strip())
-        except MbrDocuments.DoesNotExist:
-            has_resume = False
+        # Step 3: Check if resume exists in MbrDocuments or use given resume
+        saved_resume = (
+            MbrDocuments.objects.filter(card_number=card_number, has_resume=True)
+            .values_list("Resume", flat=True).first()
+        )
 
-        if not resume and not has_resume:
+        if not resume and not saved_resume:
             return Response({
                 "success": False,
                 "message": "Resume is required either via request or in MbrDocuments."
@@ -230,19 +240,236 @@ class ApplyJobForMemberAPIView(APIView):
         # Get referral (employee id) from the logged-in user
         referral_id = getattr(request.user, 'employee_id', None)
 
-        # Step 5: Create application
-        JobApplication.objects.create(
-            job=job,
-            member_card=card_number,
-            institute_id=institute_id,
-            cover_letter=cover_letter,
-            resume=resume or doc.Resume,
-            referral=referral_id
-        )
+        # Step 4: Create application; the unique (job, member_card) constraint rejects a second one
+        try:
+            with transaction.atomic():
+                JobApplication.objects.create(
+                    job=job,
+                    member_card=card_number,
+                    institute_id=institute_id,
+                    cover_letter=cover_letter,
+                    resume=resume or saved_resume,
+                    referral=referral_id
+                )
+        except IntegrityError:
+            return Response({
+                "success": False,
+                "message": "Member has already applied to this job."
+            }, status=400)
 
         return Response({
             "success": True,
             "message": "Job application submitted successfully for member.",
             "member_name": member_data.get("full_name"),
             "job_title": job.title
-        }, status=201)
\ No newline at end of file
+        }, status=201)
+
+
+
+class BulkApplyJobForMembersAPIView(ThrottleBeforeAuthMixin, APIView):
+    """
+    job mitra applies for jobs on behalf of many members in one request.
+    """
+    authentication_classes = [SSOUserTokenAuthentication]
+    permission_classes = [IsAuthenticated, IsJobMitra]
+    throttle_classes = [IPRateThrottle, TokenRateThrottle]
+    throttle_scope = "job_mitra"
+    MAX_ITEMS = 500
+
+    @swagger_auto_schema(
+        operation_description="Apply for jobs for many members. Each item gets its own result; valid items are saved together.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["items"],
+            properties={
+                "job_id": openapi.Schema(type=openapi.TYPE_INTEGER, description="Default job ID for items without one"),
+                "items": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        required=["card_number"],
+                        properties={
+                            "card_number": openapi.Schema(type=openapi.TYPE_STRING, description="Member's card number"),
+                            "job_id": openapi.Schema(type=openapi.TYPE_INTEGER, description="Job ID to apply for"),
+                            "resume": openapi.Schema(type=openapi.TYPE_STRING, description="Resume file/link"),
+                            "cover_letter": openapi.Schema(type=openapi.TYPE_STRING, description="Optional cover letter", default=""),
+                            "institute_id": openapi.Schema(type=openapi.TYPE_INTEGER, description="Optional institute ID", default=None),
+                        }
+                    )
+                ),
+            }
+        ),
+        responses={
+            200: openapi.Response(description="Per-item results."),
+            400: openapi.Response(description="Invalid request."),
+            409: openapi.Response(description="A request with the same Idempotency-Key is still running."),
+        },
+        manual_parameters=[
+            openapi.Parameter('Idempotency-Key', openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+                              description="Client generated key; a repeated key replays the stored response"),
+        ],
+        tags=["Job Mitra"]
+    )
+    def post(self, request):
+        return idempotent_response(request, "jobmitra-bulk-apply", lambda: self._apply(request))
+
+    def _apply(self, request):
+        items = request.data.get("items")
+        default_job_id = request.data.get("job_id")
+
+        if not isinstance(items, list) or not items:
+            return Response({"success": False, "message": "items must be a non-empty list."}, status=400)
+        if len(items) > self.MAX_ITEMS:
+            return Response({"success": False, "message": f"At most {self.MAX_ITEMS} items per request."}, status=400)
+
+        # Normalise items; anything malformed gets its error straight away
+        results = []
+        pending = []
+        for index, item in enumerate(items):
+            item = item if isinstance(item, dict) else {}
+            card_number = str(item.get("card_number") or "").strip()
+            job_id = item.get("job_id") or default_job_id
+            result = {"index": index, "card_number": card_number, "job_id": job_id, "success": False}
+            results.append(result)
+            errors = self._item_errors(item)
+
+            if errors:
+                result.update({"message": "Invalid item.", "errors": errors})
+            elif not card_number.isdigit():
+                result["message"] = "Invalid card number."
+            elif not str(job_id or "").isdigit():
+                result["message"] = "Invalid job ID."
+            else:
+                result["job_id"] = int(job_id)
+                pending.append((result, item))
+
+        card_numbers = {int(result["card_number"]) for result, _ in pending}
+        job_ids = {result["job_id"] for result, _ in pending}
+
+        # One batch of member lookups and one query each for jobs, existing applications and resumes
+        members = get_members_details_by_cards(card_numbers)
+        jobs = Job.objects.in_bulk(job_ids)
+        applied = set(
+            JobApplication.objects.filter(job_id__in=job_ids, member_card__in=card_numbers)
+            .values_list("job_id", "member_card")
+        )
+        saved_resumes = dict(
+            MbrDocuments.objects.filter(card_number__in=card_numbers, has_resume=True).values_list("card_number", "Resume")
+        )
+
+        referral_id = getattr(request.user, 'employee_id', None)
+        to_create = []
+        for result, item in pending:
+            card = int(result["card_number"])
+            job = jobs.get(result["job_id"])
+            resume = item.get("resume") or (saved_resumes.get(card) or "").strip()
+
+            if not members.get(card):
+                result["message"] = "Invalid card number or member not found."
+            elif job is None:
+                result["message"] = "Invalid job ID."
+            elif (job.id, card) in applied:
+                result["message"] = "Member has already applied to this job."
+            elif not resume:
+                result["message"] = "Resume is required either via request or in MbrDocuments."
+            else:
+                applied.add((job.id, card))
+                result.update({
+                    "success": True,
+                    "message": "Job application submitted successfully for member.",
+                    "member_name": members[card].get("full_name"),
+                    "job_title": job.title,
+                })
+                application = JobApplication(
+                    job=job,
+                    member_card=card,
+                    institute_id=item.get("institute_id"),
+                    cover_letter=item.get("cover_letter") or "",
+                    resume=resume,
+                    referral=referral_id
+                )
+                set_resume_metadata(application, resume)  # bulk_create skips save()
+                to_create.append((result, application))
+
+        created = self._create_applications(to_create)
+        for result, application in created:
+            result["application_id"] = application.pk
+
+        for business_id in {application.job.business_id for _, application in created}:
+            invalidate_employer_dashboard(business_id)
+
+        return Response({
+            "success": True,
+            "submitted": len(created),
+            "failed": len(results) - len(created),
+            "results": results
+        }, status=200)
+
+    @staticmethod
+    def _item_errors(item):
+        """
+        {field: message} for the optional fields of one item that have the
+        wrong type, checked before anything is looked up or saved.
+        """
+        errors = {}
+        institute_id = item.get("institute_id")
+        if institute_id is not None and (isinstance(institute_id, bool) or not isinstance(institute_id, int)):
+            errors["institute_id"] = "Must be an integer."
+        for field in ("resume", "cover_letter"):
+            if item.get(field) is not None and not isinstance(item[field], str):
+                errors[field] = "Must be a string."
+        return errors
+
+    @staticmethod
+    def _mark_already_applied(result):
+        result.pop("member_name", None)
+        result.pop("job_title", None)
+        result.update({"success": False, "message": "Member has already applied to this job."})
+
+    @classmethod
+    def _create_applications(cls, to_create):
+        """
+        Insert the (result, application) pairs in one statement and return the
+        pairs that were saved. If a concurrent request applied for one of the
+        same job/member pairs first, the unique constraint rejects the batch;
+        those items are marked as already applied and the rest inserted again.
+        If that is rejected too, the rest are inserted one by one.
+        """
+        try:
+            with transaction.atomic():
+                JobApplication.objects.bulk_create([application for _, application in to_create])
+            return to_create
+        except IntegrityError:
+            pass
+
+        applied = set(
+            JobApplication.objects.filter(
+                job_id__in={application.job_id for _, application in to_create},
+                member_card__in={application.member_card for _, application in to_create},
+            ).values_list("job_id", "member_card")
+        )
+        remaining = []
+        for result, application in to_create:
+            if (application.job_id, application.member_card) in applied:
+                cls._mark_already_applied(result)
+            else:
+                remaining.append((result, application))
+
+        try:
+            with transaction.atomic():
+                JobApplication.objects.bulk_create([application for _, application in remaining])
+            return remaining
+        except IntegrityError:
+            pass
+
+        # Still racing other requests: each item gets its own insert and result
+        created = []
+        for result, application in remaining:
+            application.pk = None
+            try:
+                with transaction.atomic():
+                    application.save(force_insert=True)
+                created.append((result, application))
+            except IntegrityError:
+                cls._mark_already_applied(result)
+        return created
@@ -0,0 +1,11 @@
+from rest_framework.permissions import BasePermission
+
+
+class IsJobMitra(BasePermission):
+    """
+    Staff users the auth server flags as job mitra.
+    """
+    message = "Only job mitra users can do this."
+
+    def has_permission(self, request, view):
+        return bool(getattr(request.user, "is_jobmitra", False))
@@ -1,3 +1,264 @@
-from django.test import TestCase
+from unittest import mock
+from django.db import IntegrityError
+from helpers.testing import (
+    BUSINESS_ID, MEMBER_CARD, EndpointBudgetTestCase, distinct_members, job_payload, job_upload, member_card,
+    seed_applications, seed_jobs, seed_members,
+)
+from jobcard_admin.models import EmailOutbox
+from jobcard_business.models import JobApplication
+from jobcard_staff.job_mitra_api import ApplyJobForMemberAPIView
+from jobcard_member.document_status import create_verification_request
+from jobcard_member.models import DocumentVerificationRequest
 
-# Create your tests here.
+
+class StaffEndpointBudgetTests(EndpointBudgetTestCase):
+    """
+    Queries and auth server calls per request stay fixed however many jobs,
+    applications and verification requests there are; lists look each
+    member and business up at most once.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.jobs = seed_jobs(2)
+        self.members = 0
+        self.add_members(3, self.jobs)
+
+    def add_members(self, count, jobs):
+        seed_applications(jobs, count, start=self.members)
+        cards = seed_members(count, start=self.members)
+        for n, card in enumerate(cards):
+            create_verification_request(card, BUSINESS_ID + self.members + n, ["Resume", "TenthCertificate"])
+        self.members += count
+
+    def grow(self):
+        self.add_members(6, [self.jobs[0], *seed_jobs(5, start=self.members * 10)])
+
+    def test_job_list(self):
+        self.assertScalesFlat("get", "/staff/jobs-list/post/", "staff-token", 2, 1, self.grow)
+        self.assertScalesFlat("get", "/staff/jobs-list/post/", "jobmitra-token", 3, 1, self.grow)
+
+    def test_job_writes(self):
+        self.assertWithinBudget(
+            "post", "/staff/jobs-list/post/", "staff-token", 1, 1, data=job_payload(business_id=BUSINESS_ID),
+            status_code=201,
+        )
+        self.assertWithinBudget(
+            "put", f"/staff/jobs-details/{self.jobs[0].id}/", "staff-token", 3, 1, data={"title": "Senior Welder"},
+        )
+
+    def test_job_import(self):
+        def upload(count):
+            return self.assertWithinBudget(
+                "post", "/staff/jobs-list/import/", "staff-token", 3, 1,
+                data={"file": job_upload(count, business_id=BUSINESS_ID)}, format="multipart",
+            )
+
+        # One insert per chunk; kept under SQLite's 999 parameter split of one insert
+        before = upload(3)
+        after = upload(30)
+        self.assertEqual(after.response.data["data"]["created"], 30)
+        self.assertEqual(after.queries, before.queries)
+
+    def test_job_details(self):
+        self.assertScalesFlat("get", f"/staff/jobs-details/{self.jobs[0].id}/", "staff-token", 1, 1, self.grow)
+
+    def test_applications(self):
+        response = self.assertScalesFlat(
+            "get", f"/staff/job-applications/{self.jobs[0].id}/", "staff-token", 1, 1, self.grow,
+            lookups=distinct_members,
+        ).response
+        self.assertEqual(len(response.data["data"]), 9)
+        self.assertEqual(response.data["data"][0]["email"], f"{response.data['data'][0]['member_card']}@example.com")
+
+        response = self.assertScalesFlat(
+            "get", f"/staff/job_mitra/applied/list/{self.jobs[0].id}/", "jobmitra-token", 1, 1, self.grow,
+            lookups=distinct_members,
+        ).response
+        self.assertEqual(len(response.data["data"]), 15)
+
+    def test_application_status(self):
+        application = JobApplication.objects.filter(job=self.jobs[0]).first()
+        self.assertWithinBudget(
+            "patch", f"/staff/job-applications/{self.jobs[0].id}/", "staff-token", 3, 1, lookups=1,
+            data={"id": application.id, "status": "shortlisted"},
+        )
+
+    def test_bulk_application_status(self):
+        def update_all():
+            ids = list(JobApplication.objects.filter(job=self.jobs[0]).values_list("id", flat=True))
+            return self.assertWithinBudget(
+                "patch", f"/staff/job-applications/{self.jobs[0].id}/bulk-status/", "staff-token", 6, 1,
+                lookups=len(ids), data={"ids": ids, "status": "under_review"},
+            )
+
+        before = update_all()
+        self.grow()
+        after = update_all()
+        # The first three are already under review
+        self.assertEqual(after.response.data["notified"], 6)
+        self.assertEqual(after.queries, before.queries)
+
+    def test_bulk_status_skips_unchanged_applications(self):
+        applications = list(JobApplication.objects.filter(job=self.jobs[0]).order_by("id"))
+        JobApplication.objects.filter(id=applications[0].id).update(status="shortlisted")
+
+        response = self.measure(
+            "patch", f"/staff/job-applications/{self.jobs[0].id}/bulk-status/", "staff-token",
+            {"ids": [application.id for application in applications], "status": "shortlisted"},
+        ).response
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data["updated_ids"], [application.id for application in applications[1:]])
+        self.assertEqual(response.data["unchanged_ids"], [applications[0].id])
+        self.assertEqual(response.data["notified"], 2)
+        self.assertFalse(EmailOutbox.objects.filter(context__card_number=applications[0].member_card).exists())
+        self.assertEqual(EmailOutbox.objects.count(), 2)
+
+    def test_member_documents(self):
+        self.assertScalesFlat("get", f"/staff/staff/member-documents/{MEMBER_CARD}/", "staff-token", 2, 1, self.grow)
+
+    def test_verification_lists(self):
+        response = self.assertScalesFlat(
+            "get", "/staff/document-verification/list/", "staff-token", 3, 1, self.grow,
+            lookups=lambda response: len(response.data["data"]),
+        ).response
+        self.assertEqual(response.data["data"][0]["requested_by"], f"Business {response.data['data'][0]['card_number'] - MEMBER_CARD + BUSINESS_ID}")
+        self.assertScalesFlat("get", "/staff/document-verification/queue/", "staff-token", 2, 1, self.grow)
+        self.assertScalesFlat(
+            "get", f"/staff/document/verification/status/{MEMBER_CARD}/", "staff-token", 3, 1, self.grow
+        )
+
+    def test_verification_workflow(self):
+        def claim():
+            return self.assertWithinBudget(
+                "post", "/staff/document-verification/claim/", "staff-token", 6, 1, data={"limit": 50},
+            )
+
+        before = claim()
+        self.grow()
+        after = claim()
+        self.assertEqual(len(after.response.data["data"]), 6)
+        self.assertEqual(after.queries, before.queries)
+
+        request_ids = list(DocumentVerificationRequest.objects.filter(claimed_by=4).values_list("id", flat=True))
+        self.assertWithinBudget(
+            "post", "/staff/document-verification/renew/", "staff-token", 4, 1, data={"request_ids": request_ids},
+        )
+        self.assertWithinBudget(
+            "post", "/staff/document-verification/release/", "staff-token", 1, 1, data={"request_ids": request_ids},
+        )
+
+        doc_request = DocumentVerificationRequest.objects.get(card_number=member_card(0))
+        self.assertWithinBudget(
+            "post", f"/staff/document/verification/status/{MEMBER_CARD}/", "staff-token", 14, 1,
+            data={"request_id": doc_request.id, "document_name": "Resume", "status": "verified"},
+        )
+
+    def test_hr_feedbacks_and_analytics(self):
+        self.assertScalesFlat("get", "/staff/hr-feedbacks/", "staff-token", 2, 1, self.grow)
+        self.assertScalesFlat("get", "/staff/analytics/applications/", "staff-token", 1, 1, self.grow)
+        self.assertScalesFlat("get", "/staff/cache/metrics/", "staff-token", 0, 1, self.grow)
+
+    def test_job_mitra(self):
+        self.assertScalesFlat(
+            "get", f"/staff/jobmitra/member-details/?card_number={MEMBER_CARD}", "jobmitra-token", 1, 0, self.grow,
+            lookups=1,
+        )
+        job = seed_jobs(1, start=999)[0]
+        self.assertWithinBudget(
+            "post", "/staff/jobmitra/apply-for-member/", "jobmitra-token", 5, 1, lookups=1,
+            data={"card_number": str(MEMBER_CARD), "job_id": job.id, "resume": ""}, status_code=201,
+        )
+
+        def apply_all(count):
+            items = [{"card_number": str(member_card(n))} for n in range(count)]
+            return self.assertWithinBudget(
+                "post", "/staff/jobmitra/apply-for-members/", "jobmitra-token", 6, 1, lookups=count,
+                data={"job_id": job.id, "items": items},
+            )
+
+        before = apply_all(2)
+        self.grow()
+        after = apply_all(self.members)
+        self.assertEqual(after.response.data["submitted"], 13)
+        self.assertEqual(after.queries, before.queries)
+
+    def test_bulk_apply_requires_job_mitra(self):
+        job = seed_jobs(1, start=999)[0]
+        data = {"job_id": job.id, "items": [{"card_number": str(MEMBER_CARD)}]}
+        self.assertWithinBudget("post", "/staff/jobmitra/apply-for-members/", "", 0, 1, data=data, status_code=403)
+        self.assertWithinBudget(
+            "post", "/staff/jobmitra/apply-for-members/", "staff-token", 0, 1, data=data, status_code=403,
+        )
+        self.assertFalse(job.applications.exists())
+
+    def test_bulk_apply_reports_malformed_items(self):
+        job = seed_jobs(1, start=999)[0]
+        items = [
+            {"card_number": str(member_card(0))},
+            {"card_number": str(member_card(1)), "institute_id": "abc"},
+            {"card_number": str(member_card(2)), "resume": 123},
+            {"card_number": str(member_card(3)), "institute_id": 7, "resume": "https://files.example.com/cv.pdf"},
+        ]
+        response = self.measure(
+            "post", "/staff/jobmitra/apply-for-members/", "jobmitra-token", {"job_id": job.id, "items": items}
+        ).response
+        self.assertEqual(response.status_code, 200, response.data)
+        results = response.data["results"]
+        self.assertEqual([result["success"] for result in results], [True, False, False, True])
+        self.assertEqual(results[1]["errors"], {"institute_id": "Must be an integer."})
+        self.assertEqual(results[2]["errors"], {"resume": "Must be a string."})
+        self.assertEqual(
+            set(job.applications.values_list("member_card", "institute_id")),
+            {(member_card(0), None), (member_card(3), 7)},
+        )
+
+    def test_bulk_apply_falls_back_to_single_inserts(self):
+        job = seed_jobs(1, start=999)[0]
+        items = [{"card_number": str(member_card(n))} for n in range(3)]
+        save = JobApplication.save
+
+        def racing_save(application, *args, **kwargs):
+            # Another request applied member 1 in the meantime
+            if application.member_card == member_card(1):
+                raise IntegrityError("duplicate key")
+            return save(application, *args, **kwargs)
+
+        # Both bulk inserts keep hitting concurrent applications
+        with mock.patch.object(JobApplication.objects, "bulk_create", side_effect=IntegrityError("duplicate key")), \
+                mock.patch.object(JobApplication, "save", autospec=True, side_effect=racing_save):
+            cost = self.measure("post", "/staff/jobmitra/apply-for-members/", "jobmitra-token",
+                                {"job_id": job.id, "items": items})
+        self.assertEqual(cost.response.status_code, 200, cost.response.data)
+        self.assertEqual(cost.response.data["submitted"], 2)
+        self.assertEqual([result["success"] for result in cost.response.data["results"]], [True, False, True])
+        self.assertNotIn("member_name", cost.response.data["results"][1])
+        self.assertEqual(
+            set(job.applications.values_list("member_card", flat=True)), {member_card(0), member_card(2)}
+        )
+
+
+class JobMitraThrottleTests(EndpointBudgetTestCase):
+
+    def apply(self, clock):
+        with mock.patch("helpers.throttling.time") as fake_time:
+            fake_time.time.return_value = clock
+            return self.client.post("/staff/jobmitra/apply-for-member/", {"job_id": 0}, format="json")
+
+    @mock.patch.object(ApplyJobForMemberAPIView, "throttle_rates", {"token": "2/min"}, create=True)
+    def test_token_bucket_is_checked_before_authentication(self):
+        self.clear_caches()
+        self.client.credentials(HTTP_AUTHORIZATION="Token jobmitra-token")
+        start = 1_000_000.0
+        self.assertEqual([self.apply(start).status_code for _ in range(2)], [404, 404])
+
+        self.stub.reset()
+        throttled = self.apply(start + 10)
+        self.assertEqual(throttled.status_code, 429)
+        # 20 seconds until the next token, rounded up by DRF
+        self.assertIn(throttled.headers["Retry-After"], {"20", "21"})
+        self.assertEqual(self.stub.count(), 0)
+
+        # Refills at one request per 30 seconds
+        self.assertEqual(self.apply(start + 30).status_code, 404)
+        self.assertEqual(self.apply(start + 30).status_code, 429)
@@ -2,18 +2,27 @@ from django.urls import path
 from . import views, job_mitra_api
 urlpatterns = [
     path("jobs-list/post/", views.JobListCreateAPIView.as_view(), name="job-list-create"),
+    path("jobs-list/import/", views.JobImportAPIView.as_view(), name="job-import"),
     path("jobs-details/<int:id>/", views.JobDetailAPIView.as_view(), name="job-detail"),
     path('job-applications/<int:job_id>/', views.JobApplicationListOfStudent.as_view(), name='job-applications-by-job'),
+    path('job-applications/<int:job_id>/bulk-status/', views.BulkApplicationStatusAPIView.as_view(), name='job-applications-bulk-status'),
     path('staff/member-documents/<str:card_number>/', views.MbrDocumentsAPI.as_view(), name='member-documents'),
     
     path('document-verification/list/', views.StaffDocumentVerificationListAPIView.as_view(), name='staff-document-requests'),
+    path('document-verification/queue/', views.StaffDocumentQueueAPIView.as_view(), name='staff-document-queue'),
+    path('document-verification/claim/', views.StaffClaimVerificationRequestsAPIView.as_view(), name='staff-document-claim'),
+    path('document-verification/renew/', views.StaffRenewVerificationLeaseAPIView.as_view(), name='staff-document-renew'),
+    path('document-verification/release/', views.StaffReleaseVerificationRequestsAPIView.as_view(), name='staff-document-release'),
     path('document/verification/status/<str:card_number>/', views.StaffUpdateDocumentStatusAPIView.as_view(), name='staff-update-document-status'),
     path('hr-feedbacks/', views.HRFeedbackListAPI.as_view(), name='hr-feedback-list'),
+    path('analytics/applications/', views.ApplicationTrendStaffAPIView.as_view(), name='staff-application-trends'),
+    path('cache/metrics/', views.CacheMetricsAPIView.as_view(), name='staff-cache-metrics'),
     
     
     path('job_mitra/applied/list/<int:job_id>/', job_mitra_api.ApplicationListOfStudent.as_view(), name='job_mitra-applied-list'),
     path('jobmitra/member-details/', job_mitra_api.GetMemberDetailsByCardApi.as_view(), name='get-member-details'),
     path('jobmitra/apply-for-member/', job_mitra_api.ApplyJobForMemberAPIView.as_view(), name='apply-job-for-member'),
+    path('jobmitra/apply-for-members/', job_mitra_api.BulkApplyJobForMembersAPIView.as_view(), name='bulk-apply-job-for-members'),
     
 ]
 
@@ -5,19 +5,37 @@ from rest_framework.permissions import IsAuthenticated
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from jobcard_business.models import Job, JobApplication, HRFeedback
+from jobcard_business.serializers import HRFeedbackSerializer
 from . import serializers
 from .authentication import SSOUserTokenAuthentication
-from jobcard_member.models import MbrDocuments, DocumentVerificationRequest
+from jobcard_member.models import MbrDocuments, DocumentVerificationRequest, DocumentStatus
+from jobcard_member.document_status import (
+    InvalidDocumentStatus, members_document_status, request_documents, requested_documents_with_files,
+    set_document_status,
+)
+from jobcard_member import verification_queue
 from jobcard_member.serializers import MbrDocumentsSerializer
-from helpers.utils import get_business_details_by_id, get_member_details_by_card
+from helpers.utils import get_businesses_details_by_ids, get_member_details_by_card, get_members_details_by_cards
 from helpers.pagination import paginate
-from helpers.email import send_template_email
+from helpers.cache import cache_metrics
+from helpers.email import send_template_email, queue_template_emails
+from jobcard_business.dashboard import invalidate_employer_dashboard
+from jobcard_admin.audit import record_status_change
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from goverment.views import ApplicationTrendAPIView
+from jobcard_business.job_import import JobImportError, import_jobs_from_upload
+from jobcard_business.job_lists import deactivate_expired_jobs
+from rest_framework.parsers import MultiPartParser
 class JobListCreateAPIView(APIView):
     """
     API to list all jobs or create a new job post.
     """
     authentication_classes = [SSOUserTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
         operation_description="Retrieve a paginated list of all job postings.",
@@ -27,8 +45,7 @@ class JobListCreateAPIView(APIView):
     def get(self, request):
         # try:
             if request.user.is_jobmitra:
-                for job in Job.objects.filter(is_active=True):
-                    job.check_and_deactivate()
+                deactivate_expired_jobs()
                 jobs = Job.objects.filter().order_by("-id")  # order by latest
             else:
                 jobs = Job.objects.all().order_by('-id')
@@ -74,6 +91,45 @@ class JobListCreateAPIView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class JobImportAPIView(APIView):
+    """
+    API to bulk import job posts from a CSV or JSON Lines file.
+    """
+    authentication_classes = [SSOUserTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    @swagger_auto_schema(
+        operation_description="Bulk import jobs. Columns/keys are Job field names (including business_id); list fields take a JSON list or '|' separated values.",
+        manual_parameters=[
+            openapi.Parameter('file', openapi.IN_FORM, type=openapi.TYPE_FILE, required=True, description="CSV or JSON Lines file"),
+            openapi.Parameter('format', openapi.IN_FORM, type=openapi.TYPE_STRING, enum=["csv", "jsonl"], description="Defaults to the file extension"),
+            openapi.Parameter('dry_run', openapi.IN_FORM, type=openapi.TYPE_BOOLEAN, description="Validate only"),
+        ],
+        responses={200: "Import summary with per-row errors"},
+        tags=["Staff"]
+    )
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if not upload:
+            return Response({"success": False, "message": "file is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            summary = import_jobs_from_upload(
+                upload,
+                fmt=request.data.get("format"),
+                dry_run=str(request.data.get("dry_run", "")).lower() in ("1", "true", "yes"),
+            )
+        except (JobImportError, UnicodeDecodeError) as e:
+            return Response({"success": False, "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "success": True,
+            "message": f"{summary['created']} of {summary['rows']} job(s) imported.",
+            "data": summary
+        }, status=status.HTTP_200_OK)
+
+
 class JobDetailAPIView(APIView):
     """
     API to retrieve, update, or delete a job post by ID.
@@ -131,6 +187,7 @@ class JobApplicationListOfStudent(APIView):
     """
     authentication_classes = [SSOUserTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
         operation_description="Get all student applications for a specific job ID.",
@@ -139,7 +196,7 @@ class JobApplicationListOfStudent(APIView):
     )
     def get(self, request, job_id):
         try:
-            applications = JobApplication.objects.filter(job_id=job_id)
+            applications = JobApplication.objects.filter(job_id=job_id).select_related("job")
             serializer = serializers.JobApplicationStaffViewSerializer(applications, many=True)
             return Response({
                 "success": True,
@@ -184,9 +241,14 @@ class JobApplicationListOfStudent(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            application = JobApplication.objects.get(id=application_id, job_id=job_id)
+            application = JobApplication.objects.select_related("job").get(id=application_id, job_id=job_id)
+            old_status = application.status
             application.status = new_status
             application.save()
+            record_status_change(
+                "job_application", application.id, old_status, new_status,
+                actor_id=request.user.id, card_number=application.member_card,
+            )
             
             member_data = get_member_details_by_card(application.member_card)
             email = member_data.get("email")
@@ -229,6 +291,123 @@ class JobApplicationListOfStudent(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
             
+class BulkApplicationStatusAPIView(APIView):
+    """
+    Staff can move many applications of a job to the same status at once.
+    """
+    authentication_classes = [SSOUserTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    MAX_APPLICATIONS = 1000
+
+    @swagger_auto_schema(
+        operation_description="Update the status of many applications of a job and notify the applicants.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["ids", "status"],
+            properties={
+                "ids": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_INTEGER),
+                    description="Application IDs"
+                ),
+                "status": openapi.Schema(
+                    type=openapi.TYPE_STRING,
+                    description="New status (applied, under_review, shortlisted, rejected, selected)",
+                    enum=["applied", "under_review", "shortlisted", "rejected", "selected"]
+                )
+            }
+        ),
+        responses={
+            200: openapi.Response(description="Application statuses updated"),
+            400: openapi.Response(description="Invalid input")
+        },
+        tags=["Staff"]
+    )
+    def patch(self, request, job_id):
+        application_ids = request.data.get("ids")
+        new_status = request.data.get("status")
+
+        valid_statuses = dict(JobApplication._meta.get_field("status").choices)
+        if new_status not in valid_statuses:
+            return Response({
+                "success": False,
+                "message": f"status must be one of: {', '.join(valid_statuses)}."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if (
+            not isinstance(application_ids, list)
+            or not application_ids
+            or not all(isinstance(i, int) for i in application_ids)
+        ):
+            return Response({
+                "success": False,
+                "message": "ids must be a non-empty list of application IDs."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(application_ids) > self.MAX_APPLICATIONS:
+            return Response({
+                "success": False,
+                "message": f"At most {self.MAX_APPLICATIONS} applications can be updated at once."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        applications = JobApplication.objects.filter(job_id=job_id, id__in=application_ids)
+
+        # One lookup per distinct member, made concurrently, before taking any locks
+        members = get_members_details_by_cards(set(applications.values_list("member_card", flat=True)))
+
+        with transaction.atomic():
+            # Lock the rows, then decide from their current status what actually changes
+            locked = list(
+                applications.select_for_update().order_by("id")
+                .values("id", "member_card", "status", "job__title", "job__company_name", "job__business_id")
+            )
+            changed = [app for app in locked if app["status"] != new_status]
+
+            now = timezone.now()
+            changes = {"status": new_status, "updated_at": now}
+            if new_status == "selected":
+                # update() skips JobApplication.save(), which stamps the first selection
+                changes["selected_at"] = Coalesce("selected_at", Value(now))
+            if changed:
+                JobApplication.objects.filter(id__in=[app["id"] for app in changed]).update(**changes)
+
+            notifications = []
+            for app in changed:
+                record_status_change(
+                    "job_application", app["id"], app["status"], new_status,
+                    actor_id=request.user.id, card_number=app["member_card"],
+                )
+                member_data = members.get(app["member_card"]) or {}
+                notifications.append({
+                    "subject": "Job Application Status Update - JSJCard",
+                    "template_name": "email_template/job_status.html",
+                    "context": {
+                        "applicant_name": member_data.get("full_name"),
+                        "job_title": app["job__title"],
+                        "status": new_status,
+                        "company_name": app["job__company_name"],
+                        "card_number": app["member_card"],
+                    },
+                    "recipient_list": [member_data.get("email")] if member_data.get("email") else [],
+                })
+            queued = queue_template_emails(notifications)
+
+        if changed:
+            invalidate_employer_dashboard(changed[0]["job__business_id"])
+
+        found_ids = {app["id"] for app in locked}
+        return Response({
+            "success": True,
+            "message": f"{len(changed)} application(s) updated to {new_status}.",
+            "updated_ids": [app["id"] for app in changed],
+            "unchanged_ids": sorted(found_ids - {app["id"] for app in changed}),
+            "not_found_ids": sorted(set(application_ids) - found_ids),
+            "notified": len(queued),
+            "new_status": new_status
+        }, status=status.HTTP_200_OK)
+
+
 class MbrDocumentsAPI(APIView):
     """
     Staff can view documents submitted by candidates.
@@ -255,11 +434,9 @@ class MbrDocumentsAPI(APIView):
     )
     def get(self, request, card_number):
         try:
-           
-            documents = MbrDocuments.objects.filter(card_number=card_number)
-            
-
-            serializer = MbrDocumentsSerializer(documents, many=True)
+            documents = list(MbrDocuments.objects.filter(card_number=card_number))
+            statuses = members_document_status({document.card_number for document in documents})
+            serializer = MbrDocumentsSerializer(documents, many=True, context={"document_status": statuses})
 
             return Response({
                 "success": True,
@@ -289,7 +466,7 @@ class StaffDocumentVerificationListAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        requests = DocumentVerificationRequest.objects.all().order_by('-created_at')
+        requests = DocumentVerificationRequest.objects.prefetch_related('document_statuses').order_by('-created_at')
 
         # Use your custom paginate function
         page, pagination_meta = paginate(
@@ -298,18 +475,21 @@ class StaffDocumentVerificationListAPIView(APIView):
             data_per_page=int(request.GET.get("page_size", 10))
         )
 
+        businesses = get_businesses_details_by_ids(r.requested_by for r in page)
         data = []
         for r in page:
-            request_by = get_business_details_by_id(r.requested_by)
+            request_by = businesses.get(r.requested_by)
             business_name = request_by.get('business_name', 'Unknown') if request_by else 'Unknown'
 
             data.append({
                 "request_id": r.id,
                 "card_number": r.card_number,
-                "documents": r.documents,  # JSON of requested documents
+                "documents": request_documents(r),  # requested documents with their status
                 "status": r.status,
                 "requested_by": business_name,
                 "requested_at": r.created_at,
+                "claimed_by": r.claimed_by,
+                "lease_expires_at": r.lease_expires_at,
             })
 
         return Response({
@@ -323,53 +503,229 @@ class StaffDocumentVerificationListAPIView(APIView):
 
 
 
+class StaffClaimVerificationRequestsAPIView(APIView):
+    """
+    Lease the next pending verification requests to the calling staff member.
+    """
+    authentication_classes = [SSOUserTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Claim up to `limit` of the oldest pending verification requests. "
+                              "Each claim is a lease that expires unless renewed; finished requests are released automatically.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "limit": openapi.Schema(type=openapi.TYPE_INTEGER, default=10, description=f"At most {verification_queue.MAX_CLAIM}"),
+                "lease_seconds": openapi.Schema(type=openapi.TYPE_INTEGER, default=verification_queue.LEASE_SECONDS),
+            }
+        ),
+        tags=["Staff"]
+    )
+    def post(self, request):
+        try:
+            claimed = verification_queue.claim_requests(
+                request.user.id,
+                limit=request.data.get("limit", 10),
+                lease_seconds=request.data.get("lease_seconds"),
+            )
+        except (TypeError, ValueError):
+            return Response({"success": False, "message": "limit and lease_seconds must be integers."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        data = [{
+            "request_id": r.id,
+            "card_number": r.card_number,
+            "documents": request_documents(r),
+            "status": r.status,
+            "requested_at": r.created_at,
+            "lease_expires_at": r.lease_expires_at,
+        } for r in claimed]
+
+        return Response({
+            "success": True,
+            "message": f"{len(data)} verification request(s) claimed.",
+            "data": data
+        }, status=status.HTTP_200_OK)
+
+
+class StaffRenewVerificationLeaseAPIView(APIView):
+    """
+    Extend the leases the calling staff member holds.
+    """
+    authentication_classes = [SSOUserTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["request_ids"],
+            properties={
+                "request_ids": openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)),
+                "lease_seconds": openapi.Schema(type=openapi.TYPE_INTEGER, default=verification_queue.LEASE_SECONDS),
+            }
+        ),
+        tags=["Staff"]
+    )
+    def post(self, request):
+        request_ids = request.data.get("request_ids")
+        if not isinstance(request_ids, list) or not request_ids:
+            return Response({"success": False, "message": "request_ids must be a non-empty list."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            renewed = verification_queue.renew_leases(request.user.id, request_ids, request.data.get("lease_seconds"))
+        except (TypeError, ValueError):
+            return Response({"success": False, "message": "request_ids and lease_seconds must be integers."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "success": True,
+            "message": f"{len(renewed)} lease(s) renewed.",
+            "data": {"renewed": renewed}
+        }, status=status.HTTP_200_OK)
+
+
+class StaffReleaseVerificationRequestsAPIView(APIView):
+    """
+    Give claimed but unfinished verification requests back to the queue.
+    """
+    authentication_classes = [SSOUserTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["request_ids"],
+            properties={
+                "request_ids": openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER)),
+            }
+        ),
+        tags=["Staff"]
+    )
+    def post(self, request):
+        request_ids = request.data.get("request_ids")
+        if not isinstance(request_ids, list) or not request_ids:
+            return Response({"success": False, "message": "request_ids must be a non-empty list."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            released = verification_queue.release_requests(request.user.id, request_ids)
+        except (TypeError, ValueError):
+            return Response({"success": False, "message": "request_ids must be integers."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "success": True,
+            "message": f"{released} request(s) released.",
+        }, status=status.HTTP_200_OK)
+
+
+class StaffDocumentQueueAPIView(APIView):
+    """
+    Requested documents waiting for verification, oldest first (paginated).
+    """
+    authentication_classes = [SSOUserTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="List requested documents by status (default pending), oldest first.",
+        manual_parameters=[
+            openapi.Parameter('status', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=[value for value, _ in DocumentStatus.STATUS_CHOICES], description="Defaults to pending"),
+            openapi.Parameter('document_type', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=MbrDocuments.DOCUMENT_FIELDS, description="e.g. TenthCertificate"),
+            openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+        tags=["Staff"]
+    )
+    def get(self, request):
+        status_value = request.GET.get("status", "pending")
+        document_type = request.GET.get("document_type")
+
+        # Served by the (status, document_type, created_at) index
+        queue = DocumentStatus.objects.filter(status=status_value, request__isnull=False)
+        if document_type:
+            queue = queue.filter(document_type=document_type)
+        queue = queue.order_by("created_at", "id").values(
+            "id", "request_id", "card_number", "document_type", "status", "created_at", "updated_at"
+        )
+
+        page, pagination_meta = paginate(
+            request,
+            queue,
+            data_per_page=int(request.GET.get("page_size", 10))
+        )
+
+        return Response({
+            "status": 200,
+            "message": "Document verification queue fetched successfully.",
+            "data": list(page),
+            "pagination_meta_data": pagination_meta
+        }, status=status.HTTP_200_OK)
+
+
 class StaffUpdateDocumentStatusAPIView(APIView):
     authentication_classes = [SSOUserTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @swagger_auto_schema(
+        operation_description="Verification requests of a member (paginated, newest first) with the requested files and their status.",
+        manual_parameters=[
+            openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+        tags=["Staff"]
+    )
     def get(self, request, card_number):
         """
         View all requested document verifications + return requested files with their status.
         """
-        try:
-            mbr_docs = MbrDocuments.objects.get(card_number=card_number)
-            mbr_docs_data = MbrDocumentsSerializer(mbr_docs).data
-            doc_status_data = mbr_docs_data.get("document_status", {}) or {}
-        except MbrDocuments.DoesNotExist:
+        if not str(card_number).isdigit():
+            return Response({"success": False, "message": "Invalid card number."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        requests = (
+            DocumentVerificationRequest.objects.filter(card_number=card_number)
+            .annotate(has_documents=Exists(MbrDocuments.objects.filter(card_number=OuterRef("card_number"))))
+            .order_by("-created_at", "-id")
+            .values("id", "status", "claimed_by", "lease_expires_at", "created_at", "has_documents")
+        )
+        page, pagination_meta = paginate(
+            request,
+            requests,
+            data_per_page=int(request.GET.get("page_size", 10))
+        )
+        page = list(page)
+
+        has_documents = page[0]["has_documents"] if page else MbrDocuments.objects.filter(card_number=card_number).exists()
+        if not has_documents:
             return Response({
                 "success": False,
                 "message": "Member documents not found."
             }, status=status.HTTP_404_NOT_FOUND)
-
-        # Fetch verification requests
-        requests = DocumentVerificationRequest.objects.filter(card_number=card_number)
-        if not requests.exists():
+        if not page:
             return Response({
                 "success": False,
                 "message": "No verification requests found."
             }, status=status.HTTP_404_NOT_FOUND)
 
-        response_data = []
-        for req in requests:
-            requested_docs = req.documents or {}  # dict of requested docs
-
-            documents_info = {}
-            for doc_name in requested_docs.keys():
-                documents_info[doc_name] = {
-                    "file": mbr_docs_data.get(doc_name, ""),
-                    "status": doc_status_data.get(doc_name, "pending")
-                }
-
-            response_data.append({
-                "id": req.id,
-                "status": req.status,
-                "documents": documents_info
-            })
+        documents = requested_documents_with_files(card_number, [req["id"] for req in page])
+
+        response_data = [{
+            "id": req["id"],
+            "status": req["status"],
+            "claimed_by": req["claimed_by"],
+            "lease_expires_at": req["lease_expires_at"],
+            "documents": documents[req["id"]]
+        } for req in page]
 
         return Response({
             "success": True,
             "message": "Document verification requests fetched.",
             "data": response_data,
+            "pagination_meta_data": pagination_meta
         }, status=status.HTTP_200_OK)
 
 
@@ -383,22 +739,26 @@ class StaffUpdateDocumentStatusAPIView(APIView):
             return Response({"success": False, "message": "All fields are required"},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            doc_request = DocumentVerificationRequest.objects.get(id=request_id, card_number=card_number)
-        except DocumentVerificationRequest.DoesNotExist:
-            return Response({"success": False, "message": "Request not found"},
-                            status=status.HTTP_404_NOT_FOUND)
-
-        # Update the document status
-        doc_request.documents[document_name] = status_value
-        doc_request.save(update_fields=["documents", "updated_at"])
-
-        # Also update the main MbrDocuments table
-        mbr_docs = MbrDocuments.objects.get(card_number=doc_request.card_number)
-        doc_status = mbr_docs.document_status or {}
-        doc_status[document_name] = status_value
-        mbr_docs.document_status = doc_status
-        mbr_docs.save(update_fields=["document_status", "UpdatedAt"])
+        with transaction.atomic():
+            # Row lock: concurrent updates of the same request run one after the other
+            doc_request = (
+                DocumentVerificationRequest.objects.select_for_update()
+                .filter(id=request_id, card_number=card_number).first()
+            )
+            if doc_request is None:
+                return Response({"success": False, "message": "Request not found"},
+                                status=status.HTTP_404_NOT_FOUND)
+
+            if doc_request.is_leased_to_other(request.user.id):
+                return Response({"success": False, "message": "This request is claimed by another verifier."},
+                                status=status.HTTP_409_CONFLICT)
+
+            # Update the document status on the request and the member's current status
+            try:
+                doc_status = set_document_status(doc_request, document_name, status_value, actor_id=request.user.id)
+            except InvalidDocumentStatus as e:
+                return Response({"success": False, "message": str(e)},
+                                status=status.HTTP_400_BAD_REQUEST)
 
         return Response({
             "success": True,
@@ -414,6 +774,7 @@ class HRFeedbackListAPI(APIView):
     """
     authentication_classes = [SSOUserTokenAuthentication]
     permission_classes = [IsAuthenticated]
+    read_from_replica = True
 
     @swagger_auto_schema(
         operation_description="Get list of all HR Feedback records (for staff use).",
@@ -422,9 +783,7 @@ class HRFeedbackListAPI(APIView):
     )
     def get(self, request):
         try:
-            feedbacks = HRFeedback.objects.all().values(
-                "id", "candidate_name", "card_number", "feedbacks", "created_at", "updated_at"
-            )
+            feedbacks = HRFeedback.objects.prefetch_related("entries").order_by("id")
 
             if not feedbacks:
                 return Response({
@@ -432,14 +791,43 @@ class HRFeedbackListAPI(APIView):
                     "message": "No feedback records found."
                 }, status=404)
 
+            data = HRFeedbackSerializer(feedbacks, many=True).data
             return Response({
                 "success": True,
-                "count": feedbacks.count(),
-                "data": list(feedbacks)
+                "count": len(data),
+                "data": data
             }, status=200)
 
         except Exception as e:
             return Response({
                 "success": False,
                 "message": f"Something went wrong: {str(e)}"
-            }, status=500)
\ No newline at end of file
+            }, status=500)
+
+
+class ApplicationTrendStaffAPIView(ApplicationTrendAPIView):
+    """
+    Same rollup-backed trends as the government dashboard, for staff/admin users.
+    """
+    authentication_classes = [SSOUserTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+
+class CacheMetricsAPIView(APIView):
+    """
+    Hit, miss and eviction counts per cache region, for this server process.
+    """
+    authentication_classes = [SSOUserTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_description="Cache metrics per region (hits, misses, sets, deletes, evictions, computes, waits, hit_ratio) since this process started.",
+        responses={200: "Metrics per cache region"},
+        tags=["Staff"]
+    )
+    def get(self, request):
+        return Response({
+            "success": True,
+            "message": "Cache metrics retrieved successfully.",
+            "data": cache_metrics()
+        }, status=status.HTTP_200_OK)
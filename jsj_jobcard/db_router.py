@@ -0,0 +1,120 @@
+"""
+Primary/replica database routing.
+
+Views opt in with `read_from_replica = True`; their GET/HEAD/OPTIONS
+requests then read from the "replica" alias. Everything else reads from
+and writes to "default". Once a request writes, its remaining reads go to
+the primary, and the same client (Authorization header, else IP) stays on
+the primary for REPLICA_STICKY_SECONDS so it reads its own writes despite
+replication lag. Stickiness lives in the replica_sticky cache region,
+which is SHARED so every process and server sees it.
+
+Without a "replica" entry in DATABASES the router and middleware do
+nothing. Two local databases are enough to try it, e.g. for SQLite:
+
+    DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+"""
+import hashlib
+from contextlib import contextmanager
+from asgiref.local import Local
+from django.conf import settings
+from helpers.cache import replica_sticky
+
+PRIMARY_ALIAS = "default"
+REPLICA_ALIAS = "replica"
+STICKY_SECONDS = getattr(settings, "REPLICA_STICKY_SECONDS", 10)
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Never read from the replica: the database cache table must not lag behind
+PRIMARY_ONLY_APPS = {"django_cache"}
+
+_state = Local()
+
+
+def replica_available():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def reads_from_replica():
+    return getattr(_state, "replica", False) and not getattr(_state, "wrote", False) and replica_available()
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """
+    Read from the replica inside the block (until something writes), e.g.
+    in management commands and reports.
+    """
+    previous = getattr(_state, "replica", False), getattr(_state, "wrote", False)
+    _state.replica, _state.wrote = enabled, False
+    try:
+        yield
+    finally:
+        _state.replica, _state.wrote = previous
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if not replica_available():
+            return None
+        if model._meta.app_label not in PRIMARY_ONLY_APPS and reads_from_replica():
+            return REPLICA_ALIAS
+        return PRIMARY_ALIAS
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in PRIMARY_ONLY_APPS:
+            _state.wrote = True
+        return PRIMARY_ALIAS if replica_available() else None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {PRIMARY_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
+
+
+def _sticky_key(request):
+    client = request.headers.get("Authorization") or request.META.get("REMOTE_ADDR")
+    if not client:
+        return None
+    return "replica-sticky:" + hashlib.sha256(client.encode()).hexdigest()
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Turns replica reads on for safe requests to views with
+    `read_from_replica = True`, unless the client wrote recently.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _state.replica, _state.wrote = False, False
+        if not replica_available():
+            return self.get_response(request)
+
+        key = _sticky_key(request)
+        request.pinned_to_primary = key is not None and replica_sticky.get(key) is not None
+        try:
+            return self.get_response(request)
+        finally:
+            if _state.wrote and key is not None:
+                replica_sticky.set(key, 1, STICKY_SECONDS)
+            _state.replica, _state.wrote = False, False
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        if (
+            getattr(view_class, "read_from_replica", False)
+            and request.method in SAFE_METHODS
+            and not getattr(request, "pinned_to_primary", True)
+        ):
+            _state.replica = True
+        return None
@@ -2,6 +2,8 @@ from pathlib import Path
 import os
 import sys
 from dotenv import dotenv_values
+from helpers.cache_config import build_caches
+from helpers.db_config import database_config, replica_config
 
 
 
@@ -44,6 +46,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so request metrics cover the whole stack
+    "helpers.metrics.RequestMetricsMiddleware",
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -55,6 +59,7 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "jsj_jobcard.db_router.ReplicaRoutingMiddleware",
 ]
 
 ROOT_URLCONF = 'jsj_jobcard.urls'
@@ -88,17 +93,19 @@ WSGI_APPLICATION = 'jsj_jobcard.wsgi.application'
 # }
 
 
+# Connection profile from DB_MODE (persistent, pool or pgbouncer) and
+# DB_CONN_MAX_AGE / DB_CONN_HEALTH_CHECKS / DB_POOL_* in .env, see helpers.db_config
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": env_vars["DB_NAME"],
-        "USER": env_vars["DB_USER"],
-        "PASSWORD": env_vars["DB_PASSWORD"],
-        "HOST": env_vars["DB_HOST"],
-        "PORT": env_vars["DB_PORT"],
-    }
+    "default": database_config(env_vars),
 }
 
+# Optional read replica (DB_REPLICA_HOST, other DB_REPLICA_* default to DB_*),
+# used by views with read_from_replica = True, see jsj_jobcard.db_router
+if replica_config(env_vars):
+    DATABASES["replica"] = replica_config(env_vars)
+
+DATABASE_ROUTERS = ["jsj_jobcard.db_router.PrimaryReplicaRouter"]
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -148,3 +155,48 @@ AUTH_SERVER_URL =env_vars['AUTH_SERVER_URL']
 
 # cros origin 
 CORS_ALLOW_ALL_ORIGINS = True
+
+
+# Token-bucket rates for helpers.throttling, keyed "<view throttle_scope>.<bucket>" ("capacity/period")
+REST_FRAMEWORK = {
+    "DEFAULT_THROTTLE_RATES": {
+        "shared_documents.ip": "30/min",
+        "shared_documents.resource": "10/hour",  # PIN guesses per share token
+        "job_count.ip": "60/min",
+        "job_mitra.ip": "120/min",
+        "job_mitra.token": "120/min",
+    },
+}
+
+
+# Cache regions used through helpers.cache. BACKEND is "locmem" (per process, LRU),
+# "file" (per server), "db" (run `manage.py createcachetable`) or "redis" (CACHE_LOCATION
+# is the server URL); CACHE_BACKEND sets it for all.
+CACHE_BACKEND = env_vars.get("CACHE_BACKEND", "locmem")
+CACHE_REGIONS = {
+    # Verified SSO tokens: a revoked token stays usable for at most this TIMEOUT
+    "auth_tokens": {"TIMEOUT": 60, "MAX_ENTRIES": 10000},
+    "member_profiles": {"TIMEOUT": 60 * 15, "MAX_ENTRIES": 20000},
+    "business_directory": {"TIMEOUT": 60 * 60, "MAX_ENTRIES": 5000},
+    "document_sharing": {"TIMEOUT": 60 * 5, "MAX_ENTRIES": 10000},
+    # SHARED: invalidated on writes or counted across processes, so "db" or "redis" only
+    "job_lists": {"TIMEOUT": 60 * 2, "MAX_ENTRIES": 1000, "SHARED": True},
+    "dashboards": {"TIMEOUT": 60 * 10, "MAX_ENTRIES": 5000, "SHARED": True},
+    "throttling": {"TIMEOUT": 60 * 60, "MAX_ENTRIES": 50000, "SHARED": True},
+    # Clients that wrote recently read from the primary (jsj_jobcard.db_router)
+    "replica_sticky": {"TIMEOUT": 60, "MAX_ENTRIES": 20000, "SHARED": True},
+}
+# A SHARED region on a per-process backend fails `manage.py check` unless DEBUG=True in .env
+CACHE_REQUIRE_SHARED_BACKEND = env_vars.get(
+    "CACHE_REQUIRE_SHARED_BACKEND", "false" if str(DEBUG).lower() == "true" else "true"
+).lower() in ("1", "true", "yes")
+CACHES = build_caches(CACHE_REGIONS, CACHE_BACKEND, env_vars.get("CACHE_LOCATION"))
+
+
+# /metrics (helpers.metrics) answers callers sending "Authorization: Bearer <METRICS_TOKEN>"
+# and, if listed, these client addresses (comma separated). Behind a reverse proxy, set
+# METRICS_NUM_PROXIES so the address comes from X-Forwarded-For; forwarded requests are
+# never matched by address otherwise.
+METRICS_TOKEN = env_vars.get("METRICS_TOKEN")
+METRICS_ALLOWED_IPS = [ip.strip() for ip in (env_vars.get("METRICS_ALLOWED_IPS") or "").split(",") if ip.strip()]
+METRICS_NUM_PROXIES = int(env_vars.get("METRICS_NUM_PROXIES") or 0)
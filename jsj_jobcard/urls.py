@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from helpers import swagger_documentation
+from helpers.metrics import metrics_view
 
 urlpatterns = [
     path('admin/', include('jobcard_admin.urls')),
@@ -10,5 +11,6 @@ urlpatterns = [
     path('member/', include('jobcard_member.urls')),
     path('swagger/', swagger_documentation.schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', swagger_documentation.schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('metrics', metrics_view, name='metrics'),
 
 ]
\ No newline at end of file